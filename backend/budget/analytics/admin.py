@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from analytics.models import MonthlyRollup
+
+
+@admin.register(MonthlyRollup)
+class MonthlyRollupAdmin(admin.ModelAdmin):
+    list_display = ("year", "month", "category", "location", "bucket", "sign", "amount", "count", "user")
+    list_filter = ("sign", "user")
+    ordering = ("-year", "-month")
+    readonly_fields = ("year", "month", "category", "location", "bucket", "sign", "amount", "count", "user")
@@ -0,0 +1,155 @@
+import random
+import time
+from datetime import datetime
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils.timezone import make_aware
+
+from accounts.models import User
+from analytics.services.base import AnalyticsBaseService
+from core.models import Bucket
+from core.models import Location
+from transactions.models import Category
+from transactions.models import Transaction
+
+BENCHMARK_EMAIL = "benchmark@budget.local"
+BENCHMARK_YEARS = [2023, 2024, 2025]
+NO_OF_LOCATIONS = 5
+NO_OF_BUCKETS = 5
+CATEGORY_SIGNS = [Category.Sign.POSITIVE] * 2 + [Category.Sign.NEGATIVE] * 5 + [Category.Sign.NEUTRAL]
+DESCRIPTION_WORDS = [
+    "grocery", "market", "coffee", "restaurant", "fuel", "rent", "salary", "pharmacy", "cinema", "books",
+    "train", "taxi", "insurance", "electricity", "internet", "phone", "gym", "clothes", "gift", "transfer",
+]
+
+
+class Command(BaseCommand):
+    help = """Benchmarks the analytics report queries on raw transactions and shows their query plans."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1_000_000,
+            help="Number of transactions of the benchmark user (default 1,000,000)",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=5,
+            help="Number of timed runs per report, the best one is shown (default 5)",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the benchmark user and its transactions for the next run",
+        )
+
+    def handle(self, *args, **options):
+        user = self.get_benchmark_user(options["rows"])
+        self.analyze()
+
+        service = AnalyticsBaseService(user)
+        year = BENCHMARK_YEARS[-1]
+        reports = {
+            "monthly": service.group_transactions(
+                service.get_transactions_by_month(month=6, year=year), ("category",)
+            ),
+            "yearly": service.group_transactions(
+                service.get_transactions_by_year(year=year), ("month", "category")
+            ),
+            "current": service.group_transactions(service.transactions, ("location", "bucket")),
+        }
+
+        for report, queryset in reports.items():
+            timings = []
+            for _ in range(options["runs"]):
+                start = time.perf_counter()
+                list(queryset.all())
+                timings.append(time.perf_counter() - start)
+
+            plan = self.explain(queryset)
+            self.stdout.write(self.style.NOTICE(f"\n{report} report: best of {options['runs']} runs {min(timings) * 1000:.1f} ms"))
+            self.stdout.write(plan)
+            if self.uses_covering_index(plan):
+                self.stdout.write(self.style.SUCCESS("Answered from a covering index."))
+            else:
+                self.stdout.write(self.style.WARNING("Not answered from a covering index."))
+
+        if not options["keep"]:
+            self.stdout.write(self.style.NOTICE("\nDeleting benchmark data..."))
+            self.delete_benchmark_user(user)
+
+    def get_benchmark_user(self, rows):
+        """Get the benchmark user, creating it and its transactions if needed."""
+        user = User.all_objects.filter(email=BENCHMARK_EMAIL).first()
+        if user is not None and user.transactions.count() == rows:
+            self.stdout.write(self.style.NOTICE(f"\nReusing the {rows} benchmark transactions."))
+            return user
+        if user is not None:
+            self.delete_benchmark_user(user)
+
+        self.stdout.write(self.style.NOTICE(f"\nCreating {rows} benchmark transactions..."))
+        user = User.objects.create_user(email=BENCHMARK_EMAIL, password=None, full_name="Benchmark User")
+        locations = Location.all_objects.bulk_create(
+            [Location(user=user, name=f"Location {index}") for index in range(NO_OF_LOCATIONS)]
+        )
+        buckets = Bucket.all_objects.bulk_create(
+            [Bucket(user=user, name=f"Bucket {index}", allocation_percentage=20) for index in range(NO_OF_BUCKETS)]
+        )
+        categories = Category.all_objects.bulk_create(
+            [Category(user=user, name=f"Category {index}", sign=sign) for index, sign in enumerate(CATEGORY_SIGNS)]
+        )
+
+        start = make_aware(datetime(BENCHMARK_YEARS[0], 1, 1))
+        seconds = int((make_aware(datetime(BENCHMARK_YEARS[-1] + 1, 1, 1)) - start).total_seconds())
+        batch_size = 10_000
+        for offset in range(0, rows, batch_size):
+            # Plain bulk_create on purpose: no signals, so no rollup or cache work for the benchmark data
+            Transaction.objects.bulk_create(
+                [
+                    Transaction(
+                        user=user,
+                        description=" ".join(random.sample(DESCRIPTION_WORDS, 3)),
+                        category=random.choice(categories),
+                        location=random.choice(locations),
+                        bucket=random.choice(buckets),
+                        date=start + timedelta(seconds=random.randrange(seconds)),
+                        amount=Decimal(random.randint(1, 100_000)) / 100,
+                    )
+                    for _ in range(min(batch_size, rows - offset))
+                ]
+            )
+
+        return user
+
+    @staticmethod
+    def delete_benchmark_user(user):
+        """Delete the benchmark user, removing its transactions in one statement instead of one signal each."""
+        transactions = Transaction.objects.filter(user=user)
+        transactions._raw_delete(transactions.db)
+        user.delete(soft=False)
+
+    def analyze(self):
+        """Refresh the planner statistics (and on PostgreSQL the visibility map needed for index only scans)."""
+        table = Transaction._meta.db_table
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(f"VACUUM ANALYZE {table}")
+            else:
+                cursor.execute(f"ANALYZE {table}")
+
+    @staticmethod
+    def explain(queryset):
+        """Get the query plan of a queryset, with actual timings where the database supports it."""
+        if connection.vendor == "postgresql":
+            return queryset.explain(analyze=True, buffers=True)
+        return queryset.explain()
+
+    @staticmethod
+    def uses_covering_index(plan):
+        """Check if a query plan reads the transactions from an index only."""
+        return "Index Only Scan" in plan or "COVERING INDEX" in plan
@@ -0,0 +1,58 @@
+import time
+
+from django.test import override_settings
+from django.utils import timezone
+
+from analytics.management.commands.benchmarkanalytics import Command as BenchmarkAnalyticsCommand
+from analytics.services.combined import AnalyticsCombinedService
+from analytics.services.rollup import rebuild_rollups
+from analytics.services.vectorized import AnalyticsVectorizedService
+
+
+class Command(BenchmarkAnalyticsCommand):
+    help = """Benchmarks the ORM and numpy analytics backends generating all the reports of a user."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="10000,100000,1000000",
+            help="Comma separated numbers of transactions to benchmark (default 10000,100000,1000000)",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=3,
+            help="Number of timed runs per backend, the best one is shown (default 3)",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        periods = [(now.year, now.month), now.year]
+        backends = {
+            "orm (transactions)": (AnalyticsCombinedService, False),
+            "orm (rollup)": (AnalyticsCombinedService, True),
+            "numpy": (AnalyticsVectorizedService, False),
+        }
+
+        for size in (int(size) for size in options["sizes"].split(",")):
+            user = self.get_benchmark_user(size)
+            rebuild_rollups([user])
+            self.analyze()
+
+            self.stdout.write(self.style.NOTICE(f"\n{size} transactions, best of {options['runs']} runs:"))
+            summaries = {}
+            for backend, (service_class, use_rollup) in backends.items():
+                timings = []
+                with override_settings(ANALYTICS_USE_ROLLUP=use_rollup):
+                    for _ in range(options["runs"]):
+                        start = time.perf_counter()
+                        summaries[backend] = service_class(user).get_summaries(periods)
+                        timings.append(time.perf_counter() - start)
+                self.stdout.write(f"{backend:>20}: {min(timings) * 1000:.1f} ms")
+
+            if summaries["numpy"] == summaries["orm (transactions)"]:
+                self.stdout.write(self.style.SUCCESS("The backends produce the same reports."))
+            else:
+                self.stdout.write(self.style.ERROR("The backends produce different reports."))
+
+            self.delete_benchmark_user(user)
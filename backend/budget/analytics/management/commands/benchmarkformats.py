@@ -0,0 +1,89 @@
+import json
+import time
+from decimal import Decimal
+
+import msgpack
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from analytics.management.commands.benchmarkanalytics import Command as BenchmarkAnalyticsCommand
+from analytics.serializers.current import AnalyticsCurrentSerializer
+from analytics.serializers.historical import AnalyticsHistoricalSerializer
+from analytics.serializers.monthly import AnalyticsMonthlySerializer
+from analytics.serializers.yearly import AnalyticsYearlySerializer
+from analytics.services.cache_utils import get_or_generate_current_report
+from analytics.services.cache_utils import get_or_generate_historical_report
+from analytics.services.cache_utils import get_or_generate_monthly_report
+from analytics.services.cache_utils import get_or_generate_yearly_report
+from analytics.services.rollup import rebuild_rollups
+from core.parsers import decode_ext
+from core.renderers import MessagePackRenderer
+
+
+class Command(BenchmarkAnalyticsCommand):
+    help = """Benchmarks the payload size and encode/decode time of every analytics report as JSON and MessagePack."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=100_000,
+            help="Number of transactions of the benchmark user (default 100,000)",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=20,
+            help="Number of timed runs per format, the best one is shown (default 20)",
+        )
+
+    def handle(self, *args, **options):
+        user = self.get_benchmark_user(options["rows"])
+        rebuild_rollups([user])
+        now = timezone.localdate()
+
+        reports = {
+            "current": lambda: AnalyticsCurrentSerializer(get_or_generate_current_report(user)).data,
+            "monthly": lambda: AnalyticsMonthlySerializer(
+                get_or_generate_monthly_report(user, year=now.year, month=now.month)
+            ).data,
+            "yearly": lambda: AnalyticsYearlySerializer(get_or_generate_yearly_report(user, year=now.year)).data,
+            "historical": lambda: AnalyticsHistoricalSerializer(get_or_generate_historical_report(user)).data,
+        }
+        formats = {
+            "json": (
+                lambda data: JSONRenderer().render(data),
+                lambda content: json.loads(content, parse_float=Decimal),
+            ),
+            "msgpack": (
+                lambda data: MessagePackRenderer().render(data),
+                lambda content: msgpack.unpackb(content, ext_hook=decode_ext, raw=False),
+            ),
+        }
+
+        self.stdout.write(self.style.NOTICE(f"\n{options['rows']} transactions, best of {options['runs']} runs:"))
+        for report, get_data in reports.items():
+            data = get_data()
+            decoded = {}
+            self.stdout.write(self.style.NOTICE(f"\n{report} report:"))
+            for name, (encode, decode) in formats.items():
+                encode_timings = []
+                decode_timings = []
+                for _ in range(options["runs"]):
+                    start = time.perf_counter()
+                    content = encode(data)
+                    encode_timings.append(time.perf_counter() - start)
+                    start = time.perf_counter()
+                    decoded[name] = decode(content)
+                    decode_timings.append(time.perf_counter() - start)
+                self.stdout.write(
+                    f"{name:>10}: {len(content):>8} bytes, encode {min(encode_timings) * 1000:.3f} ms,"
+                    f" decode {min(decode_timings) * 1000:.3f} ms"
+                )
+
+            if decoded["json"] == decoded["msgpack"]:
+                self.stdout.write(self.style.SUCCESS("Both formats carry the same report."))
+            else:
+                self.stdout.write(self.style.ERROR("The formats carry different reports."))
+
+        self.delete_benchmark_user(user)
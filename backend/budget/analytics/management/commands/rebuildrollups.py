@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import User
+from analytics.services.invalidation import collect_invalidations
+from analytics.services.invalidation import schedule_invalidation
+from analytics.services.rollup import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = """Rebuilds the analytics monthly rollup table from raw transactions."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--email",
+            dest="email",
+            help="Rebuild only the rollups of the user with this email",
+        )
+
+    def handle(self, *args, **options):
+        users = None
+        if options.get("email"):
+            users = User.objects.filter(email=options["email"].lower())
+            if not users.exists():
+                self.stdout.write(self.style.ERROR(f"No user with email {options['email']}."))
+                return
+
+        self.stdout.write("\nRebuilding rollups...")
+        with collect_invalidations():
+            rollup_count = rebuild_rollups(users)
+
+            for user in users if users is not None else User.objects.all():
+                schedule_invalidation(user)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully rebuilt {rollup_count} rollup rows.\n",
+            ),
+        )
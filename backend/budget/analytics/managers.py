@@ -0,0 +1,8 @@
+from django.db.models.manager import Manager
+
+from .queryset import MonthlyRollupQuerySet
+
+
+class MonthlyRollupManager(Manager.from_queryset(MonthlyRollupQuerySet)):
+    """MonthlyRollup manager."""
+    pass
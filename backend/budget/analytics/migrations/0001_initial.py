@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:55
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('transactions', '0002_remove_category_transaction_type_category_sign_and_more'),
+        ('core', '0002_alter_bucket_allocation_percentage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('sign', models.CharField(blank=True, choices=[('POSITIVE', 'POSITIVE'), ('NEGATIVE', 'NEGATIVE'), ('NEUTRAL', 'NEUTRAL')], help_text='Sign of the category at the time the rollup was updated.', max_length=20, null=True)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, help_text='Sum of the transaction amounts', max_digits=14)),
+                ('count', models.IntegerField(default=0, help_text='Number of transactions')),
+                ('bucket', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='monthly_rollups', to='core.bucket')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='monthly_rollups', to='transactions.category')),
+                ('location', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='monthly_rollups', to='core.location')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Monthly rollup',
+                'verbose_name_plural': 'Monthly rollups',
+                'ordering': ('year', 'month'),
+                'indexes': [models.Index(fields=['user', 'year', 'month'], name='rollup_user_year_month_idx')],
+            },
+        ),
+    ]
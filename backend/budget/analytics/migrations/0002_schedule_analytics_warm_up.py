@@ -0,0 +1,45 @@
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+
+from django.db import migrations
+from django.utils import timezone
+
+WARM_UP_SCHEDULE_NAME = "analytics_warm_up"
+WARM_UP_TIME = time(5, 0)  # before the morning logins
+
+
+def create_warm_up_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+
+    now = timezone.localtime()
+    next_run = timezone.make_aware(datetime.combine(now.date(), WARM_UP_TIME))
+    if next_run <= now:
+        next_run += timedelta(days=1)
+
+    Schedule.objects.update_or_create(
+        name=WARM_UP_SCHEDULE_NAME,
+        defaults={
+            "func": "tasks.analytics.warm_up_active_users",
+            "schedule_type": "D",  # Schedule.DAILY
+            "repeats": -1,
+            "next_run": next_run,
+        },
+    )
+
+
+def delete_warm_up_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(name=WARM_UP_SCHEDULE_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0001_initial"),
+        ("django_q", "0014_schedule_cluster"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_warm_up_schedule, delete_warm_up_schedule),
+    ]
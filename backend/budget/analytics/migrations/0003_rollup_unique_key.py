@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.functions.comparison
+import uuid
+
+KEY = ("user_id", "year", "month", "category_id", "location_id", "bucket_id", "sign")
+
+
+def merge_duplicate_rollups(apps, schema_editor):
+    """Merge the rollup rows sharing a key into one, so the unique constraint can be added."""
+    MonthlyRollup = apps.get_model("analytics", "MonthlyRollup")
+    kept = {}
+    for rollup in MonthlyRollup.objects.order_by("pk").iterator():
+        key = tuple(getattr(rollup, field) for field in KEY)
+        if key not in kept:
+            kept[key] = rollup
+            continue
+        MonthlyRollup.objects.filter(pk=kept[key].pk).update(
+            amount=models.F("amount") + rollup.amount,
+            count=models.F("count") + rollup.count,
+        )
+        rollup.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0004_transaction_description_trigram_index'),
+        ('analytics', '0002_schedule_analytics_warm_up'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_rollups, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='monthlyrollup',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='monthly_rollups', to='transactions.category'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyrollup',
+            constraint=models.UniqueConstraint(models.F('user'), models.F('year'), models.F('month'), django.db.models.functions.comparison.Coalesce('category', django.db.models.functions.comparison.Cast(models.Value(uuid.UUID('00000000-0000-0000-0000-000000000000')), models.UUIDField())), django.db.models.functions.comparison.Coalesce('location', django.db.models.functions.comparison.Cast(models.Value(uuid.UUID('00000000-0000-0000-0000-000000000000')), models.UUIDField())), django.db.models.functions.comparison.Coalesce('bucket', django.db.models.functions.comparison.Cast(models.Value(uuid.UUID('00000000-0000-0000-0000-000000000000')), models.UUIDField())), django.db.models.functions.comparison.Coalesce('sign', models.Value('')), name='rollup_unique_key'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import Sum
+from django.db.models.functions import ExtractMonth
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
+
+
+def backfill_rollups(apps, schema_editor):
+    """
+    Build the rollups of the transactions stored before the rollups existed, like `rebuild_rollups` does for everyone,
+    since the reports read them by default and the signals only patch the rows that exist.
+    """
+    Transaction = apps.get_model("transactions", "Transaction")
+    MonthlyRollup = apps.get_model("analytics", "MonthlyRollup")
+
+    rows = Transaction.objects.order_by().values(
+        "user",
+        "category",
+        "location",
+        "bucket",
+        year=ExtractYear("date", tzinfo=timezone.get_default_timezone()),
+        month=ExtractMonth("date", tzinfo=timezone.get_default_timezone()),
+        sign=F("category__sign"),
+    ).annotate(
+        total=Sum("amount"),
+        transactions_count=Count("pk"),
+    )
+
+    MonthlyRollup.objects.all().delete()
+    MonthlyRollup.objects.bulk_create(
+        (
+            MonthlyRollup(
+                user_id=row["user"],
+                year=row["year"],
+                month=row["month"],
+                category_id=row["category"],
+                location_id=row["location"],
+                bucket_id=row["bucket"],
+                sign=row["sign"],
+                amount=row["total"],
+                count=row["transactions_count"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_rollup_unique_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,107 @@
+import uuid
+
+from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Cast
+from django.db.models.functions import Coalesce
+
+from accounts.models import User
+from core.models import Location
+from core.models import Bucket
+from transactions.models import Category
+
+from .managers import MonthlyRollupManager
+
+# Stands for a missing category, location or bucket in the unique rollup key
+NO_OBJECT = uuid.UUID(int=0)
+
+
+class MonthlyRollup(models.Model):
+    """
+    Model to store transaction sums per user, month, category, location, bucket and sign.
+    Kept up to date by the analytics signals and rebuilt from raw data with the 'rebuildrollups' command.
+    """
+    objects = MonthlyRollupManager()
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="monthly_rollups",
+        blank=False,
+        null=False,
+    )
+    year = models.PositiveSmallIntegerField(
+        blank=False,
+        null=False,
+    )
+    month = models.PositiveSmallIntegerField(
+        blank=False,
+        null=False,
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.SET_NULL,
+        related_name="monthly_rollups",
+        blank=True,
+        null=True,
+    )
+    location = models.ForeignKey(
+        Location,
+        on_delete=models.SET_NULL,
+        related_name="monthly_rollups",
+        blank=True,
+        null=True,
+    )
+    bucket = models.ForeignKey(
+        Bucket,
+        on_delete=models.SET_NULL,
+        related_name="monthly_rollups",
+        blank=True,
+        null=True,
+    )
+    sign = models.CharField(
+        max_length=20,
+        choices=Category.Sign.CHOICES,
+        blank=True,
+        null=True,
+        help_text="Sign of the category at the time the rollup was updated.",
+    )
+    amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        blank=False,
+        null=False,
+        help_text="Sum of the transaction amounts",
+    )
+    count = models.IntegerField(
+        default=0,
+        blank=False,
+        null=False,
+        help_text="Number of transactions",
+    )
+
+    def __str__(self):
+        """Return the string representation of the model"""
+        return f"{self.year}-{self.month:02d}: {self.amount}"
+
+    class Meta:
+        verbose_name = "Monthly rollup"
+        verbose_name_plural = "Monthly rollups"
+        ordering = ("year", "month")
+        indexes = [
+            models.Index(fields=["user", "year", "month"], name="rollup_user_year_month_idx"),
+        ]
+        constraints = [
+            # One row per rollup key, NULL foreign keys and signs included (NULLs are never equal in a unique index)
+            models.UniqueConstraint(
+                "user",
+                "year",
+                "month",
+                Coalesce("category", Cast(Value(NO_OBJECT), models.UUIDField())),
+                Coalesce("location", Cast(Value(NO_OBJECT), models.UUIDField())),
+                Coalesce("bucket", Cast(Value(NO_OBJECT), models.UUIDField())),
+                Coalesce("sign", Value("")),
+                name="rollup_unique_key",
+            ),
+        ]
@@ -0,0 +1,11 @@
+from django.db.models import QuerySet
+
+
+class MonthlyRollupQuerySet(QuerySet):
+    """Custom queryset for the MonthlyRollup model."""
+
+    def filter_by_user(self, user):
+        """User can see only his rollups."""
+        if not user.is_authenticated:
+            return self.none()
+        return self.filter(user=user)
@@ -0,0 +1,36 @@
+from rest_framework import serializers
+
+from analytics.services.cents import from_cents
+from analytics.services.cents import to_cents
+
+
+def cents_to_decimal(data):
+    """Turn the integer cents of a report block (nested dicts of amounts) into exact decimals."""
+    if isinstance(data, dict):
+        return {key: cents_to_decimal(value) for key, value in data.items()}
+    if isinstance(data, int) and not isinstance(data, bool):
+        return from_cents(data)
+    return data
+
+
+class CentsField(serializers.DecimalField):
+    """Decimal field for an amount the analytics services hold as integer cents."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("max_digits", 10)
+        kwargs.setdefault("decimal_places", 2)
+        kwargs.setdefault("coerce_to_string", False)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        return to_cents(super().to_internal_value(data))
+
+    def to_representation(self, value):
+        return super().to_representation(from_cents(value))
+
+
+class CentsRepresentationSerializer(serializers.Serializer):
+    """Serializer for report blocks in analytics, turning their integer cents into decimals."""
+
+    def to_representation(self, instance):
+        return cents_to_decimal(instance)
@@ -1,5 +1,8 @@
 from rest_framework import serializers
 
+from analytics.serializers.cents import CentsRepresentationSerializer
+from analytics.serializers.cents import CentsField
+
 
 class RepresentationSerializer(serializers.Serializer):
     """Serializer for representation data in analytics."""
@@ -9,15 +12,16 @@ class RepresentationSerializer(serializers.Serializer):
 
 
 class BalanceSerializer(serializers.Serializer):
-    """Serializer for balance data."""
-    _total = serializers.DecimalField(max_digits=10, decimal_places=2, coerce_to_string=False)
-    positive = serializers.DecimalField(max_digits=10, decimal_places=2, coerce_to_string=False)
-    negative = serializers.DecimalField(max_digits=10, decimal_places=2, coerce_to_string=False)
-    neutral = serializers.DecimalField(max_digits=10, decimal_places=2, coerce_to_string=False)
+    """Serializer for balance data, held in integer cents."""
+    _total = CentsField()
+    positive = CentsField()
+    negative = CentsField()
+    neutral = CentsField()
 
 
 class AnalyticsCurrentSerializer(serializers.Serializer):
     """Serializer for current status analytics."""
-    locations = RepresentationSerializer()
-    buckets = RepresentationSerializer()
+    locations = CentsRepresentationSerializer()
+    buckets = CentsRepresentationSerializer()
     balance = BalanceSerializer()
+    stale = serializers.BooleanField(read_only=True, default=False)
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from analytics.serializers.cents import CentsRepresentationSerializer
+
 
 class RepresentationSerializer(serializers.Serializer):
     """Serializer for representation data in analytics."""
@@ -10,6 +12,7 @@ class RepresentationSerializer(serializers.Serializer):
 
 class AnalyticsHistoricalSerializer(serializers.Serializer):
     """Serializer for historical analytics."""
-    yearly = RepresentationSerializer()
-    summary = RepresentationSerializer()
+    yearly = CentsRepresentationSerializer()
+    summary = CentsRepresentationSerializer()
+    stale = serializers.BooleanField(read_only=True, default=False)
 
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from analytics.serializers.cents import CentsRepresentationSerializer
+
 
 class RepresentationSerializer(serializers.Serializer):
     """Serializer for representation data in analytics."""
@@ -10,8 +12,9 @@ class RepresentationSerializer(serializers.Serializer):
 
 class AnalyticsMonthlySerializer(serializers.Serializer):
     """Serializer for current month analytics."""
-    positive_categories = RepresentationSerializer()
-    negative_categories = RepresentationSerializer()
-    neutral_categories = RepresentationSerializer()
-    balance = RepresentationSerializer()
+    positive_categories = CentsRepresentationSerializer()
+    negative_categories = CentsRepresentationSerializer()
+    neutral_categories = CentsRepresentationSerializer()
+    balance = CentsRepresentationSerializer()
     period = RepresentationSerializer()
+    stale = serializers.BooleanField(read_only=True, default=False)
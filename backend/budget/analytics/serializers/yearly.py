@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from analytics.serializers.cents import CentsRepresentationSerializer
+
 
 class RepresentationSerializer(serializers.Serializer):
     """Serializer for representation data in analytics."""
@@ -10,7 +12,8 @@ class RepresentationSerializer(serializers.Serializer):
 
 class AnalyticsYearlySerializer(serializers.Serializer):
     """Serializer for current year analytics."""
-    monthly = RepresentationSerializer()
-    summary = RepresentationSerializer()
+    monthly = CentsRepresentationSerializer()
+    summary = CentsRepresentationSerializer()
     period = RepresentationSerializer()
+    stale = serializers.BooleanField(read_only=True, default=False)
 
@@ -1,7 +1,18 @@
+from collections import defaultdict
+from datetime import date
+
+from django.conf import settings
+from django.db.models import Q
 from django.db.models import Sum
 from django.db.models import DecimalField
 from django.db.models.functions import Coalesce
+from django.db.models.functions import TruncMonth
+from django.db.models.functions import TruncYear
+from django.utils import timezone
 
+from analytics.models import MonthlyRollup
+from analytics.services.cents import cents_expression
+from analytics.services.periods import Period
 from core.models import Location
 from core.models import Bucket
 from transactions.models import Category
@@ -12,12 +23,34 @@ class AnalyticsBaseService:
     """Base service for analytics operations."""
     CACHE_TIMEOUT = 3600  # 1 hour
 
+    # Dimensions a transaction queryset can be grouped by in `aggregate_transactions`.
+    # String values are model lookups, the rest are expressions evaluated by the database.
+    GROUP_BY_DIMENSIONS = {
+        "sign": "category__sign",
+        "category": "category",
+        "location": "location",
+        "bucket": "bucket",
+        "month": TruncMonth("date"),
+        "year": TruncYear("date"),
+    }
+
+    # The same dimensions, as stored in the MonthlyRollup table.
+    ROLLUP_GROUP_BY_DIMENSIONS = {
+        "sign": ("sign",),
+        "category": ("category",),
+        "location": ("location",),
+        "bucket": ("bucket",),
+        "month": ("year", "month"),
+        "year": ("year",),
+    }
+
     def __init__(self, user):
         self.user = user
         self.locations = Location.available_objects.filter_by_user(user=self.user)
         self.buckets = Bucket.available_objects.filter_by_user(user=self.user)
         self.categories = Category.available_objects.filter_by_user(user=self.user)
         self.transactions = Transaction.objects.filter_by_user(user=self.user)
+        self.rollups = MonthlyRollup.objects.filter_by_user(user=self.user)
 
     def get_positive_categories(self):
         """Get all positive categories for the given user."""
@@ -45,27 +78,126 @@ class AnalyticsBaseService:
 
     @staticmethod
     def sum_transactions(queryset: Transaction):
-        """Sum the amount for a queryset of transactions."""
+        """Sum the amount for a queryset of transactions, in integer cents."""
         return queryset.aggregate(
-            _total=Coalesce(
+            _total=cents_expression(Coalesce(
                 Sum("amount", output_field=DecimalField()),
                 0, output_field=DecimalField()
-            )
+            ))
         )["_total"]
 
-    def get_balance_for_queryset(self, queryset: Transaction):
-        """Get balance for a specific queryset of transactions."""
-        positive = self.sum_transactions(queryset.filter(
-            category__sign=Category.Sign.POSITIVE
-        ))
+    @staticmethod
+    def get_sum_expressions(sign_lookup="category__sign"):
+        """Get the total and the sign-conditional sums (in integer cents) computed for every group."""
+        def conditional_sum(condition=None):
+            return cents_expression(Coalesce(
+                Sum("amount", filter=condition, output_field=DecimalField()),
+                0, output_field=DecimalField()
+            ))
+
+        return {
+            "total": conditional_sum(),
+            "positive": conditional_sum(Q(**{sign_lookup: Category.Sign.POSITIVE})),
+            "negative": conditional_sum(Q(**{sign_lookup: Category.Sign.NEGATIVE})),
+            "neutral": conditional_sum(Q(**{sign_lookup: Category.Sign.NEUTRAL})),
+        }
+
+    def group_transactions(self, queryset: Transaction, group_by):
+        """Get the grouped and summed queryset `aggregate_transactions` evaluates."""
+        fields = []
+        expressions = {}
+        for dimension in group_by:
+            lookup = self.GROUP_BY_DIMENSIONS[dimension]
+            if isinstance(lookup, str):
+                fields.append(lookup)
+            else:
+                expressions[dimension] = lookup
+
+        return queryset.order_by().values(*fields, **expressions).annotate(**self.get_sum_expressions())
+
+    def aggregate_transactions(self, queryset: Transaction, group_by=()):
+        """
+        Sum a queryset of transactions in a single query, grouped by the given dimensions.
+        Returns one row per group, holding the group values plus total, positive, negative and neutral sums in cents.
+        """
+        if not group_by:
+            return [queryset.aggregate(**self.get_sum_expressions())]
+
+        rows = list(self.group_transactions(queryset, group_by))
+
+        for dimension in group_by:
+            lookup = self.GROUP_BY_DIMENSIONS[dimension]
+            if isinstance(lookup, str) and lookup != dimension:
+                for row in rows:
+                    row[dimension] = row.pop(lookup)
+
+        return rows
+
+    def aggregate_rollups(self, queryset: MonthlyRollup, group_by=()):
+        """
+        Sum a queryset of monthly rollups in a single query, grouped by the given dimensions.
+        Returns rows shaped like the ones from `aggregate_transactions`.
+        """
+        sums = self.get_sum_expressions(sign_lookup="sign")
+
+        if not group_by:
+            return [queryset.aggregate(**sums)]
+
+        fields = []
+        for dimension in group_by:
+            for field in self.ROLLUP_GROUP_BY_DIMENSIONS[dimension]:
+                if field not in fields:
+                    fields.append(field)
+
+        rows = list(queryset.order_by().values(*fields).annotate(**sums))
+
+        for row in rows:
+            if "month" in group_by:
+                row["month"] = date(row["year"], row["month"], 1)
+            if "year" in group_by:
+                row["year"] = date(row["year"], 1, 1)
+
+        return rows
+
+    def get_rows(self, group_by=(), period: Period = None):
+        """
+        Get the user's transaction sums for a period (all time if None), grouped by the given dimensions.
+        Reads from the MonthlyRollup table when the period covers whole months, otherwise
+        (or when ANALYTICS_USE_ROLLUP is disabled) scans the transactions.
+        """
+        if settings.ANALYTICS_USE_ROLLUP and (period is None or period.is_month_aligned()):
+            rollups = self.rollups if period is None else period.filter_rollups(self.rollups)
+            return self.aggregate_rollups(rollups, group_by)
+
+        transactions = self.transactions if period is None else period.filter(self.transactions)
+        return self.aggregate_transactions(transactions, group_by)
+
+    def get_categories_by_sign(self):
+        """Get (id, name) pairs of the user's categories, grouped by sign."""
+        categories = {
+            Category.Sign.POSITIVE: [],
+            Category.Sign.NEGATIVE: [],
+            Category.Sign.NEUTRAL: [],
+        }
+        for category_id, name, sign in self.categories.values_list("id", "name", "sign"):
+            categories[sign].append((category_id, name))
+        return categories
+
+    @staticmethod
+    def get_categories_from_rows(rows, categories):
+        """Map category names to their summed amount in cents, using rows grouped (at least) by category."""
+        totals = defaultdict(int)
+        for row in rows:
+            totals[row["category"]] += row["total"]
 
-        negative = self.sum_transactions(queryset.filter(
-            category__sign=Category.Sign.NEGATIVE
-        ))
+        return {name: totals.get(category_id, 0) for category_id, name in categories}
 
-        neutral = self.sum_transactions(queryset.filter(
-            category__sign=Category.Sign.NEUTRAL
-        ))
+    @staticmethod
+    def get_balance_from_rows(rows):
+        """Fold aggregated rows into a balance, in cents."""
+        positive = sum(row["positive"] for row in rows)
+        negative = sum(row["negative"] for row in rows)
+        neutral = sum(row["neutral"] for row in rows)
 
         return {
             "_total": positive - negative + neutral,
@@ -74,10 +206,38 @@ class AnalyticsBaseService:
             "neutral": neutral
         }
 
+    def get_report_data_from_rows(self, rows, categories_by_sign=None):
+        """Build the categories and balance block shared by every report, from rows grouped by category."""
+        if categories_by_sign is None:
+            categories_by_sign = self.get_categories_by_sign()
+
+        return {
+            "positive_categories": self.get_categories_from_rows(rows, categories_by_sign[Category.Sign.POSITIVE]),
+            "negative_categories": self.get_categories_from_rows(rows, categories_by_sign[Category.Sign.NEGATIVE]),
+            "neutral_categories": self.get_categories_from_rows(rows, categories_by_sign[Category.Sign.NEUTRAL]),
+            "balance": self.get_balance_from_rows(rows),
+        }
+
+    def get_balance_for_queryset(self, queryset: Transaction):
+        """Get balance for a specific queryset of transactions."""
+        return self.get_balance_from_rows(self.aggregate_transactions(queryset))
+
+    def get_timezone(self):
+        """Get the timezone periods are expressed in (the one activated for the user, if any)."""
+        return timezone.get_current_timezone()
+
+    def get_month_period(self, month, year):
+        """Get the period of a month in the user's timezone."""
+        return Period.month(year, month, tz=self.get_timezone())
+
+    def get_year_period(self, year):
+        """Get the period of a year in the user's timezone."""
+        return Period.year(year, tz=self.get_timezone())
+
     def get_transactions_by_month(self, month, year):
         """Get transactions by month and year."""
-        return self.transactions.filter(date__year=year, date__month=month)
+        return self.get_month_period(month=month, year=year).filter(self.transactions)
 
     def get_transactions_by_year(self, year):
         """Get transactions by year."""
-        return self.transactions.filter(date__year=year)
+        return self.get_year_period(year=year).filter(self.transactions)
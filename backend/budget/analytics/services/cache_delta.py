@@ -0,0 +1,195 @@
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction as db_transaction
+
+from analytics.services.cache_utils import acquire_report_lock
+from analytics.services.cache_utils import get_report_cache_key
+from analytics.services.cache_utils import release_report_lock
+from analytics.services.invalidation import is_invalidation_pending
+from analytics.services.invalidation import schedule_invalidation
+from analytics.services.cents import to_cents
+from analytics.services.periods import Period
+from analytics.services.rollup import get_rollup_entry
+from transactions.models import Category
+from transactions.models import Transaction
+
+logger = logging.getLogger(__name__)
+
+SIGN_KEYS = {
+    Category.Sign.POSITIVE: "positive",
+    Category.Sign.NEGATIVE: "negative",
+    Category.Sign.NEUTRAL: "neutral",
+}
+
+
+def get_available_name(instance):
+    """Get the name under which an object shows up in the reports, or None if it does not show up."""
+    if instance is None or instance.is_removed:
+        return None
+    return instance.name
+
+
+def get_report_entry(transaction):
+    """Describe how a transaction contributes to the reports (its amount in cents), or None if it contributes nothing."""
+    key, amount = get_rollup_entry(transaction)
+    if key["sign"] is None:
+        return None
+
+    return {
+        "year": key["year"],
+        "month": key["month"],
+        "sign": key["sign"],
+        "category": get_available_name(transaction.category),
+        "location": get_available_name(transaction.location),
+        "bucket": get_available_name(transaction.bucket),
+        "amount": to_cents(amount),
+    }
+
+
+def patch_balance(balance, sign_key, amount):
+    """Add an amount to one sign of a balance and recompute its total."""
+    balance[sign_key] += amount
+    balance["_total"] = balance["positive"] - balance["negative"] + balance["neutral"]
+
+
+def patch_block(block, entry, amount):
+    """Add an amount to a categories and balance block (monthly report, yearly/historical entries and summaries)."""
+    sign_key = SIGN_KEYS[entry["sign"]]
+    categories = block[f"{sign_key}_categories"]
+    if entry["category"] in categories:
+        categories[entry["category"]] += amount
+    patch_balance(block["balance"], sign_key, amount)
+
+
+def patch_current_report(report, entry, amount):
+    """Add an amount to the location, bucket and balance of the current report."""
+    signed_amount = -amount if entry["sign"] == Category.Sign.NEGATIVE else amount
+
+    for field, data in (("location", report["locations"]), ("bucket", report["buckets"])):
+        if entry[field] in data:
+            data[entry[field]] += signed_amount
+            data["_total"] += signed_amount
+
+    patch_balance(report["balance"], SIGN_KEYS[entry["sign"]], amount)
+
+
+def get_empty_block(summary):
+    """Get a block with every category of the summary set to zero."""
+    block = {
+        f"{sign_key}_categories": {name: 0 for name in summary[f"{sign_key}_categories"]}
+        for sign_key in SIGN_KEYS.values()
+    }
+    block["balance"] = {"_total": 0, "positive": 0, "negative": 0, "neutral": 0}
+    return block
+
+
+def patch_historical_report(report, entry, amount):
+    """Add an amount to the year it belongs to and to the summary of the historical report."""
+    year_key = str(entry["year"])
+    if year_key not in report["yearly"]:
+        report["yearly"][year_key] = get_empty_block(report["summary"])
+        report["yearly"] = dict(sorted(report["yearly"].items(), key=lambda item: int(item[0])))
+
+    patch_block(report["yearly"][year_key], entry, amount)
+    patch_block(report["summary"], entry, amount)
+
+
+def apply_transaction_delta(user, previous_entry, current_entry):
+    """
+    Patch the user's cached current, monthly, yearly and historical reports with a single transaction change,
+    leaving unaffected reports untouched.
+    Returns False when the reports could not be patched and have to be recomputed instead.
+    """
+    if previous_entry == current_entry:
+        return True
+
+    changes = [
+        (entry, amount)
+        for entry, amount in ((previous_entry, -1), (current_entry, 1))
+        if entry is not None
+    ]
+
+    current_key = get_report_cache_key(user.id, "current")
+    historical_key = get_report_cache_key(user.id, "historical")
+    monthly_keys = {
+        (entry["year"], entry["month"]): get_report_cache_key(user.id, "monthly", entry["year"], entry["month"])
+        for entry, _ in changes
+    }
+    yearly_keys = {
+        entry["year"]: get_report_cache_key(user.id, "yearly", entry["year"])
+        for entry, _ in changes
+    }
+    cache_keys = [current_key, historical_key, *monthly_keys.values(), *yearly_keys.values()]
+
+    # The report locks keep out another patch and the computation of the same reports (which would overwrite
+    # each other), a report being computed already falls back to recomputation.
+    token = uuid.uuid4().hex
+    locked = []
+    for cache_key in cache_keys:
+        if not acquire_report_lock(f"{cache_key}_lock", token):
+            break
+        locked.append(cache_key)
+
+    try:
+        if len(locked) < len(cache_keys):
+            return False
+
+        reports = cache.get_many(cache_keys)
+        if not reports:
+            return True
+
+        for entry, multiplier in changes:
+            amount = entry["amount"] * multiplier
+
+            if current_key in reports:
+                patch_current_report(reports[current_key], entry, amount)
+
+            monthly_key = monthly_keys[(entry["year"], entry["month"])]
+            if monthly_key in reports:
+                patch_block(reports[monthly_key], entry, amount)
+
+            yearly_key = yearly_keys[entry["year"]]
+            if yearly_key in reports:
+                patch_block(reports[yearly_key]["monthly"][str(entry["month"])], entry, amount)
+                patch_block(reports[yearly_key]["summary"], entry, amount)
+
+            if historical_key in reports:
+                patch_historical_report(reports[historical_key], entry, amount)
+
+        # A year without transactions is not part of the historical report
+        if historical_key in reports and previous_entry is not None:
+            year = previous_entry["year"]
+            if not Period.year(year).filter(Transaction.objects.filter(user=user)).exists():
+                reports[historical_key]["yearly"].pop(str(year), None)
+
+        cache.set_many(reports, timeout=settings.CACHE_TTL)
+        return True
+    except Exception as e:
+        logger.warning(f"Cache delta failed for user {user.id}: {e}")
+        return False
+    finally:
+        for cache_key in locked:
+            release_report_lock(f"{cache_key}_lock", token)
+
+
+def schedule_transaction_delta(user, previous_entry, current_entry):
+    """
+    Patch the user's cached reports with a transaction change once the current database transaction commits
+    (right away outside one), invalidating them instead if they cannot be patched.
+    A change rolled back patches nothing, and reports due to be invalidated anyway are not patched.
+    """
+    if previous_entry == current_entry:
+        return
+    if is_invalidation_pending(user):
+        # Also queues the pending invalidation on this transaction, in case the one it came with was rolled back
+        schedule_invalidation(user)
+        return
+
+    def apply_on_commit():
+        if is_invalidation_pending(user) or not apply_transaction_delta(user, previous_entry, current_entry):
+            schedule_invalidation(user)
+
+    db_transaction.on_commit(apply_on_commit)
@@ -1,23 +1,28 @@
 import logging
+import time
+import uuid
+from datetime import datetime
+from datetime import timedelta
 
 from django.core.cache import cache
 from django.utils import timezone
 from django.conf import settings
 
-# from tasks.analytics import generate_current_report
-# from tasks.analytics import generate_monthly_report
-# from tasks.analytics import generate_yearly_report
-# from tasks.analytics import generate_historical_report
-
 from django_q.tasks import async_task
 
+from analytics.services.combined import AnalyticsCombinedService
 from analytics.services.current import AnalyticsCurrentService
 from analytics.services.monthly import AnalyticsMonthlyService
 from analytics.services.yearly import AnalyticsYearlyService
 from analytics.services.historical import AnalyticsHistoricalService
+from analytics.services.vectorized import AnalyticsVectorizedService
 
 logger = logging.getLogger(__name__)
 
+# Bumped whenever the layout of the cached reports changes (2: amounts held in integer cents),
+# so entries cached by a previous release are never read back
+REPORT_FORMAT = 2
+
 def safe_cache_get(key, default=None):
     try:
         return cache.get(key, default)
@@ -25,6 +30,13 @@ def safe_cache_get(key, default=None):
         logger.warning(f"Cache get failed for key {key}: {e}")
         return default
 
+def safe_cache_get_many(keys):
+    try:
+        return cache.get_many(keys)
+    except Exception as e:
+        logger.warning(f"Cache get_many failed for {len(keys)} keys: {e}")
+        return {}
+
 def safe_cache_set(key, value, timeout=None):
     try:
         cache.set(key, value, timeout)
@@ -41,83 +53,256 @@ def safe_cache_delete(key):
         logger.warning(f"Cache delete failed for key {key}: {e}")
         return False
 
+def safe_cache_delete_many(keys):
+    try:
+        cache.delete_many(keys)
+        return True
+    except Exception as e:
+        logger.warning(f"Cache delete_many failed for {len(keys)} keys: {e}")
+        return False
 
-def get_or_generate_current_report(user):
-    cache_key = f"current_report_{user.id}"
-    report_data = safe_cache_get(cache_key)
+def safe_cache_set_many(data, timeout=None):
+    try:
+        cache.set_many(data, timeout)
+        return True
+    except Exception as e:
+        logger.warning(f"Cache set_many failed for {len(data)} keys: {e}")
+        return False
 
-    if report_data is None:
-        # generate_current_report.delay(user.id)
-        async_task("tasks.analytics.generate_current_report", user.id)
+def safe_cache_add(key, value, timeout=None):
+    try:
+        return cache.add(key, value, timeout)
+    except Exception as e:
+        logger.warning(f"Cache add failed for key {key}: {e}")
+        return False
 
-        service = AnalyticsCurrentService(user)
-        report_data = service.get_summary()
-        report_data["generated_at"] = timezone.now().isoformat()
+def safe_cache_incr(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # The key does not exist (yet, or anymore)
+        return None
+    except Exception as e:
+        logger.warning(f"Cache incr failed for key {key}: {e}")
+        return None
 
-        safe_cache_set(cache_key, report_data, timeout=settings.CACHE_TTL)
 
-    return report_data
+def get_user_cache_version_key(user_id):
+    return f"analytics_version_{user_id}"
 
 
-def get_or_generate_monthly_report(user, year, month):
-    cache_key = f"monthly_report_{user.id}_{year}_{month}"
-    report_data = safe_cache_get(cache_key)
+def get_user_cache_version(user_id):
+    """Get the generation number embedded in the user's report cache keys."""
+    version_key = get_user_cache_version_key(user_id)
+    version = safe_cache_get(version_key)
 
-    if report_data is None:
-        # generate_monthly_report.delay(user.id, year, month)
-        async_task("tasks.analytics.generate_monthly_report", user.id, year, month)
+    if version is None:
+        # Start from the current timestamp, so a version key lost to eviction never resurrects old entries
+        safe_cache_add(version_key, int(time.time()), timeout=None)
+        version = safe_cache_get(version_key, default=0)
 
-        service = AnalyticsMonthlyService(user, year, month)
-        report_data = service.get_summary()
-        report_data["generated_at"] = timezone.now().isoformat()
+    return version
 
-        safe_cache_set(cache_key, report_data, timeout=settings.CACHE_TTL)
 
-    return report_data
+def get_report_cache_key(user_id, report, *period, version=None):
+    """Get the versioned cache key of a report (current, monthly, yearly or historical) for the given user."""
+    if version is None:
+        version = get_user_cache_version(user_id)
+    parts = [f"{report}_report", user_id, *period, f"f{REPORT_FORMAT}", f"v{version}"]
+    return "_".join(str(part) for part in parts)
 
 
-def get_or_generate_yearly_report(user, year):
-    cache_key = f"yearly_report_{user.id}_{year}"
-    report_data = safe_cache_get(cache_key)
+REPORT_SERVICES = {
+    "current": AnalyticsCurrentService,
+    "monthly": AnalyticsMonthlyService,
+    "yearly": AnalyticsYearlyService,
+    "historical": AnalyticsHistoricalService,
+}
 
-    if report_data is None:
-        # generate_yearly_report.delay(user.id, year)
-        async_task("tasks.analytics.generate_yearly_report", user.id, year)
 
-        service = AnalyticsYearlyService(user, year)
-        report_data = service.get_summary()
-        report_data["generated_at"] = timezone.now().isoformat()
+def get_report_previous_key(user_id, report, *period):
+    """Get the unversioned cache key holding the last report generated, served while a new one is computed."""
+    parts = [f"{report}_report", user_id, *period, f"f{REPORT_FORMAT}", "previous"]
+    return "_".join(str(part) for part in parts)
 
-        safe_cache_set(cache_key, report_data, timeout=settings.CACHE_TTL)
 
+def stamp_report(report_data):
+    """Add the generation time and the soft expiry to a freshly computed report."""
+    generated_at = timezone.now()
+    report_data["generated_at"] = generated_at.isoformat()
+    report_data["soft_expires_at"] = (generated_at + timedelta(seconds=settings.ANALYTICS_SOFT_TTL)).isoformat()
     return report_data
 
 
-def get_or_generate_historical_report(user):
-    cache_key = f"historical_report_{user.id}"
-    report_data = safe_cache_get(cache_key)
+def generate_report(user, report, *period):
+    """Compute a report (current, monthly, yearly or historical) from the database, with the configured backend."""
+    if settings.ANALYTICS_BACKEND == "numpy":
+        return stamp_report(AnalyticsVectorizedService(user).get_report_summary(report, *period))
+
+    service = REPORT_SERVICES[report](user, *period)
+    return stamp_report(service.get_summary())
+
+
+def get_period_reports(periods=()):
+    """Get the (report, *period) tuples of the current and historical reports, plus the reports of the given periods."""
+    reports = [("current",), ("historical",)]
+    for period in periods:
+        if isinstance(period, int):
+            period = (period,)
+        reports.append(("yearly", *period) if len(period) == 1 else ("monthly", *period))
+    return reports
+
+
+def generate_and_cache_reports(user, periods=()):
+    """
+    Compute the current and historical reports, plus the monthly and yearly reports of the given periods
+    ((year, month) tuples or years), from a single scan, and cache them all in one round trip.
+    Like `refresh_report`, the cache keys are read and the report locks taken before computing, so reports
+    computed from data changed meanwhile go to an invalidated version, and reports being computed by another
+    process are left to it. Returns the cache keys of the cached reports.
+    """
+    version = get_user_cache_version(user.id)
+    token = uuid.uuid4().hex
+    cache_keys = {}
+    for report in get_period_reports(periods):
+        cache_key = get_report_cache_key(user.id, *report, version=version)
+        if acquire_report_lock(f"{cache_key}_lock", token):
+            cache_keys[report] = cache_key
+    if not cache_keys:
+        return []
+
+    try:
+        if settings.ANALYTICS_BACKEND == "numpy":
+            summaries = AnalyticsVectorizedService(user).get_summaries(periods)
+        else:
+            summaries = AnalyticsCombinedService(user).get_summaries(periods)
 
-    if report_data is None:
-        # generate_historical_report.delay(user.id)
-        async_task("tasks.analytics.generate_historical_report", user.id)
+        entries = {}
+        for report, cache_key in cache_keys.items():
+            report_data = stamp_report(summaries[report])
+            entries[cache_key] = report_data
+            entries[get_report_previous_key(user.id, *report)] = report_data
 
-        service = AnalyticsHistoricalService(user)
-        report_data = service.get_summary()
-        report_data["generated_at"] = timezone.now().isoformat()
+        safe_cache_set_many(entries, timeout=settings.CACHE_TTL)
+        safe_cache_delete_many([f"{cache_key}_refreshing" for cache_key in cache_keys.values()])
+        return list(cache_keys.values())
+    finally:
+        for cache_key in cache_keys.values():
+            release_report_lock(f"{cache_key}_lock", token)
 
+
+def is_report_stale(report_data):
+    """Check if a cached report is past its soft expiry, meaning it is served as is but refreshed in the background."""
+    soft_expires_at = report_data.get("soft_expires_at")
+    return soft_expires_at is not None and datetime.fromisoformat(soft_expires_at) <= timezone.now()
+
+
+def serve_stale_report(user, report, *period, cache_key, report_data):
+    """Mark a report as stale and enqueue its refresh, once for all the requests served while it runs."""
+    if safe_cache_add(f"{cache_key}_refreshing", 1, timeout=settings.ANALYTICS_LOCK_TIMEOUT):
+        async_task(f"tasks.analytics.generate_{report}_report", user.id, *period)
+    return {**report_data, "stale": True}
+
+
+def acquire_report_lock(lock_key, token):
+    """Try to become the only process computing a report. Without a working cache every process computes."""
+    try:
+        return cache.add(lock_key, token, settings.ANALYTICS_LOCK_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Cache add failed for key {lock_key}: {e}")
+        return True
+
+
+def release_report_lock(lock_key, token):
+    """Release a report lock, unless it expired and was taken over by another process."""
+    if safe_cache_get(lock_key) == token:
+        safe_cache_delete(lock_key)
+
+
+def refresh_report(user, report, *period, cache_key=None):
+    """
+    Compute a report and cache it, unless another process is already computing it.
+    Returns the report, or None when the computation was left to the other process.
+    """
+    if cache_key is None:
+        cache_key = get_report_cache_key(user.id, report, *period)
+    lock_key = f"{cache_key}_lock"
+    token = uuid.uuid4().hex
+
+    if not acquire_report_lock(lock_key, token):
+        return None
+
+    try:
+        report_data = generate_report(user, report, *period)
         safe_cache_set(cache_key, report_data, timeout=settings.CACHE_TTL)
+        safe_cache_delete(f"{cache_key}_refreshing")
+        safe_cache_set(get_report_previous_key(user.id, report, *period), report_data, timeout=settings.CACHE_TTL)
+        return report_data
+    finally:
+        release_report_lock(lock_key, token)
+
+
+def wait_for_report(cache_key):
+    """Wait a little for another process to cache a report. Returns None if it did not make it in time."""
+    deadline = time.monotonic() + settings.ANALYTICS_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(settings.ANALYTICS_LOCK_POLL_INTERVAL)
+        report_data = safe_cache_get(cache_key)
+        if report_data is not None:
+            return report_data
+    return None
+
+
+def get_or_generate_report(user, report, *period):
+    """
+    Get a report from the cache, computing it only on a hard miss.
+    A report past its soft expiry is served right away, marked as stale, while a background task refreshes it.
+    Concurrent misses on the same report compute it once: the first request takes the lock and computes,
+    the others wait for its result, or get the previous report if it takes too long.
+    """
+    cache_key = get_report_cache_key(user.id, report, *period)
+    report_data = safe_cache_get(cache_key)
+    if report_data is not None:
+        if is_report_stale(report_data):
+            return serve_stale_report(user, report, *period, cache_key=cache_key, report_data=report_data)
+        return report_data
 
-    return report_data
+    report_data = refresh_report(user, report, *period, cache_key=cache_key)
+    if report_data is not None:
+        return report_data
 
+    report_data = wait_for_report(cache_key)
+    if report_data is not None:
+        return report_data
 
-def invalidate_user_analytics_cache(user):
-    safe_cache_delete(f"current_report_{user.id}")
-    safe_cache_delete(f"historical_report_{user.id}")
+    previous_data = safe_cache_get(get_report_previous_key(user.id, report, *period))
+    if previous_data is not None:
+        # The lock holder is too slow or died, the background task makes sure the report still gets refreshed
+        return serve_stale_report(user, report, *period, cache_key=cache_key, report_data=previous_data)
+
+    # Nothing to serve: compute without the lock rather than fail the request
+    return generate_report(user, report, *period)
+
+
+def get_or_generate_current_report(user):
+    return get_or_generate_report(user, "current")
+
+
+def get_or_generate_monthly_report(user, year, month):
+    return get_or_generate_report(user, "monthly", year, month)
 
-    years_back = 5
-    current_year = timezone.now().year
-    for year in range(current_year - years_back, current_year + 1):
-        safe_cache_delete(f"yearly_report_{user.id}_{year}")
 
-        for month in range(1, 13):
-            safe_cache_delete(f"monthly_report_{user.id}_{year}_{month}")
+def get_or_generate_yearly_report(user, year):
+    return get_or_generate_report(user, "yearly", year)
+
+
+def get_or_generate_historical_report(user):
+    return get_or_generate_report(user, "historical")
+
+
+def invalidate_user_analytics_cache(user):
+    """Invalidate every cached report of the user with a single atomic increment of the cache version."""
+    version_key = get_user_cache_version_key(user.id)
+
+    if safe_cache_incr(version_key) is None:
+        safe_cache_add(version_key, int(time.time()), timeout=None)
@@ -0,0 +1,28 @@
+from decimal import ROUND_HALF_EVEN
+from decimal import Decimal
+
+from django.db.models import BigIntegerField
+from django.db.models.functions import Cast
+from django.db.models.functions import Round
+
+# Reports are computed and cached as integer cents, and only turned into decimals by the analytics serializers.
+# Integer sums are exact whatever their size, and ints are much cheaper to build and pickle than Decimals.
+
+
+def to_cents(amount):
+    """Turn a decimal amount (at most two decimal places) into integer cents."""
+    return int(Decimal(str(amount)).scaleb(2).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+def from_cents(cents):
+    """Turn integer cents into the exact decimal amount they stand for."""
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def cents_expression(expression):
+    """
+    Get a database expression turning a decimal amount expression into integer cents.
+    Rounded before the cast, since SQLite sums decimals as floats and a cast alone truncates.
+    """
+    return Cast(Round(expression * 100), output_field=BigIntegerField())
+
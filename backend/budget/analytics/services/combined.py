@@ -0,0 +1,51 @@
+from datetime import date
+
+from .base import AnalyticsBaseService
+from .current import AnalyticsCurrentService
+from .monthly import AnalyticsMonthlyService
+from .yearly import AnalyticsYearlyService
+from .historical import AnalyticsHistoricalService
+
+
+class AnalyticsCombinedService(AnalyticsBaseService):
+    """Service to provide several reports at once, all derived from a single scan of the user's transactions."""
+
+    def get_all_rows(self):
+        """Get all transaction sums grouped by month, category, location and bucket, in a single query."""
+        return self.get_rows(group_by=("month", "category", "location", "bucket"))
+
+    def get_summaries(self, periods=()):
+        """
+        Get the current and historical reports, plus a monthly report for every (year, month)
+        and a yearly report for every year in periods.
+        Returns the reports keyed by (report, *period) tuples.
+        """
+        rows = self.get_all_rows()
+        categories_by_sign = self.get_categories_by_sign()
+
+        summaries = {
+            ("current",): AnalyticsCurrentService(self.user).get_summary(rows),
+            ("historical",): AnalyticsHistoricalService(self.user).get_summary(
+                [{**row, "year": date(row["month"].year, 1, 1)} for row in rows],
+                categories_by_sign,
+            ),
+        }
+
+        for period in periods:
+            if isinstance(period, int):
+                period = (period,)
+
+            if len(period) == 1:
+                year, = period
+                year_rows = [row for row in rows if row["month"].year == year]
+                summaries[("yearly", year)] = AnalyticsYearlyService(self.user, year).get_summary(
+                    year_rows, categories_by_sign
+                )
+            else:
+                year, month = period
+                month_rows = [row for row in rows if (row["month"].year, row["month"].month) == (year, month)]
+                summaries[("monthly", year, month)] = AnalyticsMonthlyService(self.user, year, month).get_summary(
+                    month_rows, categories_by_sign
+                )
+
+        return summaries
@@ -1,41 +1,56 @@
+from collections import defaultdict
+
 from .base import AnalyticsBaseService
 
 
 class AnalyticsCurrentService(AnalyticsBaseService):
     """Service to provide current status analytics."""
 
-    def get_locations_data(self):
-        """Get locations data for the given user."""
-        locations = {"_total": 0}
+    @staticmethod
+    def get_balances_from_rows(rows, dimension, objects):
+        """Map object names to their balance in cents, using rows grouped (at least) by the given dimension."""
+        balances = defaultdict(int)
+        for row in rows:
+            balances[row[dimension]] += row["positive"] - row["negative"] + row["neutral"]
 
-        for location in self.locations:
-            location_transactions = self.transactions.filter(location=location)
-            location_balance = self.get_balance_for_queryset(location_transactions)
-            locations[location.name] = location_balance["_total"]
-            locations["_total"] += locations[location.name]
+        data = {"_total": 0}
+        for object_id, name in objects.values_list("id", "name"):
+            data[name] = balances.get(object_id, 0)
+            data["_total"] += data[name]
 
-        return locations
+        return data
 
-    def get_buckets_data(self):
-        """Get buckets data for the given user."""
-        buckets = {"_total": 0}
+    def get_locations_data(self, rows=None):
+        """Get locations data for the given user."""
+        if rows is None:
+            rows = self.get_rows(group_by=("location",))
 
-        for bucket in self.buckets:
-            bucket_transactions = self.transactions.filter(bucket=bucket)
-            bucket_balance = self.get_balance_for_queryset(bucket_transactions)
-            buckets[bucket.name] = bucket_balance["_total"]
-            buckets["_total"] += buckets[bucket.name]
+        return self.get_balances_from_rows(rows, "location", self.locations)
 
-        return buckets
+    def get_buckets_data(self, rows=None):
+        """Get buckets data for the given user."""
+        if rows is None:
+            rows = self.get_rows(group_by=("bucket",))
+
+        return self.get_balances_from_rows(rows, "bucket", self.buckets)
 
-    def get_balance(self):
+    def get_balance(self, rows=None):
         """Get balance for the given user."""
-        return self.get_balance_for_queryset(self.transactions)
+        if rows is None:
+            rows = self.get_rows()
+
+        return self.get_balance_from_rows(rows)
+
+    def get_summary(self, rows=None):
+        """
+        Get complete summary of current status for the given user.
+        One query grouped by location and bucket feeds all three blocks.
+        """
+        if rows is None:
+            rows = self.get_rows(group_by=("location", "bucket"))
 
-    def get_summary(self):
-        """Get complete summary of current status for the given user."""
         return {
-            "locations": self.get_locations_data(),
-            "buckets": self.get_buckets_data(),
-            "balance": self.get_balance(),
+            "locations": self.get_locations_data(rows),
+            "buckets": self.get_buckets_data(rows),
+            "balance": self.get_balance(rows),
         }
@@ -1,3 +1,5 @@
+from transactions.models import Category
+
 from .base import AnalyticsBaseService
 
 
@@ -9,103 +11,71 @@ class AnalyticsHistoricalService(AnalyticsBaseService):
         self.user = user
         super().__init__(user)
 
+    def get_year_rows(self, year):
+        """Get the year's transaction sums grouped by category, in a single query."""
+        return self.get_rows(group_by=("category",), period=self.get_year_period(year=year))
+
     def get_positive_categories_by_year(self, year):
         """Get categories data for the given user."""
-        categories = {}
-
-        positive_categories = self.get_positive_categories()
-        year_transactions = self.get_transactions_by_year(year=year)
-
-        for category in positive_categories:
-            year_category_transactions = year_transactions.filter(category=category)
-            categories[category.name] = self.sum_transactions(year_category_transactions)
-
-        return categories
+        return self.get_categories_from_rows(
+            self.get_year_rows(year),
+            self.get_categories_by_sign()[Category.Sign.POSITIVE]
+        )
 
     def get_negative_categories_by_year(self, year):
         """Get categories data for the given user."""
-        categories = {}
+        return self.get_categories_from_rows(
+            self.get_year_rows(year),
+            self.get_categories_by_sign()[Category.Sign.NEGATIVE]
+        )
 
-        negative_categories = self.get_negative_categories()
-        year_transactions = self.get_transactions_by_year(year=year)
-
-        for category in negative_categories:
-            year_category_transactions = year_transactions.filter(category=category)
-            categories[category.name] = self.sum_transactions(year_category_transactions)
-
-        return categories
-    
     def get_neutral_categories_by_year(self, year):
         """Get categories data for the given user."""
-        categories = {}
-
-        neutral_categories = self.get_neutral_categories()
-        year_transactions = self.get_transactions_by_year(year=year)
-
-        for category in neutral_categories:
-            year_category_transactions = year_transactions.filter(category=category)
-            categories[category.name] = self.sum_transactions(year_category_transactions)
-        
-        return categories
+        return self.get_categories_from_rows(
+            self.get_year_rows(year),
+            self.get_categories_by_sign()[Category.Sign.NEUTRAL]
+        )
 
     def get_balance_by_year(self, year):
         """Get balance for the given user."""
-        year_transactions = self.get_transactions_by_year(year=year)
+        return self.get_balance_from_rows(self.get_rows(period=self.get_year_period(year=year)))
 
-        return self.get_balance_for_queryset(year_transactions)
+    def get_history_rows(self):
+        """Get all transaction sums grouped by year and category, in a single query."""
+        return self.get_rows(group_by=("year", "category"))
 
-    def get_historical_data_by_year(self):
+    def get_historical_data_by_year(self, history_rows=None, categories_by_sign=None):
         """Get historical data by year for the given user."""
+        if history_rows is None:
+            history_rows = self.get_history_rows()
+        if categories_by_sign is None:
+            categories_by_sign = self.get_categories_by_sign()
 
-        yearly_data = {}
-
-        years = self.transactions.dates("date", "year").distinct()
+        rows_by_year = {}
+        for row in sorted(history_rows, key=lambda row: row["year"]):
+            rows_by_year.setdefault(row["year"].year, []).append(row)
 
-        for year_date in years:
-            year = year_date.year
-            data = {
-                "positive_categories": self.get_positive_categories_by_year(year),
-                "negative_categories": self.get_negative_categories_by_year(year),
-                "neutral_categories": self.get_neutral_categories_by_year(year),
-                "balance": self.get_balance_by_year(year)
-            }
-            yearly_data[str(year)] = data
+        yearly_data = {}
+        for year, year_rows in rows_by_year.items():
+            yearly_data[str(year)] = self.get_report_data_from_rows(year_rows, categories_by_sign)
 
         return yearly_data
 
-    def get_historical_summary(self):
+    def get_historical_summary(self, history_rows=None, categories_by_sign=None):
         """Get yearly summary for the given user."""
+        if history_rows is None:
+            history_rows = self.get_history_rows()
 
-        historical_summary = {
-            "positive_categories": {},
-            "negative_categories": {},
-            "neutral_categories": {},
-            "balance": {}
-        }
-
-        positive_categories = self.get_positive_categories()
-        negative_categories = self.get_negative_categories()
-        neutral_categories = self.get_neutral_categories()
-
-        for category in positive_categories:
-            year_category_transactions = self.transactions.filter(category=category)
-            historical_summary["positive_categories"][category.name] = self.sum_transactions(year_category_transactions)
-
-        for category in negative_categories:
-            year_category_transactions = self.transactions.filter(category=category)
-            historical_summary["negative_categories"][category.name] = self.sum_transactions(year_category_transactions)
-
-        for category in neutral_categories:
-            year_category_transactions = self.transactions.filter(category=category)
-            historical_summary["neutral_categories"][category.name] = self.sum_transactions(year_category_transactions)
-
-        historical_summary["balance"] = self.get_balance_for_queryset(self.transactions)
+        return self.get_report_data_from_rows(history_rows, categories_by_sign)
 
-        return historical_summary
+    def get_summary(self, history_rows=None, categories_by_sign=None):
+        """Get summary of all time for the given user. The whole report is derived from a single scan of the history."""
+        if history_rows is None:
+            history_rows = self.get_history_rows()
+        if categories_by_sign is None:
+            categories_by_sign = self.get_categories_by_sign()
 
-    def get_summary(self):
-        """Get summary of all time for the given user."""
         return {
-            "yearly": self.get_historical_data_by_year(),
-            "summary": self.get_historical_summary(),
+            "yearly": self.get_historical_data_by_year(history_rows, categories_by_sign),
+            "summary": self.get_historical_summary(history_rows, categories_by_sign),
         }
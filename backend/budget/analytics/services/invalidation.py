@@ -0,0 +1,100 @@
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from analytics.services.cache_utils import invalidate_user_analytics_cache
+
+_state = threading.local()
+
+
+class InvalidationCollector:
+    """Collect the users whose cached reports must be invalidated, and invalidate them once each when flushed."""
+
+    def __init__(self):
+        self.users = {}
+        self.flushed = False
+
+    def add(self, user):
+        """Record a user whose cached reports are out of date."""
+        self.users.setdefault(user.pk, user)
+
+    def update(self, other):
+        """Record every user of another collector."""
+        for user in other.users.values():
+            self.add(user)
+
+    def flush(self):
+        """Invalidate the cached reports of every recorded user, once per user, however many times it is called."""
+        self.flushed = True
+        users, self.users = self.users, {}
+        for user in users.values():
+            invalidate_user_analytics_cache(user)
+
+
+def get_active_collectors():
+    """Get the stack of collectors opened with `collect_invalidations` in this thread."""
+    if not hasattr(_state, "collectors"):
+        _state.collectors = []
+    return _state.collectors
+
+
+def get_pending_collector():
+    """Get the collector whose flush waits for the commit of a database transaction, if any."""
+    collector = getattr(_state, "pending", None)
+    if collector is None or collector.flushed:
+        return None
+    if not transaction.get_connection().in_atomic_block:
+        # Left over by a rolled back transaction (a committed one flushes it, or is about to)
+        _state.pending = None
+        return None
+    return collector
+
+
+def schedule_invalidation(user):
+    """
+    Invalidate the cached reports of a user once the current database transaction commits (right away outside one).
+    Invalidations scheduled in the same transaction, or inside `collect_invalidations`, are flushed once per user,
+    and the ones of a transaction rolled back are never run on their own.
+    """
+    collectors = get_active_collectors()
+    if collectors:
+        collectors[-1].add(user)
+        return
+
+    if not transaction.get_connection().in_atomic_block:
+        invalidate_user_analytics_cache(user)
+        return
+
+    collector = get_pending_collector()
+    if collector is None:
+        collector = _state.pending = InvalidationCollector()
+    collector.add(user)
+    # Queued on every call, since the flush queued by an earlier call is dropped if its savepoint is rolled back.
+    # The users left over by a rolled back transaction are then invalidated with the next one, which is harmless.
+    transaction.on_commit(collector.flush)
+
+
+def is_invalidation_pending(user):
+    """Check if the cached reports of a user are already due to be invalidated, making any patch of them useless."""
+    collectors = [*get_active_collectors(), get_pending_collector()]
+    return any(collector is not None and user.pk in collector.users for collector in collectors)
+
+
+@contextmanager
+def collect_invalidations():
+    """
+    Collect every invalidation scheduled inside the block (management commands, bulk writes, tasks),
+    and flush them once per user when it ends, after the commit of the surrounding transaction if there is one.
+    """
+    collectors = get_active_collectors()
+    collector = InvalidationCollector()
+    collectors.append(collector)
+    try:
+        yield collector
+    finally:
+        collectors.pop()
+        if collectors:
+            collectors[-1].update(collector)
+        elif collector.users:
+            transaction.on_commit(collector.flush)
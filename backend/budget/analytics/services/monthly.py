@@ -1,3 +1,5 @@
+from transactions.models import Category
+
 from .base import AnalyticsBaseService
 
 
@@ -11,72 +13,43 @@ class AnalyticsMonthlyService(AnalyticsBaseService):
         self.month = month
         super().__init__(user)
 
+    def get_month_rows(self):
+        """Get the month's transaction sums grouped by category, in a single query."""
+        return self.get_rows(group_by=("category",), period=self.get_month_period(month=self.month, year=self.year))
+
     def get_positive_categories_data(self):
         """Get positive categories data for specific month for the given user."""
-        categories = {}
-
-        positive_categories = self.get_positive_categories()
-        month_transactions = self.get_transactions_by_month(
-            year=self.year,
-            month=self.month
+        return self.get_categories_from_rows(
+            self.get_month_rows(),
+            self.get_categories_by_sign()[Category.Sign.POSITIVE]
         )
 
-        for category in positive_categories:
-            month_category_transactions = month_transactions.filter(category=category)
-            categories[category.name] = self.sum_transactions(month_category_transactions)
-
-        return categories
-
     def get_negative_categories_data(self):
         """Get negative categories data for specific month for the given user."""
-        categories = {}
-
-        negative_categories = self.get_negative_categories()
-        month_transactions = self.get_transactions_by_month(
-            year=self.year,
-            month=self.month
+        return self.get_categories_from_rows(
+            self.get_month_rows(),
+            self.get_categories_by_sign()[Category.Sign.NEGATIVE]
         )
 
-        for category in negative_categories:
-            month_category_transactions = month_transactions.filter(category=category)
-            categories[category.name] = self.sum_transactions(month_category_transactions)
-
-        return categories
-
     def get_neutral_categories_data(self):
         """Get neutral categories data for specific month for the given user."""
-        categories = {}
-
-        neutral_categories = self.get_neutral_categories()
-        month_transactions = self.get_transactions_by_month(
-            year=self.year,
-            month=self.month
+        return self.get_categories_from_rows(
+            self.get_month_rows(),
+            self.get_categories_by_sign()[Category.Sign.NEUTRAL]
         )
 
-        for category in neutral_categories:
-            month_category_transactions = month_transactions.filter(category=category)
-            categories[category.name] = self.sum_transactions(month_category_transactions)
-        
-        return categories
-
     def get_balance(self):
         """Get balance for specific month for the given user."""
-        month_transactions = self.get_transactions_by_month(
-                year=self.year,
-                month=self.month
-            )
-
-        return self.get_balance_for_queryset(month_transactions)
+        return self.get_balance_from_rows(self.get_rows(period=self.get_month_period(month=self.month, year=self.year)))
 
-    def get_summary(self):
+    def get_summary(self, month_rows=None, categories_by_sign=None):
         """Get complete summary of monthly report for the given user."""
-        return {
-            "positive_categories": self.get_positive_categories_data(),
-            "negative_categories": self.get_negative_categories_data(),
-            "neutral_categories": self.get_neutral_categories_data(),
-            "balance": self.get_balance(),
-            "period": {
-                "year": self.year,
-                "month": self.month
-            },
-        }
\ No newline at end of file
+        if month_rows is None:
+            month_rows = self.get_month_rows()
+
+        summary = self.get_report_data_from_rows(month_rows, categories_by_sign)
+        summary["period"] = {
+            "year": self.year,
+            "month": self.month
+        }
+        return summary
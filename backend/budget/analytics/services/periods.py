@@ -0,0 +1,80 @@
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Period:
+    """
+    Half-open range of time [start, end) used to filter transactions and rollups.
+    Filters compile to `date >= start AND date < end`, which can use the (user, date) index,
+    unlike `date__month` lookups that are evaluated per row.
+    """
+
+    def __init__(self, start, end, tz=None):
+        self.tz = tz or timezone.get_current_timezone()
+        self.start = self.make_aware(start)
+        self.end = self.make_aware(end)
+
+    def __repr__(self):
+        return f"Period({self.start.isoformat()}, {self.end.isoformat()})"
+
+    def __eq__(self, other):
+        return isinstance(other, Period) and (self.start, self.end) == (other.start, other.end)
+
+    def __hash__(self):
+        return hash((self.start, self.end))
+
+    def make_aware(self, value):
+        """Turn a date or a naive datetime into a datetime aware of the period's timezone."""
+        if not isinstance(value, datetime):
+            value = datetime(value.year, value.month, value.day)
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value, self.tz)
+        return value
+
+    @classmethod
+    def month(cls, year, month, tz=None):
+        """Get the period of a calendar month."""
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return cls(datetime(year, month, 1), datetime(next_year, next_month, 1), tz=tz)
+
+    @classmethod
+    def year(cls, year, tz=None):
+        """Get the period of a calendar year."""
+        return cls(datetime(year, 1, 1), datetime(year + 1, 1, 1), tz=tz)
+
+    @classmethod
+    def range(cls, start, end, tz=None):
+        """Get an arbitrary period, from start (included) to end (excluded)."""
+        return cls(start, end, tz=tz)
+
+    def filter(self, queryset, field="date"):
+        """Filter a queryset to the rows whose datetime field falls inside the period."""
+        return queryset.filter(**{f"{field}__gte": self.start, f"{field}__lt": self.end})
+
+    def is_month_aligned(self):
+        """
+        Check if the period starts and ends on month boundaries of the default timezone,
+        the one monthly rollups are bucketed in.
+        """
+        default_tz = timezone.get_default_timezone()
+        return all(
+            (local.day, local.hour, local.minute, local.second, local.microsecond) == (1, 0, 0, 0, 0)
+            for local in (timezone.localtime(self.start, default_tz), timezone.localtime(self.end, default_tz))
+        )
+
+    def filter_rollups(self, queryset):
+        """Filter a queryset of monthly rollups to the months covered by a month aligned period."""
+        default_tz = timezone.get_default_timezone()
+        start = timezone.localtime(self.start, default_tz)
+        end = timezone.localtime(self.end, default_tz)
+        last_year, last_month = (end.year - 1, 12) if end.month == 1 else (end.year, end.month - 1)
+
+        if start.year == last_year:
+            return queryset.filter(year=start.year, month__gte=start.month, month__lte=last_month)
+
+        return queryset.filter(
+            Q(year__gt=start.year) | Q(year=start.year, month__gte=start.month),
+            Q(year__lt=last_year) | Q(year=last_year, month__lte=last_month),
+        )
@@ -0,0 +1,176 @@
+from decimal import Decimal
+
+from django.db import IntegrityError
+from django.db import transaction as db_transaction
+from django.db.models import F
+from django.db.models import Sum
+from django.db.models import Count
+from django.db.models.functions import ExtractMonth
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
+
+from analytics.models import MonthlyRollup
+from transactions.models import Category
+from transactions.models import Transaction
+
+# Fields identifying a rollup row, as the keys of `get_rollup_entry`
+ROLLUP_KEY = ("user_id", "year", "month", "category_id", "location_id", "bucket_id", "sign")
+
+
+def get_rollup_entry(transaction):
+    """Get the rollup key a transaction belongs to and the amount it contributes."""
+    # Rollups are bucketed by month in the default timezone, whatever timezone is active
+    date = transaction.date
+    if timezone.is_aware(date):
+        date = timezone.localtime(date, timezone.get_default_timezone())
+    category = transaction.category
+    sign = category.sign if category else None
+
+    # A split income keeps its row but its amount is moved to the children by `Transaction._split_income`.
+    is_split_parent = transaction.split_income and sign == Category.Sign.POSITIVE
+    amount = Decimal("0") if is_split_parent else Decimal(str(transaction.amount))
+
+    key = {
+        "user_id": transaction.user_id,
+        "year": date.year,
+        "month": date.month,
+        "category_id": transaction.category_id,
+        "location_id": transaction.location_id,
+        "bucket_id": transaction.bucket_id,
+        "sign": sign,
+    }
+    return key, amount
+
+
+def upsert_rollup(key, amount, count):
+    """
+    Add an amount and a number of transactions to the rollup row of a key, creating it if needed
+    and deleting it once it holds no transactions.
+    The row is written with an update first, and created only when there is none: the unique constraint
+    on the rollup key makes the insert of a concurrent first write fail, which then updates the row created meanwhile.
+    """
+    rollups = MonthlyRollup.objects.filter(**key)
+    changes = {"amount": F("amount") + amount, "count": F("count") + count}
+
+    with db_transaction.atomic():
+        if not rollups.update(**changes):
+            if count <= 0:
+                return
+            try:
+                with db_transaction.atomic():
+                    MonthlyRollup.objects.create(amount=amount, count=count, **key)
+                return
+            except IntegrityError:
+                rollups.update(**changes)
+        if count < 0:
+            rollups.filter(count__lte=0, amount=0).delete()
+
+
+def add_to_rollup(key, amount):
+    """Add one transaction amount to its rollup row, creating the row if needed."""
+    upsert_rollup(key, amount, 1)
+
+
+def remove_from_rollup(key, amount):
+    """Remove one transaction amount from its rollup row, deleting the row once it holds no transactions."""
+    upsert_rollup(key, -amount, -1)
+
+
+def update_rollup(previous_entry, current_entry):
+    """Move a transaction from its previous rollup entry to the current one (either may be None)."""
+    if previous_entry == current_entry:
+        return
+
+    with db_transaction.atomic():
+        if previous_entry is not None:
+            remove_from_rollup(*previous_entry)
+        if current_entry is not None:
+            add_to_rollup(*current_entry)
+
+
+def apply_rollup_deltas(deltas):
+    """
+    Apply amount and count deltas (keyed by the items of a rollup key) to the rollup, one row at a time.
+    Rows are written in a fixed order, so concurrent writers lock them in the same order.
+    """
+    with db_transaction.atomic():
+        for key, (amount, count) in sorted(deltas.items(), key=lambda item: str(item[0])):
+            if amount or count:
+                upsert_rollup(dict(key), amount, count)
+
+
+def apply_rollup_changes(removed_entries, added_entries):
+    """
+    Remove and add many rollup entries at once. The changes are netted per rollup row,
+    so each row is read and written once whatever the number of transactions it holds.
+    """
+    deltas = {}
+    for entries, direction in ((removed_entries, -1), (added_entries, 1)):
+        for key, amount in entries:
+            delta = deltas.setdefault(tuple(key.items()), [Decimal("0"), 0])
+            delta[0] += amount * direction
+            delta[1] += direction
+
+    apply_rollup_deltas(deltas)
+
+
+def detach_rollups(field, instance):
+    """
+    Move the rollup rows of a category, location or bucket about to be hard deleted to the rows
+    its transactions end up in once their foreign key is set to NULL (without a category, without a sign either),
+    as `rebuild_rollups` would. Merging them first keeps the SET_NULL of the rollup rows clear of the unique constraint.
+    """
+    deltas = {}
+    for rollup in MonthlyRollup.objects.filter(**{field: instance}).values(*ROLLUP_KEY, "amount", "count"):
+        amount, count = rollup.pop("amount"), rollup.pop("count")
+        detached = {**rollup, f"{field}_id": None}
+        if field == "category":
+            detached["sign"] = None
+        for key, direction in ((rollup, -1), (detached, 1)):
+            delta = deltas.setdefault(tuple(key.items()), [Decimal("0"), 0])
+            delta[0] += amount * direction
+            delta[1] += count * direction
+
+    apply_rollup_deltas(deltas)
+
+
+def rebuild_rollups(users=None):
+    """Rebuild the rollup table from raw transactions, for the given users or for everyone."""
+    transactions = Transaction.objects.all()
+    rollups = MonthlyRollup.objects.all()
+    if users is not None:
+        transactions = transactions.filter(user__in=users)
+        rollups = rollups.filter(user__in=users)
+
+    rows = transactions.order_by().values(
+        "user",
+        "category",
+        "location",
+        "bucket",
+        year=ExtractYear("date", tzinfo=timezone.get_default_timezone()),
+        month=ExtractMonth("date", tzinfo=timezone.get_default_timezone()),
+        sign=F("category__sign"),
+    ).annotate(
+        total=Sum("amount"),
+        transactions_count=Count("pk"),
+    )
+
+    with db_transaction.atomic():
+        new_rollups = [
+            MonthlyRollup(
+                user_id=row["user"],
+                year=row["year"],
+                month=row["month"],
+                category_id=row["category"],
+                location_id=row["location"],
+                bucket_id=row["bucket"],
+                sign=row["sign"],
+                amount=row["total"],
+                count=row["transactions_count"],
+            )
+            for row in rows.iterator()
+        ]
+        rollups.delete()
+        MonthlyRollup.objects.bulk_create(new_rollups, batch_size=1000)
+
+    return len(new_rollups)
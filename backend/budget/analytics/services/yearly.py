@@ -1,3 +1,5 @@
+from transactions.models import Category
+
 from .base import AnalyticsBaseService
 
 
@@ -10,102 +12,72 @@ class AnalyticsYearlyService(AnalyticsBaseService):
         self.year = year
         super().__init__(user)
 
+    def get_month_rows(self, month):
+        """Get the month's transaction sums grouped by category, in a single query."""
+        return self.get_rows(group_by=("category",), period=self.get_month_period(month=month, year=self.year))
+
     def get_positive_categories_by_month(self, month):
         """Get categories data for the given user."""
-        categories = {}
-
-        positive_categories = self.get_positive_categories()
-        month_transactions = self.get_transactions_by_month(month=month, year=self.year)
-
-        for category in positive_categories:
-            month_category_transactions = month_transactions.filter(category=category)
-            categories[category.name] = self.sum_transactions(month_category_transactions)
-
-        return categories
+        return self.get_categories_from_rows(
+            self.get_month_rows(month),
+            self.get_categories_by_sign()[Category.Sign.POSITIVE]
+        )
 
     def get_negative_categories_by_month(self, month):
         """Get categories data for the given user."""
-        categories = {}
-
-        negative_categories = self.get_negative_categories()
-        month_transactions = self.get_transactions_by_month(month=month, year=self.year)
-
-        for category in negative_categories:
-            month_category_transactions = month_transactions.filter(category=category)
-            categories[category.name] = self.sum_transactions(month_category_transactions)
-
-        return categories
+        return self.get_categories_from_rows(
+            self.get_month_rows(month),
+            self.get_categories_by_sign()[Category.Sign.NEGATIVE]
+        )
 
     def get_neutral_categories_by_month(self, month):
         """Get categories data for the given user."""
-        categories = {}
-
-        neutral_categories = self.get_neutral_categories()
-        month_transactions = self.get_transactions_by_month(month=month, year=self.year)
-
-        for category in neutral_categories:
-            month_category_transactions = month_transactions.filter(category=category)
-            categories[category.name] = self.sum_transactions(month_category_transactions)
-        
-        return categories
+        return self.get_categories_from_rows(
+            self.get_month_rows(month),
+            self.get_categories_by_sign()[Category.Sign.NEUTRAL]
+        )
 
     def get_balance_by_month(self, month):
         """Get balance for the given user."""
-        month_transactions = self.get_transactions_by_month(month=month, year=self.year)
+        return self.get_balance_from_rows(self.get_rows(period=self.get_month_period(month=month, year=self.year)))
 
-        return self.get_balance_for_queryset(month_transactions)
+    def get_year_rows(self):
+        """Get the year's transaction sums grouped by month and category, in a single query."""
+        return self.get_rows(group_by=("month", "category"), period=self.get_year_period(year=self.year))
 
-    def get_year_data_by_month(self):
+    def get_year_data_by_month(self, year_rows=None, categories_by_sign=None):
         """Get year data by month for the given user."""
+        if year_rows is None:
+            year_rows = self.get_year_rows()
+        if categories_by_sign is None:
+            categories_by_sign = self.get_categories_by_sign()
 
-        monthly_data = {}
+        rows_by_month = {month: [] for month in range(1, 13)}
+        for row in year_rows:
+            rows_by_month[row["month"].month].append(row)
 
-        for month in range(1, 13):
-            data = {
-                "positive_categories": self.get_positive_categories_by_month(month),
-                "negative_categories": self.get_negative_categories_by_month(month),
-                "neutral_categories": self.get_neutral_categories_by_month(month),
-                "balance": self.get_balance_by_month(month)
-            }
-            monthly_data[str(month)] = data
+        monthly_data = {}
+        for month, month_rows in rows_by_month.items():
+            monthly_data[str(month)] = self.get_report_data_from_rows(month_rows, categories_by_sign)
 
         return monthly_data
 
-    def get_year_summary(self):
+    def get_year_summary(self, year_rows=None, categories_by_sign=None):
         """Get yearly summary for the given user."""
+        if year_rows is None:
+            year_rows = self.get_year_rows()
 
-        year_summary = {
-            "positive_categories": {},
-            "negative_categories": {},
-            "neutral_categories": {},
-            "balance": {}
-        }
-
-        positive_categories = self.get_positive_categories()
-        negative_categories = self.get_negative_categories()
-        neutral_categories = self.get_neutral_categories()
-        year_transactions = self.get_transactions_by_year(year=self.year)
-
-        for category in positive_categories:
-            year_category_transactions = year_transactions.filter(category=category)
-            year_summary["positive_categories"][category.name] = self.sum_transactions(year_category_transactions)
+        return self.get_report_data_from_rows(year_rows, categories_by_sign)
 
-        for category in negative_categories:
-            year_category_transactions = year_transactions.filter(category=category)
-            year_summary["negative_categories"][category.name] = self.sum_transactions(year_category_transactions)
+    def get_summary(self, year_rows=None, categories_by_sign=None):
+        """Get yearly summary for the given user. The whole report is derived from a single scan of the year."""
+        if year_rows is None:
+            year_rows = self.get_year_rows()
+        if categories_by_sign is None:
+            categories_by_sign = self.get_categories_by_sign()
 
-        for category in neutral_categories:
-            year_category_transactions = year_transactions.filter(category=category)
-            year_summary["neutral_categories"][category.name] = self.sum_transactions(year_category_transactions)
-
-        year_summary["balance"] = self.get_balance_for_queryset(year_transactions)
-
-        return year_summary
-
-    def get_summary(self):
-        """Get yearly summary for the given user."""
         return {
-            "monthly": self.get_year_data_by_month(),
-            "summary": self.get_year_summary(),
+            "monthly": self.get_year_data_by_month(year_rows, categories_by_sign),
+            "summary": self.get_year_summary(year_rows, categories_by_sign),
             "period": self.year,
-        }
\ No newline at end of file
+        }
@@ -1,3 +1,5 @@
+from django.db.models.signals import pre_delete
+from django.db.models.signals import pre_save
 from django.db.models.signals import post_save
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
@@ -6,44 +8,106 @@ from core.models import Location
 from core.models import Bucket
 from transactions.models import Category
 from transactions.models import Transaction
-from analytics.services.cache_utils import invalidate_user_analytics_cache
+from transactions.signals import incomes_split
+from analytics.models import MonthlyRollup
+from analytics.services.cache_delta import get_report_entry
+from analytics.services.cache_delta import schedule_transaction_delta
+from analytics.services.invalidation import schedule_invalidation
+from analytics.services.rollup import apply_rollup_changes
+from analytics.services.rollup import detach_rollups
+from analytics.services.rollup import get_rollup_entry
+from analytics.services.rollup import update_rollup
+
+@receiver(pre_save, sender=Transaction)
+def remember_previous_transaction(sender, instance, **kwargs):
+    """Remember the stored version of a transaction, so the rollup and the cached reports can be moved from it."""
+    instance._previous_transaction = None
+    if not instance._state.adding:
+        instance._previous_transaction = Transaction.objects.select_related(
+            "category", "location", "bucket"
+        ).filter(pk=instance.pk).first()
+
+@receiver(post_save, sender=Transaction)
+def update_rollup_on_transaction_save(sender, instance, **kwargs):
+    """Move a saved transaction from its previous rollup entry to the current one."""
+    previous = getattr(instance, "_previous_transaction", None)
+    previous_entry = get_rollup_entry(previous) if previous is not None else None
+    update_rollup(previous_entry, get_rollup_entry(instance))
+
+@receiver(post_delete, sender=Transaction)
+def update_rollup_on_transaction_delete(sender, instance, **kwargs):
+    """Remove a deleted transaction from the rollup."""
+    update_rollup(get_rollup_entry(instance), None)
+
+@receiver(post_save, sender=Category)
+def update_rollup_on_category_save(sender, instance, **kwargs):
+    """Keep the sign stored in the rollup in sync with the category."""
+    MonthlyRollup.objects.filter(category=instance).exclude(sign=instance.sign).update(sign=instance.sign)
+
+@receiver(pre_delete, sender=Category)
+def detach_rollups_on_category_delete(sender, instance, **kwargs):
+    """Move the rollup of a hard deleted category to its transactions left without one."""
+    detach_rollups("category", instance)
+
+@receiver(pre_delete, sender=Location)
+def detach_rollups_on_location_delete(sender, instance, **kwargs):
+    """Move the rollup of a hard deleted location to its transactions left without one."""
+    detach_rollups("location", instance)
+
+@receiver(pre_delete, sender=Bucket)
+def detach_rollups_on_bucket_delete(sender, instance, **kwargs):
+    """Move the rollup of a hard deleted bucket to its transactions left without one."""
+    detach_rollups("bucket", instance)
 
 @receiver(post_save, sender=Location)
 def invalidate_cache_on_location_save(sender, instance, **kwargs):
     """Invalidate cache when a location is saved."""
-    invalidate_user_analytics_cache(instance.user)
+    schedule_invalidation(instance.user)
 
 @receiver(post_delete, sender=Location)
 def invalidate_cache_on_location_delete(sender, instance, **kwargs):
     """Invalidate cache when a location is deleted."""
-    invalidate_user_analytics_cache(instance.user)
+    schedule_invalidation(instance.user)
 
 @receiver(post_save, sender=Bucket)
 def invalidate_cache_on_bucket_save(sender, instance, **kwargs):
     """Invalidate cache when a bucket is saved."""
-    invalidate_user_analytics_cache(instance.user)
+    schedule_invalidation(instance.user)
 
 @receiver(post_delete, sender=Bucket)
 def invalidate_cache_on_bucket_delete(sender, instance, **kwargs):
     """Invalidate cache when a bucket is deleted."""
-    invalidate_user_analytics_cache(instance.user)
+    schedule_invalidation(instance.user)
 
 @receiver(post_save, sender=Category)
 def invalidate_cache_on_category_save(sender, instance, **kwargs):
     """Invalidate cache when a category is saved."""
-    invalidate_user_analytics_cache(instance.user)
+    schedule_invalidation(instance.user)
 
 @receiver(post_delete, sender=Category)
 def invalidate_cache_on_category_delete(sender, instance, **kwargs):
     """Invalidate cache when a category is deleted."""
-    invalidate_user_analytics_cache(instance.user)
+    schedule_invalidation(instance.user)
 
 @receiver(post_save, sender=Transaction)
-def invalidate_cache_on_transaction_save(sender, instance, **kwargs):
-    """Invalidate cache when a transaction is saved."""
-    invalidate_user_analytics_cache(instance.user)
+def update_cache_on_transaction_save(sender, instance, **kwargs):
+    """Patch the cached reports affected by a saved transaction on commit, or invalidate cache if they cannot be patched."""
+    previous = getattr(instance, "_previous_transaction", None)
+    previous_entry = get_report_entry(previous) if previous is not None else None
+    schedule_transaction_delta(instance.user, previous_entry, get_report_entry(instance))
 
 @receiver(post_delete, sender=Transaction)
-def invalidate_cache_on_transaction_delete(sender, instance, **kwargs):
-    """Invalidate cache when a transaction is deleted."""
-    invalidate_user_analytics_cache(instance.user)
+def update_cache_on_transaction_delete(sender, instance, **kwargs):
+    """Patch the cached reports affected by a deleted transaction on commit, or invalidate cache if they cannot be patched."""
+    schedule_transaction_delta(instance.user, get_report_entry(instance), None)
+
+@receiver(incomes_split, sender=Transaction)
+def update_analytics_on_incomes_split(sender, removed, added, **kwargs):
+    """Apply the split transactions written in bulk to the rollup, then schedule the invalidation of the cache of their users."""
+    apply_rollup_changes(
+        [get_rollup_entry(transaction) for transaction in removed],
+        [get_rollup_entry(transaction) for transaction in added],
+    )
+    transactions_by_user = {transaction.user_id: transaction for transaction in [*removed, *added]}
+    for transaction in transactions_by_user.values():
+        schedule_invalidation(transaction.user)
@@ -0,0 +1,34 @@
+from decimal import Decimal
+
+from analytics.serializers.cents import CentsField
+from analytics.serializers.cents import CentsRepresentationSerializer
+
+
+def test_cents_representation_serializer():
+    """Test CentsRepresentationSerializer turns the integer cents of nested blocks into exact decimals."""
+    data = {
+        "1": {"balance": {"_total": -1234, "positive": 10, "negative": 1244, "neutral": 0}},
+        "Large": 10 ** 20 + 1,
+        "flag": True,
+        "generated_at": "2025-01-01T00:00:00+00:00",
+    }
+
+    representation = CentsRepresentationSerializer(data).data
+
+    assert representation["1"]["balance"] == {
+        "_total": Decimal("-12.34"),
+        "positive": Decimal("0.10"),
+        "negative": Decimal("12.44"),
+        "neutral": Decimal("0.00"),
+    }
+    assert representation["Large"] == Decimal("1000000000000000000.01")
+    assert representation["flag"] is True
+    assert representation["generated_at"] == "2025-01-01T00:00:00+00:00"
+
+
+def test_cents_field():
+    """Test CentsField renders cents as decimals and reads decimals as cents."""
+    field = CentsField()
+
+    assert field.to_representation(30) == Decimal("0.30")
+    assert field.to_internal_value("0.30") == 30
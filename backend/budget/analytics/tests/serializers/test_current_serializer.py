@@ -30,7 +30,18 @@ def test_balance_serializer():
     serializer = BalanceSerializer(data=data)
 
     assert serializer.is_valid(), serializer.errors
-    assert serializer.validated_data == data
+    assert serializer.validated_data == {
+        "_total": 80000,
+        "positive": 100000,
+        "negative": 20000,
+        "neutral": 0,
+    }
+    assert BalanceSerializer(serializer.validated_data).data == {
+        "_total": decimal.Decimal("800.00"),
+        "positive": decimal.Decimal("1000.00"),
+        "negative": decimal.Decimal("200.00"),
+        "neutral": decimal.Decimal("0.00"),
+    }
 
 
 @pytest.mark.django_db
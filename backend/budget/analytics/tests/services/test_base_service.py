@@ -6,6 +6,7 @@ from datetime import datetime
 from accounts.models import User
 from transactions.models import Transaction
 from analytics.services.base import AnalyticsBaseService
+from analytics.services.cents import to_cents
 
 
 @pytest.mark.django_db
@@ -83,7 +84,7 @@ def test_sum_transactions(
     baker.make_recipe(transaction_recipe, _quantity=5, user=user)
     transactions = Transaction.objects.all()
     service = AnalyticsBaseService.sum_transactions(transactions)
-    assert service == sum([transaction.amount for transaction in transactions])
+    assert service == sum([to_cents(transaction.amount) for transaction in transactions])
 
 
 @pytest.mark.django_db
@@ -102,9 +103,9 @@ def test_get_balance_for_queryset(
 
     service = AnalyticsBaseService(user).get_balance_for_queryset(transactions)
     assert service == {
-        "_total": 50,
-        "positive": 100,
-        "negative": 50,
+        "_total": 5000,
+        "positive": 10000,
+        "negative": 5000,
         "neutral": 0,
     }
 
@@ -145,3 +146,99 @@ def test_get_transactions_by_year(
     assert service_2024.count() == 3
     assert service_2025.count() == 2
     assert service_2026.count() == 0
+
+
+@pytest.mark.django_db
+def test_aggregate_transactions(
+    user: User,
+    positive_category_recipe: str,
+    negative_category_recipe: str,
+    positive_transaction_recipe: str,
+    negative_transaction_recipe: str,
+    neutral_transaction_recipe: str,
+):
+    """Test aggregate_transactions function to ensure it works properly."""
+    positive_category = baker.make_recipe(positive_category_recipe, user=user)
+    negative_category = baker.make_recipe(negative_category_recipe, user=user)
+    baker.make_recipe(positive_transaction_recipe, user=user, category=positive_category, amount=100, _quantity=2)
+    baker.make_recipe(negative_transaction_recipe, user=user, category=negative_category, amount=30)
+    baker.make_recipe(neutral_transaction_recipe, user=user, amount=10)
+
+    service = AnalyticsBaseService(user)
+
+    rows = service.aggregate_transactions(service.transactions)
+    assert len(rows) == 1
+    assert rows[0]["total"] == 24000
+    assert rows[0]["positive"] == 20000
+    assert rows[0]["negative"] == 3000
+    assert rows[0]["neutral"] == 1000
+
+    rows = service.aggregate_transactions(service.transactions, group_by=("sign", "category"))
+    by_category = {row["category"]: row for row in rows}
+    assert len(rows) == 3
+    assert by_category[positive_category.id]["sign"] == "POSITIVE"
+    assert by_category[positive_category.id]["total"] == 20000
+    assert by_category[positive_category.id]["negative"] == 0
+    assert by_category[negative_category.id]["sign"] == "NEGATIVE"
+    assert by_category[negative_category.id]["negative"] == 3000
+
+
+@pytest.mark.django_db
+def test_aggregate_transactions_by_month(
+    user: User,
+    transaction_recipe: str,
+):
+    """Test aggregate_transactions function groups by month in a single query."""
+    baker.make_recipe(transaction_recipe, date=make_aware(datetime(2025, 1, 5)), amount=10, _quantity=3, user=user)
+    baker.make_recipe(transaction_recipe, date=make_aware(datetime(2025, 2, 5)), amount=10, user=user)
+    service = AnalyticsBaseService(user)
+
+    rows = service.aggregate_transactions(service.transactions, group_by=("month",))
+
+    totals = {row["month"].month: row["total"] for row in rows}
+    assert totals == {1: 3000, 2: 1000}
+
+
+@pytest.mark.django_db
+def test_get_report_data_from_rows(
+    user: User,
+    positive_category_recipe: str,
+    positive_transaction_recipe: str,
+    negative_transaction_recipe: str,
+):
+    """Test get_report_data_from_rows function to ensure it works properly."""
+    positive_category1 = baker.make_recipe(positive_category_recipe, user=user, name="Positive Category 1")
+    baker.make_recipe(positive_category_recipe, user=user, name="Positive Category 2")
+    baker.make_recipe(positive_transaction_recipe, user=user, category=positive_category1, amount=100)
+    baker.make_recipe(negative_transaction_recipe, user=user, amount=40)
+    service = AnalyticsBaseService(user)
+
+    rows = service.aggregate_transactions(service.transactions, group_by=("category",))
+    data = service.get_report_data_from_rows(rows)
+
+    assert data["positive_categories"] == {"Positive Category 1": 10000, "Positive Category 2": 0}
+    assert data["balance"] == {"_total": 6000, "positive": 10000, "negative": 4000, "neutral": 0}
+
+
+@pytest.mark.django_db
+def test_get_rows_rollup_matches_transactions(
+    user: User,
+    positive_transaction_recipe: str,
+    negative_transaction_recipe: str,
+    settings,
+):
+    """Test get_rows returns the same sums from the rollup as from the raw transactions."""
+    baker.make_recipe(positive_transaction_recipe, user=user, date=make_aware(datetime(2025, 1, 1)), _quantity=3)
+    baker.make_recipe(negative_transaction_recipe, user=user, date=make_aware(datetime(2025, 2, 1)), _quantity=3)
+    service = AnalyticsBaseService(user)
+
+    def get_totals(rows):
+        return {(row["month"].month, row["category"]): (row["total"], row["positive"], row["negative"]) for row in rows}
+
+    settings.ANALYTICS_USE_ROLLUP = True
+    rollup_rows = service.get_rows(group_by=("month", "category"), period=service.get_year_period(year=2025))
+    settings.ANALYTICS_USE_ROLLUP = False
+    transaction_rows = service.get_rows(group_by=("month", "category"), period=service.get_year_period(year=2025))
+
+    assert len(rollup_rows) == len(transaction_rows) == 2
+    assert get_totals(rollup_rows) == get_totals(transaction_rows)
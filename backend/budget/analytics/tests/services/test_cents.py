@@ -0,0 +1,64 @@
+import pytest
+from decimal import Decimal
+from model_bakery import baker
+
+from accounts.models import User
+from analytics.services.base import AnalyticsBaseService
+from analytics.services.cents import from_cents
+from analytics.services.cents import to_cents
+
+
+def test_to_cents():
+    """Test to_cents turns decimal amounts (and the floats or strings they may come as) into exact integer cents."""
+    assert to_cents(Decimal("0.10")) == 10
+    assert to_cents(Decimal("-12.34")) == -1234
+    assert to_cents(Decimal("99999999.99")) == 9999999999
+    assert to_cents(0.1 + 0.2) == 30
+    assert to_cents("7") == 700
+    assert isinstance(to_cents(Decimal("1.00")), int)
+
+
+def test_from_cents():
+    """Test from_cents gives back the exact amount, with two decimal places."""
+    assert from_cents(10) == Decimal("0.10")
+    assert str(from_cents(-1234)) == "-12.34"
+    assert str(from_cents(0)) == "0.00"
+    assert from_cents(10 ** 20 + 1) == Decimal("1000000000000000000.01")
+    assert from_cents(to_cents(Decimal("99999999.99"))) == Decimal("99999999.99")
+
+
+@pytest.mark.django_db
+def test_sums_are_exact_cents(
+    user: User,
+    positive_transaction_recipe: str,
+    negative_transaction_recipe: str,
+):
+    """Test the sums of amounts that have no exact binary representation come out as exact cents."""
+    baker.make_recipe(positive_transaction_recipe, user=user, amount=Decimal("0.10"), _quantity=10)
+    baker.make_recipe(positive_transaction_recipe, user=user, amount=Decimal("0.20"), _quantity=10)
+    baker.make_recipe(negative_transaction_recipe, user=user, amount=Decimal("0.30"), _quantity=10)
+    service = AnalyticsBaseService(user)
+
+    assert service.sum_transactions(service.transactions) == 600
+    assert service.get_balance_for_queryset(service.transactions) == {
+        "_total": 0,
+        "positive": 300,
+        "negative": 300,
+        "neutral": 0,
+    }
+
+
+@pytest.mark.django_db
+def test_large_sums_are_exact_cents(
+    user: User,
+    positive_transaction_recipe: str,
+):
+    """Test sums beyond the amount a single transaction can hold stay exact, whether read from rollups or not."""
+    baker.make_recipe(positive_transaction_recipe, user=user, amount=Decimal("99999999.99"), _quantity=3)
+    baker.make_recipe(positive_transaction_recipe, user=user, amount=Decimal("0.01"))
+    service = AnalyticsBaseService(user)
+
+    rows = service.aggregate_transactions(service.transactions)
+    assert rows[0]["positive"] == 29999999998
+    assert isinstance(rows[0]["positive"], int)
+    assert service.get_rows()[0]["positive"] == 29999999998
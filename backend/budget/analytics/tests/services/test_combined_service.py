@@ -0,0 +1,77 @@
+import pytest
+from model_bakery import baker
+from django.utils.timezone import make_aware
+from datetime import datetime
+
+from accounts.models import User
+from analytics.services.combined import AnalyticsCombinedService
+from analytics.services.current import AnalyticsCurrentService
+from analytics.services.monthly import AnalyticsMonthlyService
+from analytics.services.yearly import AnalyticsYearlyService
+from analytics.services.historical import AnalyticsHistoricalService
+
+
+@pytest.fixture
+def transactions(
+    user: User,
+    location_recipe: str,
+    bucket_recipe: str,
+    positive_category_recipe: str,
+    negative_category_recipe: str,
+    positive_transaction_recipe: str,
+    negative_transaction_recipe: str,
+):
+    """Fixture for creating transactions spread over several months, years, locations and buckets."""
+    locations = baker.make_recipe(location_recipe, user=user, _quantity=2)
+    buckets = baker.make_recipe(bucket_recipe, user=user, allocation_percentage=50, _quantity=2)
+    positive_category = baker.make_recipe(positive_category_recipe, user=user)
+    negative_category = baker.make_recipe(negative_category_recipe, user=user)
+
+    for index, date in enumerate([datetime(2024, 12, 15), datetime(2025, 1, 10), datetime(2025, 3, 5)]):
+        baker.make_recipe(
+            positive_transaction_recipe,
+            user=user,
+            category=positive_category,
+            location=locations[index % 2],
+            bucket=buckets[index % 2],
+            date=make_aware(date),
+            amount=100 * (index + 1),
+        )
+        baker.make_recipe(
+            negative_transaction_recipe,
+            user=user,
+            category=negative_category,
+            location=locations[(index + 1) % 2],
+            bucket=buckets[index % 2],
+            date=make_aware(date),
+            amount=30 * (index + 1),
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("use_rollup", [True, False])
+def test_get_summaries_matches_services(user: User, transactions, settings, use_rollup: bool):
+    """Test the reports derived from the shared scan are the same as the ones computed by each service."""
+    settings.ANALYTICS_USE_ROLLUP = use_rollup
+    summaries = AnalyticsCombinedService(user).get_summaries([(2025, 1), (2025, 2), 2024, (2025,)])
+
+    assert summaries == {
+        ("current",): AnalyticsCurrentService(user).get_summary(),
+        ("historical",): AnalyticsHistoricalService(user).get_summary(),
+        ("monthly", 2025, 1): AnalyticsMonthlyService(user, 2025, 1).get_summary(),
+        ("monthly", 2025, 2): AnalyticsMonthlyService(user, 2025, 2).get_summary(),
+        ("yearly", 2024): AnalyticsYearlyService(user, 2024).get_summary(),
+        ("yearly", 2025): AnalyticsYearlyService(user, 2025).get_summary(),
+    }
+
+
+@pytest.mark.django_db
+def test_get_summaries_query_count(user: User, transactions, django_assert_num_queries):
+    """Test the number of queries does not grow with the number of requested periods."""
+    service = AnalyticsCombinedService(user)
+
+    # rows, categories, locations and buckets
+    with django_assert_num_queries(4):
+        service.get_summaries()
+    with django_assert_num_queries(4):
+        service.get_summaries([(2025, month) for month in range(1, 13)] + [2023, 2024, 2025])
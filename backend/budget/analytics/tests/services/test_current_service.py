@@ -24,9 +24,9 @@ def test_get_location_data(
     baker.make_recipe(negative_transaction_recipe, user=user, location=location2, amount=150)
 
     service = AnalyticsCurrentService(user).get_locations_data()
-    assert service["_total"] == 200
-    assert service["Location 1"] == 50
-    assert service["Location 2"] == 150
+    assert service["_total"] == 20000
+    assert service["Location 1"] == 5000
+    assert service["Location 2"] == 15000
 
 
 @pytest.mark.django_db
@@ -48,9 +48,9 @@ def test_get_buckets_data(
     baker.make_recipe(negative_transaction_recipe, user=user, bucket=bucket2, amount=150)
 
     service = AnalyticsCurrentService(user).get_buckets_data()
-    assert service["_total"] == 200
-    assert service["Bucket 1"] == 50
-    assert service["Bucket 2"] == 150
+    assert service["_total"] == 20000
+    assert service["Bucket 1"] == 5000
+    assert service["Bucket 2"] == 15000
 
 
 @pytest.mark.django_db
@@ -75,9 +75,9 @@ def test_get_balance(
     baker.make_recipe(neutral_transaction_recipe, amount=-5, user=user)
 
     service = AnalyticsCurrentService(user).get_balance()
-    assert service["_total"] == 75
-    assert service["positive"] == 100
-    assert service["negative"] == 25
+    assert service["_total"] == 7500
+    assert service["positive"] == 10000
+    assert service["negative"] == 2500
     assert service["neutral"] == 0
 
 
@@ -117,13 +117,37 @@ def test_get_summary(
     baker.make_recipe(neutral_transaction_recipe, user=user, bucket=bucket2, location=location2, amount=-10)
 
     service = AnalyticsCurrentService(user).get_summary()
-    assert service["locations"]["_total"] == 200
-    assert service["locations"]["Location 1"] == 50
-    assert service["locations"]["Location 2"] == 150
-    assert service["buckets"]["_total"] == 200
-    assert service["buckets"]["Bucket 1"] == 50
-    assert service["buckets"]["Bucket 2"] == 150
-    assert service["balance"]["_total"] == 200
-    assert service["balance"]["positive"] == 400
-    assert service["balance"]["negative"] == 200
+    assert service["locations"]["_total"] == 20000
+    assert service["locations"]["Location 1"] == 5000
+    assert service["locations"]["Location 2"] == 15000
+    assert service["buckets"]["_total"] == 20000
+    assert service["buckets"]["Bucket 1"] == 5000
+    assert service["buckets"]["Bucket 2"] == 15000
+    assert service["balance"]["_total"] == 20000
+    assert service["balance"]["positive"] == 40000
+    assert service["balance"]["negative"] == 20000
     assert service["balance"]["neutral"] == 0
+
+
+@pytest.mark.django_db
+def test_get_summary_query_count(
+    user: User,
+    location_recipe: str,
+    bucket_recipe: str,
+    positive_transaction_recipe: str,
+    django_assert_num_queries,
+):
+    """Test get_summary cost does not depend on the number of locations and buckets."""
+    for index in range(5):
+        location = baker.make_recipe(location_recipe, user=user, name=f"Location {index}")
+        bucket = baker.make_recipe(bucket_recipe, user=user, name=f"Bucket {index}", allocation_percentage=10)
+        baker.make_recipe(positive_transaction_recipe, user=user, location=location, bucket=bucket, amount=100)
+
+    with django_assert_num_queries(3):
+        service = AnalyticsCurrentService(user).get_summary()
+
+    assert service["locations"]["_total"] == 50000
+    assert service["locations"]["Location 3"] == 10000
+    assert service["buckets"]["_total"] == 50000
+    assert service["buckets"]["Bucket 3"] == 10000
+    assert service["balance"]["_total"] == 50000
@@ -26,12 +26,12 @@ def test_get_positive_categories_by_year(
     baker.make_recipe(positive_transaction_recipe, user=user, date=year_2026, category=positive_category2, amount=100)
 
     service_year_2025 = AnalyticsHistoricalService(user).get_positive_categories_by_year(year=2025)
-    assert service_year_2025["Positive Category 1"] == 200
+    assert service_year_2025["Positive Category 1"] == 20000
     assert service_year_2025["Positive Category 2"] == 0
 
     service_year_2026 = AnalyticsHistoricalService(user).get_positive_categories_by_year(year=2026)
     assert service_year_2026["Positive Category 1"] == 0
-    assert service_year_2026["Positive Category 2"] == 100
+    assert service_year_2026["Positive Category 2"] == 10000
 
 
 @pytest.mark.django_db
@@ -53,12 +53,12 @@ def test_get_negative_categories_by_year(
     baker.make_recipe(negative_transaction_recipe, user=user, date=year_2026, category=negative_category2, amount=100)
 
     service_year_2025 = AnalyticsHistoricalService(user).get_negative_categories_by_year(year=2025)
-    assert service_year_2025["Negative Category 1"] == 200
+    assert service_year_2025["Negative Category 1"] == 20000
     assert service_year_2025["Negative Category 2"] == 0
 
     service_year_2026 = AnalyticsHistoricalService(user).get_negative_categories_by_year(year=2026)
     assert service_year_2026["Negative Category 1"] == 0
-    assert service_year_2026["Negative Category 2"] == 100
+    assert service_year_2026["Negative Category 2"] == 10000
 
 
 @pytest.mark.django_db
@@ -119,16 +119,16 @@ def test_get_balance_by_year(
     baker.make_recipe(neutral_transaction_recipe, user=user, date=year_2026, amount=-10)
 
     service_year_2025 = AnalyticsHistoricalService(user).get_balance_by_year(year=2025)
-    assert service_year_2025["_total"] == 100
-    assert service_year_2025["positive"] == 200
-    assert service_year_2025["negative"] == 100
+    assert service_year_2025["_total"] == 10000
+    assert service_year_2025["positive"] == 20000
+    assert service_year_2025["negative"] == 10000
     assert service_year_2025["neutral"] == 0
 
 
     service_year_2026 = AnalyticsHistoricalService(user).get_balance_by_year(year=2026)
-    assert service_year_2026["_total"] == 50
-    assert service_year_2026["positive"] == 100
-    assert service_year_2026["negative"] == 50
+    assert service_year_2026["_total"] == 5000
+    assert service_year_2026["positive"] == 10000
+    assert service_year_2026["negative"] == 5000
     assert service_year_2026["neutral"] == 0
 
 
@@ -240,3 +240,30 @@ def test_get_historical_summary(
     historical_summary["balance"] = service.get_balance_for_queryset(transactions)
 
     assert service_data == historical_summary
+
+
+@pytest.mark.django_db
+def test_get_summary_single_scan(
+    user: User,
+    positive_category_recipe: str,
+    positive_transaction_recipe: str,
+    negative_transaction_recipe: str,
+    django_assert_num_queries,
+):
+    """Test get_summary builds the historical report from one aggregate query plus the categories lookup."""
+    positive_category = baker.make_recipe(positive_category_recipe, user=user, name="Positive Category")
+    for year in (2021, 2023, 2025):
+        date = make_aware(datetime(year, 3, 1))
+        baker.make_recipe(positive_transaction_recipe, user=user, date=date, category=positive_category, amount=100)
+        baker.make_recipe(negative_transaction_recipe, user=user, date=date, amount=40)
+
+    service = AnalyticsHistoricalService(user)
+    with django_assert_num_queries(2):
+        summary = service.get_summary()
+
+    assert list(summary["yearly"]) == ["2021", "2023", "2025"]
+    assert summary["yearly"]["2023"]["positive_categories"]["Positive Category"] == 10000
+    assert summary["yearly"]["2023"]["balance"]["_total"] == 6000
+    assert summary["summary"]["positive_categories"]["Positive Category"] == 30000
+    assert summary["summary"]["balance"]["_total"] == 18000
+    assert summary["yearly"] == service.get_historical_data_by_year()
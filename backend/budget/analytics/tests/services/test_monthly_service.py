@@ -26,12 +26,12 @@ def test_get_positive_categories_data(
     baker.make_recipe(positive_transaction_recipe, user=user, date=february, category=positive_category2, amount=100)
 
     service_january = AnalyticsMonthlyService(user, year=2025, month=1).get_positive_categories_data()
-    assert service_january["Positive Category 1"] == 200
+    assert service_january["Positive Category 1"] == 20000
     assert service_january["Positive Category 2"] == 0
 
     service_february = AnalyticsMonthlyService(user, year=2025, month=2).get_positive_categories_data()
     assert service_february["Positive Category 1"] == 0
-    assert service_february["Positive Category 2"] == 100
+    assert service_february["Positive Category 2"] == 10000
 
 
 @pytest.mark.django_db
@@ -53,12 +53,12 @@ def test_get_negative_categories_data(
     baker.make_recipe(negative_transaction_recipe, user=user, date=february, category=negative_category2, amount=100)
 
     service_january = AnalyticsMonthlyService(user, year=2025, month=1).get_negative_categories_data()
-    assert service_january["Negative Category 1"] == 200
+    assert service_january["Negative Category 1"] == 20000
     assert service_january["Negative Category 2"] == 0
 
     service_february = AnalyticsMonthlyService(user, year=2025, month=2).get_negative_categories_data()
     assert service_february["Negative Category 1"] == 0
-    assert service_february["Negative Category 2"] == 100
+    assert service_february["Negative Category 2"] == 10000
 
 
 @pytest.mark.django_db
@@ -119,13 +119,13 @@ def test_get_balance(
     baker.make_recipe(neutral_transaction_recipe, user=user, date=february, amount=-10)
 
     service_january = AnalyticsMonthlyService(user, year=2025, month=1).get_balance()
-    assert service_january["_total"] == 100
-    assert service_january["positive"] == 200
-    assert service_january["negative"] == 100
+    assert service_january["_total"] == 10000
+    assert service_january["positive"] == 20000
+    assert service_january["negative"] == 10000
     assert service_january["neutral"] == 0
 
     service_february = AnalyticsMonthlyService(user, year=2025, month=2).get_balance()
-    assert service_february["_total"] == 50
-    assert service_february["positive"] == 100
-    assert service_february["negative"] == 50
+    assert service_february["_total"] == 5000
+    assert service_february["positive"] == 10000
+    assert service_february["negative"] == 5000
     assert service_february["neutral"] == 0
@@ -0,0 +1,86 @@
+import pytest
+from model_bakery import baker
+from django.utils.timezone import make_aware
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from accounts.models import User
+from analytics.models import MonthlyRollup
+from analytics.services.base import AnalyticsBaseService
+from analytics.services.periods import Period
+from transactions.models import Transaction
+
+
+def test_month_period_boundaries():
+    """Test a month period starts on the first day of the month and ends on the first day of the next one."""
+    period = Period.month(2025, 12)
+    assert period.start == make_aware(datetime(2025, 12, 1))
+    assert period.end == make_aware(datetime(2026, 1, 1))
+    assert period.is_month_aligned()
+
+
+def test_year_period_boundaries():
+    """Test a year period covers the calendar year."""
+    period = Period.year(2025)
+    assert period.start == make_aware(datetime(2025, 1, 1))
+    assert period.end == make_aware(datetime(2026, 1, 1))
+
+
+def test_range_period_is_not_month_aligned():
+    """Test a period cut in the middle of a month cannot be read from the rollups."""
+    assert not Period.range(datetime(2025, 1, 1), datetime(2025, 1, 15)).is_month_aligned()
+
+
+@pytest.mark.django_db
+def test_filter_compiles_to_date_range(user: User):
+    """Test the period filter is a plain range on the date column instead of a per-row date extraction."""
+    sql = str(Period.month(2025, 3).filter(Transaction.objects.filter_by_user(user=user)).query)
+
+    assert '"date" >=' in sql
+    assert '"date" <' in sql
+    assert "EXTRACT" not in sql.upper()
+    assert "django_datetime_extract" not in sql
+
+
+@pytest.mark.django_db
+def test_filter_month_boundaries(
+    user: User,
+    positive_transaction_recipe: str,
+):
+    """Test the last instant of a month is included and the first instant of the next month is not."""
+    baker.make_recipe(positive_transaction_recipe, user=user, date=make_aware(datetime(2025, 12, 31, 23, 59, 59)))
+    baker.make_recipe(positive_transaction_recipe, user=user, date=make_aware(datetime(2026, 1, 1)))
+    service = AnalyticsBaseService(user)
+
+    assert service.get_transactions_by_month(12, 2025).count() == 1
+    assert service.get_transactions_by_month(1, 2026).count() == 1
+    assert service.get_transactions_by_year(2025).count() == 1
+
+
+@pytest.mark.django_db
+def test_filter_uses_period_timezone(
+    user: User,
+    positive_transaction_recipe: str,
+):
+    """Test the period boundaries follow its timezone."""
+    baker.make_recipe(positive_transaction_recipe, user=user, date=datetime(2025, 1, 31, 23, 30, tzinfo=ZoneInfo("UTC")))
+    transactions = Transaction.objects.filter_by_user(user=user)
+
+    assert Period.month(2025, 1, tz=ZoneInfo("UTC")).filter(transactions).count() == 1
+    assert Period.month(2025, 2, tz=ZoneInfo("Europe/Bucharest")).filter(transactions).count() == 1
+
+
+@pytest.mark.django_db
+def test_filter_rollups_across_years(
+    user: User,
+    positive_category_recipe: str,
+):
+    """Test a month aligned period spanning several years selects the matching rollup months."""
+    category = baker.make_recipe(positive_category_recipe, user=user)
+    for year, month in ((2024, 10), (2024, 11), (2025, 6), (2026, 2), (2026, 3)):
+        MonthlyRollup.objects.create(user=user, year=year, month=month, category=category, sign=category.sign, amount=1, count=1)
+
+    period = Period.range(datetime(2024, 11, 1), datetime(2026, 3, 1))
+    months = list(period.filter_rollups(MonthlyRollup.objects.filter_by_user(user=user)).values_list("year", "month"))
+
+    assert months == [(2024, 11), (2025, 6), (2026, 2)]
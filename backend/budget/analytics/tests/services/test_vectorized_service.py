@@ -0,0 +1,120 @@
+import pytest
+from model_bakery import baker
+from django.utils import timezone
+from django.utils.timezone import make_aware
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from accounts.models import User
+from analytics.services.current import AnalyticsCurrentService
+from analytics.services.monthly import AnalyticsMonthlyService
+from analytics.services.yearly import AnalyticsYearlyService
+from analytics.services.historical import AnalyticsHistoricalService
+from analytics.services.combined import AnalyticsCombinedService
+
+pytest.importorskip("numpy")
+
+from analytics.services.vectorized import AnalyticsVectorizedService  # noqa: E402
+
+
+@pytest.fixture
+def transactions(
+    user: User,
+    location_recipe: str,
+    bucket_recipe: str,
+    positive_category_recipe: str,
+    negative_category_recipe: str,
+    neutral_category_recipe: str,
+    positive_transaction_recipe: str,
+    negative_transaction_recipe: str,
+    neutral_transaction_recipe: str,
+):
+    """Fixture for creating transactions over several years, with removed and missing categories, locations and buckets."""
+    locations = baker.make_recipe(location_recipe, user=user, _quantity=3)
+    buckets = baker.make_recipe(bucket_recipe, user=user, allocation_percentage=30, _quantity=3)
+    positive_category = baker.make_recipe(positive_category_recipe, user=user)
+    negative_categories = baker.make_recipe(negative_category_recipe, user=user, _quantity=2)
+    neutral_category = baker.make_recipe(neutral_category_recipe, user=user)
+    baker.make_recipe(positive_category_recipe, user=user)  # without transactions
+    deleted_category = baker.make_recipe(negative_category_recipe, user=user)
+
+    dates = [datetime(2023, 12, 31, 23, 30), datetime(2024, 1, 1), datetime(2024, 6, 15, 12), datetime(2025, 2, 28)]
+    for index, date in enumerate(dates):
+        common = {
+            "user": user,
+            "date": make_aware(date),
+            "location": locations[index % 3],
+            "bucket": buckets[index % 3],
+        }
+        baker.make_recipe(positive_transaction_recipe, category=positive_category, amount="1000.10", **common)
+        baker.make_recipe(negative_transaction_recipe, category=negative_categories[index % 2], amount="99.99", **common)
+        baker.make_recipe(neutral_transaction_recipe, category=neutral_category, amount="-50.05", **common)
+        baker.make_recipe(negative_transaction_recipe, category=deleted_category, amount="12.34", **common)
+
+    negative_categories[1].delete()
+    deleted_category.delete(soft=False)  # its transactions are left without category
+    locations[2].delete()
+    buckets[2].delete()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("use_rollup", [True, False])
+def test_vectorized_reports_match_services(user: User, transactions, settings, use_rollup: bool):
+    """Test every vectorized report is equal to the one computed by the ORM services."""
+    settings.ANALYTICS_USE_ROLLUP = use_rollup
+    service = AnalyticsVectorizedService(user)
+
+    assert service.get_current_summary() == AnalyticsCurrentService(user).get_summary()
+    assert service.get_historical_summary() == AnalyticsHistoricalService(user).get_summary()
+    for year in (2022, 2023, 2024, 2025):
+        assert service.get_yearly_summary(year) == AnalyticsYearlyService(user, year).get_summary()
+        for month in range(1, 13):
+            assert service.get_monthly_summary(year, month) == AnalyticsMonthlyService(user, year, month).get_summary()
+
+
+@pytest.mark.django_db
+def test_vectorized_reports_follow_current_timezone(user: User, transactions):
+    """Test transactions are bucketed into months in the active timezone, like the ORM services."""
+    with timezone.override(ZoneInfo("Europe/Bucharest")):
+        assert (
+            AnalyticsVectorizedService(user).get_monthly_summary(2024, 1)
+            == AnalyticsMonthlyService(user, 2024, 1).get_summary()
+        )
+
+
+@pytest.mark.django_db
+def test_vectorized_reports_without_transactions(user: User):
+    """Test the vectorized reports of a user without data are the same as the ORM ones."""
+    service = AnalyticsVectorizedService(user)
+
+    assert service.get_current_summary() == AnalyticsCurrentService(user).get_summary()
+    assert service.get_historical_summary() == AnalyticsHistoricalService(user).get_summary()
+    assert service.get_yearly_summary(2025) == AnalyticsYearlyService(user, 2025).get_summary()
+
+
+@pytest.mark.django_db
+def test_vectorized_summaries_match_combined(user: User, transactions, django_assert_num_queries):
+    """Test the vectorized summaries match the combined service, loading the data once."""
+    periods = [(2024, 1), (2025, 2), 2023, 2024]
+    service = AnalyticsVectorizedService(user)
+
+    # categories, locations, buckets and transactions
+    with django_assert_num_queries(4):
+        summaries = service.get_summaries(periods)
+
+    assert summaries == AnalyticsCombinedService(user).get_summaries(periods)
+
+
+@pytest.mark.django_db
+def test_generate_report_with_numpy_backend(user: User, transactions, settings):
+    """Test the numpy backend is used to generate the cached reports when configured."""
+    from analytics.services.cache_utils import generate_report
+
+    orm_report = generate_report(user, "yearly", 2024)
+    settings.ANALYTICS_BACKEND = "numpy"
+    numpy_report = generate_report(user, "yearly", 2024)
+
+    for report in (orm_report, numpy_report):
+        report.pop("generated_at")
+        report.pop("soft_expires_at")
+    assert numpy_report == orm_report
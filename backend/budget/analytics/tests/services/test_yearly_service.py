@@ -26,12 +26,12 @@ def test_get_positive_categories_by_month(
     baker.make_recipe(positive_transaction_recipe, user=user, date=february, category=positive_category2, amount=100)
 
     service_january = AnalyticsYearlyService(user, year=2025).get_positive_categories_by_month(month=1)
-    assert service_january["Positive Category 1"] == 200
+    assert service_january["Positive Category 1"] == 20000
     assert service_january["Positive Category 2"] == 0
 
     service_february = AnalyticsYearlyService(user, year=2025).get_positive_categories_by_month(month=2)
     assert service_february["Positive Category 1"] == 0
-    assert service_february["Positive Category 2"] == 100
+    assert service_february["Positive Category 2"] == 10000
 
 
 @pytest.mark.django_db
@@ -53,12 +53,12 @@ def test_get_negative_categories_by_month(
     baker.make_recipe(negative_transaction_recipe, user=user, date=february, category=negative_category2, amount=100)
 
     service_january = AnalyticsYearlyService(user, year=2025).get_negative_categories_by_month(month=1)
-    assert service_january["Negative Category 1"] == 200
+    assert service_january["Negative Category 1"] == 20000
     assert service_january["Negative Category 2"] == 0
 
     service_february = AnalyticsYearlyService(user, year=2025).get_negative_categories_by_month(month=2)
     assert service_february["Negative Category 1"] == 0
-    assert service_february["Negative Category 2"] == 100
+    assert service_february["Negative Category 2"] == 10000
 
 
 @pytest.mark.django_db
@@ -119,15 +119,15 @@ def test_get_balance_by_month(
     baker.make_recipe(neutral_transaction_recipe, user=user, date=february, amount=-10)
 
     service_january = AnalyticsYearlyService(user, year=2025).get_balance_by_month(month=1)
-    assert service_january["_total"] == 100
-    assert service_january["positive"] == 200
-    assert service_january["negative"] == 100
+    assert service_january["_total"] == 10000
+    assert service_january["positive"] == 20000
+    assert service_january["negative"] == 10000
     assert service_january["neutral"] == 0
 
     service_february = AnalyticsYearlyService(user, year=2025).get_balance_by_month(month=2)
-    assert service_february["_total"] == 50
-    assert service_february["positive"] == 100
-    assert service_february["negative"] == 50
+    assert service_february["_total"] == 5000
+    assert service_february["positive"] == 10000
+    assert service_february["negative"] == 5000
     assert service_february["neutral"] == 0
 
 
@@ -231,3 +231,32 @@ def test_get_year_summary(
     year_summary["balance"] = service.get_balance_for_queryset(year_transactions)
 
     assert service_data == year_summary
+
+
+@pytest.mark.django_db
+def test_get_summary_single_scan(
+    user: User,
+    positive_category_recipe: str,
+    positive_transaction_recipe: str,
+    negative_transaction_recipe: str,
+    django_assert_num_queries,
+):
+    """Test get_summary builds the whole yearly report from one aggregate query plus the categories lookup."""
+    positive_category = baker.make_recipe(positive_category_recipe, user=user, name="Positive Category")
+    for month in (1, 6, 12):
+        date = make_aware(datetime(2025, month, 15))
+        baker.make_recipe(positive_transaction_recipe, user=user, date=date, category=positive_category, amount=100)
+        baker.make_recipe(negative_transaction_recipe, user=user, date=date, amount=month)
+    baker.make_recipe(positive_transaction_recipe, user=user, date=make_aware(datetime(2024, 6, 1)), amount=1000)
+
+    service = AnalyticsYearlyService(user, year=2025)
+    with django_assert_num_queries(2):
+        summary = service.get_summary()
+
+    assert summary["monthly"]["6"]["positive_categories"]["Positive Category"] == 10000
+    assert summary["monthly"]["6"]["balance"]["_total"] == 9400
+    assert summary["monthly"]["2"]["balance"]["_total"] == 0
+    assert summary["summary"]["positive_categories"]["Positive Category"] == 30000
+    assert summary["summary"]["balance"]["negative"] == 1900
+    assert summary["summary"]["balance"]["_total"] == 28100
+    assert summary["monthly"] == service.get_year_data_by_month()
@@ -0,0 +1,238 @@
+import pytest
+from model_bakery import baker
+from django.core.cache import cache
+from django.db import transaction as db_transaction
+from django.utils.timezone import make_aware
+from datetime import datetime
+
+from accounts.models import User
+from analytics.services.cache_utils import get_report_cache_key
+from analytics.services.cache_utils import get_user_cache_version
+from analytics.services.cache_utils import get_or_generate_current_report
+from analytics.services.cache_utils import get_or_generate_monthly_report
+from analytics.services.cache_utils import get_or_generate_yearly_report
+from analytics.services.cache_utils import get_or_generate_historical_report
+from analytics.services.current import AnalyticsCurrentService
+from analytics.services.monthly import AnalyticsMonthlyService
+from analytics.services.yearly import AnalyticsYearlyService
+from analytics.services.historical import AnalyticsHistoricalService
+from analytics.services.invalidation import schedule_invalidation
+
+
+@pytest.fixture
+def budget(
+    user: User,
+    location_recipe: str,
+    bucket_recipe: str,
+    positive_category_recipe: str,
+    negative_category_recipe: str,
+    django_capture_on_commit_callbacks,
+):
+    """Fixture for creating the locations, buckets and categories of a user, with their invalidations committed."""
+    with django_capture_on_commit_callbacks(execute=True):
+        return {
+            "locations": baker.make_recipe(location_recipe, user=user, _quantity=2),
+            "buckets": [
+                baker.make_recipe(bucket_recipe, user=user, name="Bucket 1", allocation_percentage=50),
+                baker.make_recipe(bucket_recipe, user=user, name="Bucket 2", allocation_percentage=50),
+            ],
+            "positive": baker.make_recipe(positive_category_recipe, user=user),
+            "negative": baker.make_recipe(negative_category_recipe, user=user),
+        }
+
+
+def generate_reports(user):
+    """Generate and cache the reports affected by the transactions of the tests."""
+    get_or_generate_current_report(user)
+    get_or_generate_monthly_report(user, 2024, 12)
+    get_or_generate_monthly_report(user, 2025, 1)
+    get_or_generate_yearly_report(user, 2024)
+    get_or_generate_yearly_report(user, 2025)
+    get_or_generate_historical_report(user)
+
+
+def assert_cached_reports_are_fresh(user):
+    """Assert the cached reports are equal to freshly computed ones."""
+    expected = {
+        get_report_cache_key(user.id, "current"): AnalyticsCurrentService(user).get_summary(),
+        get_report_cache_key(user.id, "monthly", 2024, 12): AnalyticsMonthlyService(user, 2024, 12).get_summary(),
+        get_report_cache_key(user.id, "monthly", 2025, 1): AnalyticsMonthlyService(user, 2025, 1).get_summary(),
+        get_report_cache_key(user.id, "yearly", 2024): AnalyticsYearlyService(user, 2024).get_summary(),
+        get_report_cache_key(user.id, "yearly", 2025): AnalyticsYearlyService(user, 2025).get_summary(),
+        get_report_cache_key(user.id, "historical"): AnalyticsHistoricalService(user).get_summary(),
+    }
+    for cache_key, report in expected.items():
+        cached_report = cache.get(cache_key)
+        assert cached_report is not None, cache_key
+        cached_report.pop("generated_at")
+        cached_report.pop("soft_expires_at")
+        assert cached_report == report, cache_key
+
+
+@pytest.mark.django_db
+def test_delta_on_transaction_create(
+    user: User, budget: dict, negative_transaction_recipe: str, django_capture_on_commit_callbacks
+):
+    """Test that creating a transaction patches the cached reports in place, once committed."""
+    generate_reports(user)
+    version = get_user_cache_version(user.id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        baker.make_recipe(
+            negative_transaction_recipe,
+            user=user,
+            date=make_aware(datetime(2025, 1, 10)),
+            category=budget["negative"],
+            location=budget["locations"][0],
+            bucket=budget["buckets"][0],
+            amount=40,
+        )
+        assert cache.get(get_report_cache_key(user.id, "current"))["balance"]["negative"] == 0
+
+    assert get_user_cache_version(user.id) == version
+    assert cache.get(get_report_cache_key(user.id, "current"))["balance"]["negative"] == 4000
+    assert_cached_reports_are_fresh(user)
+
+
+@pytest.mark.django_db
+def test_delta_on_transaction_update(
+    user: User,
+    budget: dict,
+    positive_transaction_recipe: str,
+    django_capture_on_commit_callbacks,
+):
+    """Test that moving a transaction between months, years, categories and accounts patches the cached reports."""
+    with django_capture_on_commit_callbacks(execute=True):
+        transaction = baker.make_recipe(
+            positive_transaction_recipe,
+            user=user,
+            date=make_aware(datetime(2024, 12, 10)),
+            category=budget["positive"],
+            location=budget["locations"][0],
+            bucket=budget["buckets"][0],
+            amount=100,
+        )
+    generate_reports(user)
+    version = get_user_cache_version(user.id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        transaction.date = make_aware(datetime(2025, 1, 10))
+        transaction.location = budget["locations"][1]
+        transaction.bucket = budget["buckets"][1]
+        transaction.amount = 70
+        transaction.save()
+
+    assert get_user_cache_version(user.id) == version
+    assert "2024" not in cache.get(get_report_cache_key(user.id, "historical"))["yearly"]
+    assert_cached_reports_are_fresh(user)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        transaction.category = budget["negative"]
+        transaction.save()
+
+    assert_cached_reports_are_fresh(user)
+
+
+@pytest.mark.django_db
+def test_delta_on_transaction_delete(
+    user: User, budget: dict, negative_transaction_recipe: str, django_capture_on_commit_callbacks
+):
+    """Test that deleting a transaction patches the cached reports in place."""
+    with django_capture_on_commit_callbacks(execute=True):
+        transactions = baker.make_recipe(
+            negative_transaction_recipe,
+            user=user,
+            date=make_aware(datetime(2025, 1, 10)),
+            category=budget["negative"],
+            location=budget["locations"][0],
+            bucket=budget["buckets"][0],
+            amount=40,
+            _quantity=2,
+        )
+    generate_reports(user)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        transactions[0].delete()
+
+    assert_cached_reports_are_fresh(user)
+
+
+@pytest.mark.django_db
+def test_rolled_back_delta_is_dropped(
+    user: User, budget: dict, negative_transaction_recipe: str, django_capture_on_commit_callbacks
+):
+    """Test that a transaction change rolled back leaves the cached reports as they were."""
+    generate_reports(user)
+    version = get_user_cache_version(user.id)
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with pytest.raises(RuntimeError):
+            with db_transaction.atomic():
+                baker.make_recipe(
+                    negative_transaction_recipe,
+                    user=user,
+                    date=make_aware(datetime(2025, 1, 10)),
+                    category=budget["negative"],
+                    location=budget["locations"][0],
+                    bucket=budget["buckets"][0],
+                    amount=40,
+                )
+                raise RuntimeError
+
+    assert callbacks == []
+    assert get_user_cache_version(user.id) == version
+    assert_cached_reports_are_fresh(user)
+
+
+@pytest.mark.django_db
+def test_delta_skipped_when_invalidation_is_pending(
+    user: User, budget: dict, negative_transaction_recipe: str, django_capture_on_commit_callbacks
+):
+    """Test that reports due to be invalidated in the same transaction are not patched first."""
+    generate_reports(user)
+    current_report = cache.get(get_report_cache_key(user.id, "current"))
+    version = get_user_cache_version(user.id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        baker.make_recipe(negative_transaction_recipe, user=user, category=budget["negative"], amount=40)
+        schedule_invalidation(user)
+        baker.make_recipe(negative_transaction_recipe, user=user, category=budget["negative"], amount=40)
+
+    assert get_user_cache_version(user.id) != version
+    assert cache.get(get_report_cache_key(user.id, "current", version=version)) == current_report
+
+
+@pytest.mark.django_db
+def test_delta_falls_back_to_invalidation(
+    user: User,
+    budget: dict,
+    negative_transaction_recipe: str,
+    django_capture_on_commit_callbacks,
+):
+    """Test that reports which cannot be patched are invalidated."""
+    cache.set(get_report_cache_key(user.id, "current"), {"test": "data"})
+    version = get_user_cache_version(user.id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        baker.make_recipe(negative_transaction_recipe, user=user, category=budget["negative"])
+
+    assert get_user_cache_version(user.id) != version
+
+
+@pytest.mark.django_db
+def test_delta_falls_back_to_invalidation_while_report_is_computed(
+    user: User, budget: dict, negative_transaction_recipe: str, django_capture_on_commit_callbacks
+):
+    """Test that a report locked by its computation is not patched, the reports being invalidated instead."""
+    generate_reports(user)
+    version = get_user_cache_version(user.id)
+    current_key = get_report_cache_key(user.id, "current")
+    current_report = cache.get(current_key)
+    cache.set(f"{get_report_cache_key(user.id, 'historical')}_lock", "other", 60)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        baker.make_recipe(negative_transaction_recipe, user=user, category=budget["negative"], amount=40)
+
+    assert get_user_cache_version(user.id) != version
+    assert cache.get(current_key) == current_report
+    assert cache.get(f"{current_key}_lock") is None
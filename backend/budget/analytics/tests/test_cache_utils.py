@@ -0,0 +1,192 @@
+import pytest
+from django.core.cache import cache
+
+from accounts.models import User
+from analytics.services import cache_utils
+from analytics.services.cache_utils import generate_and_cache_reports
+from analytics.services.cache_utils import get_or_generate_current_report
+from analytics.services.cache_utils import get_report_cache_key
+from analytics.services.cache_utils import get_report_previous_key
+from analytics.services.cache_utils import invalidate_user_analytics_cache
+from analytics.services.cache_utils import refresh_report
+from analytics.services.combined import AnalyticsCombinedService
+
+
+@pytest.fixture
+def generated_reports(monkeypatch):
+    """Fixture recording the reports computed from the database."""
+    calls = []
+    generate_report = cache_utils.generate_report
+
+    def record(user, report, *period):
+        calls.append((report, *period))
+        return generate_report(user, report, *period)
+
+    monkeypatch.setattr(cache_utils, "generate_report", record)
+    return calls
+
+
+@pytest.fixture
+def enqueued_tasks(monkeypatch):
+    """Fixture recording the background tasks enqueued."""
+    calls = []
+    monkeypatch.setattr(cache_utils, "async_task", lambda *args: calls.append(args))
+    return calls
+
+
+@pytest.fixture
+def fast_wait(settings):
+    """Fixture shortening the time a request waits for a report computed elsewhere."""
+    settings.ANALYTICS_LOCK_WAIT = 0.05
+    settings.ANALYTICS_LOCK_POLL_INTERVAL = 0.01
+
+
+@pytest.mark.django_db
+def test_cache_miss_computes_once_without_background_task(
+    user: User,
+    generated_reports: list,
+    enqueued_tasks: list,
+):
+    """Test a cache miss computes the report once, caches it and releases the lock."""
+    report = get_or_generate_current_report(user)
+    cache_key = get_report_cache_key(user.id, "current")
+
+    assert generated_reports == [("current",)]
+    assert enqueued_tasks == []
+    assert cache.get(cache_key) == report
+    assert cache.get(get_report_previous_key(user.id, "current")) == report
+    assert cache.get(f"{cache_key}_lock") is None
+
+    assert get_or_generate_current_report(user) == report
+    assert generated_reports == [("current",)]
+
+
+@pytest.mark.django_db
+def test_refresh_report_skips_locked_report(user: User, generated_reports: list):
+    """Test a report is not computed while another process holds its lock."""
+    cache.add(f"{get_report_cache_key(user.id, 'current')}_lock", "other", 30)
+
+    assert refresh_report(user, "current") is None
+    assert generated_reports == []
+
+
+@pytest.mark.django_db
+def test_locked_report_waits_for_result(
+    user: User,
+    generated_reports: list,
+    enqueued_tasks: list,
+    monkeypatch,
+):
+    """Test a request waits for the report computed by the lock holder instead of computing it again."""
+    cache_key = get_report_cache_key(user.id, "current")
+    cache.add(f"{cache_key}_lock", "other", 30)
+    # The lock holder finishes while the request waits
+    monkeypatch.setattr(cache_utils.time, "sleep", lambda seconds: cache.set(cache_key, {"computed": "elsewhere"}))
+
+    assert get_or_generate_current_report(user) == {"computed": "elsewhere"}
+    assert generated_reports == []
+    assert enqueued_tasks == []
+
+
+@pytest.mark.django_db
+def test_locked_report_serves_previous_value(
+    user: User,
+    generated_reports: list,
+    enqueued_tasks: list,
+    fast_wait,
+):
+    """Test a request gets the previous report, and a background refresh, when the lock holder is too slow."""
+    cache.add(f"{get_report_cache_key(user.id, 'current')}_lock", "other", 30)
+    cache.set(get_report_previous_key(user.id, "current"), {"previous": True})
+
+    assert get_or_generate_current_report(user) == {"previous": True, "stale": True}
+    assert generated_reports == []
+    assert enqueued_tasks == [("tasks.analytics.generate_current_report", user.id)]
+
+
+@pytest.mark.django_db
+def test_locked_report_without_previous_value_is_computed(
+    user: User,
+    generated_reports: list,
+    enqueued_tasks: list,
+    fast_wait,
+):
+    """Test a request computes the report itself when there is nothing to serve."""
+    cache.add(f"{get_report_cache_key(user.id, 'monthly', 2025, 1)}_lock", "other", 30)
+
+    report = cache_utils.get_or_generate_monthly_report(user, 2025, 1)
+
+    assert report["period"] == {"year": 2025, "month": 1}
+    assert generated_reports == [("monthly", 2025, 1)]
+    assert enqueued_tasks == []
+
+
+@pytest.mark.django_db
+def test_soft_expired_report_is_served_stale(
+    user: User,
+    generated_reports: list,
+    enqueued_tasks: list,
+    settings,
+):
+    """Test a report past its soft expiry is served with a stale marker and refreshed in the background once."""
+    settings.ANALYTICS_SOFT_TTL = 0
+    report = get_or_generate_current_report(user)
+    assert "soft_expires_at" in report
+
+    stale_report = get_or_generate_current_report(user)
+    get_or_generate_current_report(user)
+
+    assert stale_report == {**report, "stale": True}
+    assert "stale" not in cache.get(get_report_cache_key(user.id, "current"))
+    assert generated_reports == [("current",)]
+    assert enqueued_tasks == [("tasks.analytics.generate_current_report", user.id)]
+
+
+@pytest.mark.django_db
+def test_refresh_report_replaces_stale_report(user: User, enqueued_tasks: list, settings):
+    """Test the background refresh caches a fresh report and allows the next refresh to be enqueued."""
+    settings.ANALYTICS_SOFT_TTL = 0
+    get_or_generate_current_report(user)
+    get_or_generate_current_report(user)
+
+    settings.ANALYTICS_SOFT_TTL = 3600
+    refresh_report(user, "current")
+
+    assert "stale" not in get_or_generate_current_report(user)
+    assert cache.get(f"{get_report_cache_key(user.id, 'current')}_refreshing") is None
+
+
+@pytest.mark.django_db
+def test_generate_and_cache_reports_skips_locked_reports(user: User, settings):
+    """Test the reports being computed by another process are left to it, and the refresh markers of the others cleared."""
+    settings.ANALYTICS_BACKEND = "orm"
+    current_key = get_report_cache_key(user.id, "current")
+    historical_key = get_report_cache_key(user.id, "historical")
+    cache.set(f"{current_key}_lock", "other", 60)
+    cache.set(f"{historical_key}_refreshing", 1, 60)
+
+    assert generate_and_cache_reports(user) == [historical_key]
+
+    assert cache.get(current_key) is None
+    assert cache.get(f"{current_key}_lock") == "other"
+    assert cache.get(historical_key) is not None
+    assert cache.get(f"{historical_key}_lock") is None
+    assert cache.get(f"{historical_key}_refreshing") is None
+
+
+@pytest.mark.django_db
+def test_generate_and_cache_reports_reads_version_first(user: User, settings, monkeypatch):
+    """Test reports computed while the cache is invalidated are cached under the invalidated version."""
+    settings.ANALYTICS_BACKEND = "orm"
+    get_summaries = AnalyticsCombinedService.get_summaries
+
+    def invalidate_while_computing(self, periods=()):
+        summaries = get_summaries(self, periods)
+        invalidate_user_analytics_cache(user)
+        return summaries
+
+    monkeypatch.setattr(AnalyticsCombinedService, "get_summaries", invalidate_while_computing)
+    previous_key = get_report_cache_key(user.id, "current")
+
+    assert previous_key in generate_and_cache_reports(user)
+    assert cache.get(get_report_cache_key(user.id, "current")) is None
@@ -0,0 +1,57 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from accounts.models import User
+from analytics.management.commands.benchmarkanalytics import BENCHMARK_EMAIL
+from transactions.models import Transaction
+
+
+@pytest.mark.django_db
+def test_benchmarkanalytics_command():
+    """Test the benchmark command times every report and cleans up its data."""
+    out = StringIO()
+    call_command("benchmarkanalytics", rows=500, runs=1, stdout=out)
+
+    output = out.getvalue()
+    for report in ("monthly", "yearly", "current"):
+        assert f"{report} report" in output
+    assert "transaction_user_date_cov_idx" in output
+    assert not User.all_objects.filter(email=BENCHMARK_EMAIL).exists()
+    assert not Transaction.objects.exists()
+
+
+@pytest.mark.django_db
+def test_benchmarkanalytics_command_keep():
+    """Test the benchmark command reuses the kept transactions."""
+    call_command("benchmarkanalytics", rows=200, runs=1, keep=True, stdout=StringIO())
+    out = StringIO()
+    call_command("benchmarkanalytics", rows=200, runs=1, keep=True, stdout=out)
+
+    assert "Reusing the 200 benchmark transactions" in out.getvalue()
+    assert Transaction.objects.count() == 200
+
+
+@pytest.mark.django_db
+def test_benchmarkbackends_command():
+    """Test the backends benchmark compares the backends at every size and cleans up its data."""
+    pytest.importorskip("numpy")
+    out = StringIO()
+    call_command("benchmarkbackends", sizes="100,200", runs=1, stdout=out)
+
+    output = out.getvalue()
+    assert output.count("The backends produce the same reports.") == 2
+    assert not Transaction.objects.exists()
+
+
+@pytest.mark.django_db
+def test_benchmarkformats_command():
+    """Test the formats benchmark measures every report in both formats, checks they agree and cleans up its data."""
+    out = StringIO()
+    call_command("benchmarkformats", rows=200, runs=1, stdout=out)
+
+    output = out.getvalue()
+    assert output.count("msgpack:") == 4
+    assert output.count("Both formats carry the same report.") == 4
+    assert not Transaction.objects.exists()
@@ -0,0 +1,90 @@
+import pytest
+from django.db import transaction
+from model_bakery import baker
+
+from accounts.models import User
+from analytics.services import invalidation
+from analytics.services.invalidation import collect_invalidations
+from analytics.services.invalidation import schedule_invalidation
+
+
+@pytest.fixture
+def invalidated_users(monkeypatch):
+    """Fixture recording the users whose cached reports are invalidated, without the collector of an earlier test."""
+    calls = []
+    monkeypatch.setattr(invalidation._state, "pending", None, raising=False)
+    monkeypatch.setattr(invalidation, "invalidate_user_analytics_cache", lambda user: calls.append(user.pk))
+    return calls
+
+
+@pytest.mark.django_db
+def test_invalidations_are_coalesced_until_commit(
+    user: User, bucket_recipe: str, invalidated_users: list, django_capture_on_commit_callbacks
+):
+    """Test that the saves of a transaction invalidate the cache once, when it commits."""
+    with django_capture_on_commit_callbacks(execute=True):
+        buckets = baker.make_recipe(bucket_recipe, user=user, allocation_percentage=0, _quantity=3)
+        for bucket in buckets:
+            bucket.allocation_percentage = 10
+            bucket.save()
+        bucket.delete()
+
+        assert invalidated_users == []
+
+    assert invalidated_users == [user.pk]
+
+
+@pytest.mark.django_db
+def test_rolled_back_invalidations_are_dropped(
+    user: User, bucket_recipe: str, invalidated_users: list, django_capture_on_commit_callbacks
+):
+    """Test that the invalidations of a rolled back transaction never run, and later ones still do."""
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                baker.make_recipe(bucket_recipe, user=user, allocation_percentage=0)
+                raise RuntimeError
+
+    assert callbacks == []
+    assert invalidated_users == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        baker.make_recipe(bucket_recipe, user=user, allocation_percentage=0)
+
+    assert invalidated_users == [user.pk]
+
+
+@pytest.mark.django_db
+def test_collect_invalidations(
+    user: User, user_recipe: str, invalidated_users: list, django_capture_on_commit_callbacks
+):
+    """Test that the invalidations collected by the context manager are flushed once per user when it ends."""
+    other_user = baker.make_recipe(user_recipe)
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with collect_invalidations() as collector:
+            with collect_invalidations():
+                schedule_invalidation(user)
+                schedule_invalidation(other_user)
+            schedule_invalidation(user)
+
+            assert set(collector.users) == {user.pk, other_user.pk}
+        assert invalidated_users == []
+
+    assert len(callbacks) == 1
+    assert sorted(invalidated_users) == sorted([user.pk, other_user.pk])
+
+
+@pytest.mark.django_db
+def test_invalidation_survives_rolled_back_savepoint(
+    user: User, invalidated_users: list, django_capture_on_commit_callbacks
+):
+    """Test that a user scheduled in a rolled back savepoint, then again, is still invalidated on commit."""
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                schedule_invalidation(user)
+                raise RuntimeError
+        schedule_invalidation(user)
+
+    assert invalidated_users == [user.pk]
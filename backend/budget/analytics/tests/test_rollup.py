@@ -0,0 +1,238 @@
+import importlib
+
+import pytest
+from model_bakery import baker
+from django.apps import apps
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.utils.timezone import make_aware
+from datetime import datetime
+
+from accounts.models import User
+from analytics.models import MonthlyRollup
+from analytics.services.rollup import add_to_rollup
+from analytics.services.rollup import rebuild_rollups
+from analytics.services.rollup import remove_from_rollup
+from transactions.models import Transaction
+
+
+def get_rollup_totals(user):
+    """Map (year, month, category id) to the summed amount stored in the rollup."""
+    totals = {}
+    for rollup in MonthlyRollup.objects.filter(user=user):
+        key = (rollup.year, rollup.month, rollup.category_id)
+        totals[key] = totals.get(key, 0) + rollup.amount
+    return {key: amount for key, amount in totals.items() if amount}
+
+
+@pytest.mark.django_db
+def test_rollup_on_transaction_create(user: User, negative_transaction_recipe: str):
+    """Test that creating transactions adds them to the rollup."""
+    date = make_aware(datetime(2025, 3, 10))
+    transaction = baker.make_recipe(negative_transaction_recipe, user=user, date=date, amount=40)
+    baker.make_recipe(
+        negative_transaction_recipe,
+        user=user,
+        date=date,
+        category=transaction.category,
+        location=transaction.location,
+        bucket=transaction.bucket,
+        amount=60,
+    )
+
+    rollup = MonthlyRollup.objects.get(user=user)
+    assert rollup.year == 2025
+    assert rollup.month == 3
+    assert rollup.category == transaction.category
+    assert rollup.sign == "NEGATIVE"
+    assert rollup.amount == 100
+    assert rollup.count == 2
+
+
+@pytest.mark.django_db
+def test_rollup_on_transaction_update(
+    user: User,
+    negative_category_recipe: str,
+    negative_transaction_recipe: str,
+):
+    """Test that moving a transaction between months and categories moves its amount in the rollup."""
+    other_category = baker.make_recipe(negative_category_recipe, user=user)
+    transaction = baker.make_recipe(negative_transaction_recipe, user=user, date=make_aware(datetime(2025, 3, 10)), amount=40)
+
+    transaction.date = make_aware(datetime(2025, 4, 10))
+    transaction.category = other_category
+    transaction.amount = 25
+    transaction.save()
+
+    assert get_rollup_totals(user) == {(2025, 4, other_category.id): 25}
+
+
+@pytest.mark.django_db
+def test_rollup_on_transaction_delete(user: User, negative_transaction_recipe: str):
+    """Test that deleting a transaction removes it from the rollup."""
+    transaction = baker.make_recipe(negative_transaction_recipe, user=user, amount=40)
+
+    transaction.delete()
+
+    assert not MonthlyRollup.objects.filter(user=user).exists()
+
+
+@pytest.mark.django_db
+def test_rollup_on_split_income(
+    user: User,
+    location_recipe: str,
+    bucket_recipe: str,
+    positive_category_recipe: str,
+):
+    """Test that split incomes are rolled up through their children only."""
+    bucket1 = baker.make_recipe(bucket_recipe, user=user, allocation_percentage=60)
+    bucket2 = baker.make_recipe(bucket_recipe, user=user, allocation_percentage=40)
+    category = baker.make_recipe(positive_category_recipe, user=user)
+    location = baker.make_recipe(location_recipe, user=user)
+    date = make_aware(datetime(2025, 5, 1))
+
+    Transaction.objects.create(
+        user=user,
+        description="Salary",
+        category=category,
+        date=date,
+        amount=1000,
+        location=location,
+        split_income=True,
+    )
+
+    assert get_rollup_totals(user) == {(2025, 5, category.id): 1000}
+    assert MonthlyRollup.objects.get(user=user, bucket=bucket1).amount == 600
+    assert MonthlyRollup.objects.get(user=user, bucket=bucket2).amount == 400
+
+    Transaction.objects.filter(parent_transaction__isnull=True).get().delete()
+
+    assert get_rollup_totals(user) == {}
+
+
+@pytest.mark.django_db
+def test_rollup_on_category_sign_change(user: User, negative_transaction_recipe: str):
+    """Test that changing a category sign updates the sign stored in the rollup."""
+    transaction = baker.make_recipe(negative_transaction_recipe, user=user)
+
+    category = transaction.category
+    category.sign = "NEUTRAL"
+    category.save()
+
+    assert MonthlyRollup.objects.get(user=user).sign == "NEUTRAL"
+
+
+@pytest.mark.django_db
+def test_rebuild_rollups(
+    user: User,
+    positive_transaction_recipe: str,
+    negative_transaction_recipe: str,
+):
+    """Test that rebuilding the rollups gives the same sums as the incremental updates."""
+    baker.make_recipe(positive_transaction_recipe, user=user, _quantity=5)
+    baker.make_recipe(negative_transaction_recipe, user=user, _quantity=5)
+    expected = get_rollup_totals(user)
+
+    MonthlyRollup.objects.all().delete()
+    rebuild_rollups()
+
+    assert get_rollup_totals(user) == expected
+
+
+@pytest.mark.django_db
+def test_rebuildrollups_command(user: User, negative_transaction_recipe: str):
+    """Test that the rebuildrollups command restores the rollups of a user."""
+    baker.make_recipe(negative_transaction_recipe, user=user, _quantity=3)
+    expected = get_rollup_totals(user)
+    MonthlyRollup.objects.update(amount=0)
+
+    call_command("rebuildrollups", "--email", user.email)
+
+    assert get_rollup_totals(user) == expected
+
+
+def get_rollup_rows(user):
+    """Get the rollup rows of a user as comparable tuples."""
+    return sorted(
+        MonthlyRollup.objects.filter(user=user).values_list(
+            "year", "month", "category_id", "location_id", "bucket_id", "sign", "amount", "count"
+        ),
+        key=str,
+    )
+
+
+@pytest.mark.django_db
+def test_rollup_key_is_unique(user: User):
+    """Test that two rollup rows cannot share a key, even without category, location, bucket and sign."""
+    MonthlyRollup.objects.create(user=user, year=2025, month=3, amount=10, count=1)
+
+    with pytest.raises(IntegrityError):
+        MonthlyRollup.objects.create(user=user, year=2025, month=3, amount=20, count=1)
+
+
+@pytest.mark.django_db
+def test_rollup_upserts(user: User):
+    """Test that rollup entries are added to and removed from one row, deleted once empty."""
+    key = {
+        "user_id": user.id, "year": 2025, "month": 3,
+        "category_id": None, "location_id": None, "bucket_id": None, "sign": None,
+    }
+
+    add_to_rollup(key, 10)
+    add_to_rollup(key, 15)
+    rollup = MonthlyRollup.objects.get(user=user)
+    assert (rollup.amount, rollup.count) == (25, 2)
+
+    remove_from_rollup(key, 10)
+    rollup.refresh_from_db()
+    assert (rollup.amount, rollup.count) == (15, 1)
+
+    remove_from_rollup(key, 15)
+    assert not MonthlyRollup.objects.filter(user=user).exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "field, recipe",
+    [("category", "negative_category_recipe"), ("location", "location_recipe"), ("bucket", "bucket_recipe")],
+)
+def test_rollup_on_hard_delete(field: str, recipe: str, user: User, negative_transaction_recipe: str, request):
+    """Test that the rollup keeps the transactions of hard deleted objects, as a rebuild would."""
+    first = baker.make_recipe(negative_transaction_recipe, user=user, date=make_aware(datetime(2025, 3, 10)))
+    related = {name: getattr(first, name) for name in ("category", "location", "bucket")}
+    # A second object, whose rollup row is merged with the one of the first once both are deleted
+    related[field] = baker.make_recipe(request.getfixturevalue(recipe), user=user)
+    second = baker.make_recipe(negative_transaction_recipe, user=user, date=make_aware(datetime(2025, 3, 20)), **related)
+
+    getattr(first, field).delete(soft=False)
+    getattr(second, field).delete(soft=False)
+
+    incremental = get_rollup_rows(user)
+    assert len(incremental) == 1
+    assert incremental[0][-1] == 2
+    rebuild_rollups([user])
+    assert get_rollup_rows(user) == incremental
+
+
+@pytest.mark.django_db
+def test_rollup_on_user_hard_delete(user: User, negative_transaction_recipe: str, negative_category_recipe: str):
+    """Test that a user whose categories share rollup rows once detached can be hard deleted."""
+    baker.make_recipe(negative_transaction_recipe, user=user, _quantity=3)
+
+    user.delete(soft=False)
+
+    assert not MonthlyRollup.objects.exists()
+
+
+@pytest.mark.django_db
+def test_backfill_rollups_migration(user: User, negative_transaction_recipe: str):
+    """Test the migration filling the rollups of existing transactions builds the same rows as a rebuild."""
+    baker.make_recipe(negative_transaction_recipe, user=user, amount=10, _quantity=3)
+    rebuild_rollups()
+    rollups = get_rollup_rows(user)
+    MonthlyRollup.objects.all().delete()
+
+    migration = importlib.import_module("analytics.migrations.0004_backfill_rollups")
+    migration.backfill_rollups(apps, None)
+
+    assert get_rollup_rows(user) == rollups
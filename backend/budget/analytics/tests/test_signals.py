@@ -2,59 +2,76 @@ import pytest
 from model_bakery import baker
 from django.core.cache import cache
 
+from analytics.services.cache_utils import get_report_cache_key
+
 
 @pytest.mark.django_db
-def test_invalidate_cache_on_transaction_save(user_recipe: str, transaction_recipe: str):
+def test_invalidate_cache_on_transaction_save(
+    user_recipe: str, transaction_recipe: str, django_capture_on_commit_callbacks
+):
     """Test that cache is invalidated when a transaction is saved."""
     user = baker.make_recipe(user_recipe)
-    transaction = baker.make_recipe(transaction_recipe, user=user)
+    with django_capture_on_commit_callbacks(execute=True):
+        transaction = baker.make_recipe(transaction_recipe, user=user)
 
-    cache_key = f"current_report_{user.id}"
+    cache_key = get_report_cache_key(user.id, "current")
     cache.set(cache_key, {"test": "data"})
     
-    assert cache.get(cache_key) is not None
+    assert cache.get(get_report_cache_key(user.id, "current")) is not None
     
     transaction.amount = 1000
-    transaction.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        transaction.save()
 
-    assert cache.get(cache_key) is None
+    assert get_report_cache_key(user.id, "current") != cache_key
+    assert cache.get(get_report_cache_key(user.id, "current")) is None
 
 
 @pytest.mark.django_db
-def test_invalidate_cache_on_transaction_delete(user_recipe: str, transaction_recipe: str):
+def test_invalidate_cache_on_transaction_delete(
+    user_recipe: str, transaction_recipe: str, django_capture_on_commit_callbacks
+):
     """Test that cache is invalidated when a transaction is deleted."""
     # Setup
     user = baker.make_recipe(user_recipe)
-    transaction = baker.make_recipe(transaction_recipe, user=user)
+    with django_capture_on_commit_callbacks(execute=True):
+        transaction = baker.make_recipe(transaction_recipe, user=user)
     
-    cache_keys = [
-        f"current_report_{user.id}",
-        f"historical_report_{user.id}",
-        f"yearly_report_{user.id}_2024",
-        f"monthly_report_{user.id}_2024_1"
+    reports = [
+        ("current",),
+        ("historical",),
+        ("yearly", 2024),
+        ("monthly", 2024, 1),
+        ("monthly", 2010, 1),
     ]
     
-    for key in cache_keys:
-        cache.set(key, {"test": "data"})
-        assert cache.get(key) is not None
+    for report in reports:
+        cache.set(get_report_cache_key(user.id, *report), {"test": "data"})
+        assert cache.get(get_report_cache_key(user.id, *report)) is not None
     
-    transaction.delete()
+    with django_capture_on_commit_callbacks(execute=True):
+        transaction.delete()
 
-    for key in cache_keys:
-        assert cache.get(key) is None
+    for report in reports:
+        assert cache.get(get_report_cache_key(user.id, *report)) is None
 
 
 @pytest.mark.django_db
-def test_cache_invalidation_different_users(user_recipe: str, transaction_recipe: str):
+def test_cache_invalidation_different_users(
+    user_recipe: str, transaction_recipe: str, django_capture_on_commit_callbacks
+):
     """Test that cache invalidation only affects the correct user."""
     user1 = baker.make_recipe(user_recipe)
     user2 = baker.make_recipe(user_recipe)
-    transaction = baker.make_recipe(transaction_recipe, user=user1)
+    with django_capture_on_commit_callbacks(execute=True):
+        transaction = baker.make_recipe(transaction_recipe, user=user1)
     
-    cache.set(f"current_report_{user1.id}", {"test": "user1"})
-    cache.set(f"current_report_{user2.id}", {"test": "user2"})
+    cache.set(get_report_cache_key(user1.id, "current"), {"test": "user1"})
+    cache.set(get_report_cache_key(user2.id, "current"), {"test": "user2"})
     
-    transaction.save()
+    transaction.amount += 1
+    with django_capture_on_commit_callbacks(execute=True):
+        transaction.save()
 
-    assert cache.get(f"current_report_{user1.id}") is None
-    assert cache.get(f"current_report_{user2.id}") is not None
+    assert cache.get(get_report_cache_key(user1.id, "current")) is None
+    assert cache.get(get_report_cache_key(user2.id, "current")) is not None
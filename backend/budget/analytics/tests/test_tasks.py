@@ -0,0 +1,84 @@
+import pytest
+from model_bakery import baker
+from django.core.cache import cache
+from django.utils import timezone
+from django_q.models import Schedule
+from datetime import timedelta
+
+from accounts.models import User
+from analytics.services.cache_utils import get_report_cache_key
+from tasks import analytics as analytics_tasks
+from tasks.analytics import generate_all_reports
+from tasks.analytics import get_active_user_ids
+from tasks.analytics import warm_up_active_users
+from tasks.analytics import warm_up_users
+
+
+@pytest.mark.django_db
+def test_warm_up_schedule_exists():
+    """Test the migrations register the daily warm-up schedule."""
+    schedule = Schedule.objects.get(name="analytics_warm_up")
+    assert schedule.func == "tasks.analytics.warm_up_active_users"
+    assert schedule.schedule_type == Schedule.DAILY
+
+
+@pytest.mark.django_db
+def test_get_active_user_ids(user_recipe: str, positive_transaction_recipe: str):
+    """Test recently logged in users and users with recent transactions are active, the others are not."""
+    now = timezone.now()
+    logged_in = baker.make_recipe(user_recipe, last_login=now - timedelta(days=1))
+    with_transactions = baker.make_recipe(user_recipe, last_login=None)
+    baker.make_recipe(positive_transaction_recipe, user=with_transactions, date=now - timedelta(days=2))
+    idle = baker.make_recipe(user_recipe, last_login=now - timedelta(days=30))
+    baker.make_recipe(positive_transaction_recipe, user=idle, date=now - timedelta(days=30))
+    baker.make_recipe(user_recipe, last_login=now, is_active=False)
+
+    assert set(get_active_user_ids()) == {logged_in.id, with_transactions.id}
+
+
+@pytest.mark.django_db
+def test_warm_up_active_users_batches(user_recipe: str, settings, monkeypatch):
+    """Test the active users are spread over one task per batch."""
+    enqueued_tasks = []
+    monkeypatch.setattr(analytics_tasks, "async_task", lambda *args, **kwargs: enqueued_tasks.append((args, kwargs)))
+    settings.ANALYTICS_WARM_UP_BATCH_SIZE = 2
+    baker.make_recipe(user_recipe, last_login=timezone.now(), _quantity=5)
+
+    result = warm_up_active_users()
+
+    assert result["users"] == 5
+    assert result["batches"] == 3
+    assert [len(args[1]) for args, _ in enqueued_tasks] == [2, 2, 1]
+    assert all(args[0] == "tasks.analytics.warm_up_users" for args, _ in enqueued_tasks)
+    assert {kwargs["group"] for _, kwargs in enqueued_tasks} == {result["group"]}
+
+
+@pytest.mark.django_db
+def test_warm_up_users_stats(user: User):
+    """Test a warm-up generates the missing reports and counts the fresh ones as hits."""
+    first_run = warm_up_users([user.id])
+    second_run = warm_up_users([user.id])
+
+    assert first_run["reports"] == 4
+    assert first_run["generated"] == 4
+    assert first_run["hit_rate"] == 0
+    assert second_run["hits"] == 4
+    assert second_run["generated"] == 0
+    assert second_run["hit_rate"] == 1
+    assert second_run["duration_seconds"] >= 0
+
+
+@pytest.mark.django_db
+def test_generate_all_reports(user: User):
+    """Test all the requested reports are cached by a single task."""
+    result = generate_all_reports(user.id, [(2025, 1), 2025])
+
+    assert result["status"] == "success"
+    assert set(result["cache_keys"]) == {
+        get_report_cache_key(user.id, "current"),
+        get_report_cache_key(user.id, "historical"),
+        get_report_cache_key(user.id, "monthly", 2025, 1),
+        get_report_cache_key(user.id, "yearly", 2025),
+    }
+    for cache_key in result["cache_keys"]:
+        assert "generated_at" in cache.get(cache_key)
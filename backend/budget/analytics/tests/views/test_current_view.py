@@ -45,3 +45,22 @@ def test_analytics_current_view_unauthorized():
     url = reverse("api:analytics-current-list")
     response = client.get(url)
     assert response.status_code == 401
+
+
+
+@pytest.mark.django_db
+def test_analytics_current_view_stale(user: User, settings, monkeypatch):
+    """Test a report past its soft expiry is returned with a stale marker and shows up as stale in the cache status."""
+    monkeypatch.setattr("analytics.services.cache_utils.async_task", lambda *args: None)
+    settings.ANALYTICS_SOFT_TTL = 0
+    client = APIClient()
+    client.force_authenticate(user=user)
+    url = reverse("api:analytics-current-list")
+
+    assert client.get(url).json()["stale"] is False
+    assert client.get(url).json()["stale"] is True
+
+    status = client.get(reverse("api:analytics-current-cache-status")).json()
+    assert status["is_cached"] is True
+    assert status["soft_expires_at"] is not None
+    assert status["is_stale"] is True
@@ -7,6 +7,9 @@ from rest_framework.response import Response
 
 from analytics.serializers.current import AnalyticsCurrentSerializer
 from analytics.services.cache_utils import get_or_generate_current_report
+from analytics.services.cache_utils import get_report_cache_key
+from analytics.services.cache_utils import is_report_stale
+from core.versions import etag_on_data_version
 
 
 class AnalyticsCurrentViewSet(viewsets.ViewSet):
@@ -14,6 +17,7 @@ class AnalyticsCurrentViewSet(viewsets.ViewSet):
 
     permission_classes = [IsAuthenticated]
 
+    @etag_on_data_version
     def list(self, request):
         """Get complete current analytics summary. First checks cache - if not available, generates and caches it."""
         data = get_or_generate_current_report(request.user)
@@ -24,13 +28,15 @@ class AnalyticsCurrentViewSet(viewsets.ViewSet):
     def cache_status(self, request):
         """Check cache status for the current user's report and returns useful information."""
         user_id = request.user.id
-        cache_key = f"current_report_{user_id}"
+        cache_key = get_report_cache_key(user_id, "current")
         cached_report = cache.get(cache_key)
         is_cached = cached_report is not None
 
         ttl = None
         expires_at = None
         generated_at = None
+        soft_expires_at = None
+        is_stale = False
 
         if is_cached:
             try:
@@ -44,12 +50,19 @@ class AnalyticsCurrentViewSet(viewsets.ViewSet):
             if isinstance(cached_report, dict) and "generated_at" in cached_report:
                 generated_at = cached_report["generated_at"]
 
+            if isinstance(cached_report, dict) and "soft_expires_at" in cached_report:
+                soft_expires_at = cached_report["soft_expires_at"]
+                is_stale = is_report_stale(cached_report)
+
         response_data = {
             "is_cached": is_cached,
             "cache_key": cache_key,
             "ttl_seconds": ttl,
             "expires_at": expires_at,
             "generated_at": generated_at,
+            "soft_expires_at": soft_expires_at,
+            "hard_expires_at": expires_at,
+            "is_stale": is_stale,
         }
 
         return Response(response_data)
@@ -7,6 +7,9 @@ from django.utils import timezone
 
 from analytics.serializers.monthly import AnalyticsMonthlySerializer
 from analytics.services.cache_utils import get_or_generate_monthly_report
+from analytics.services.cache_utils import get_report_cache_key
+from analytics.services.cache_utils import is_report_stale
+from core.versions import etag_on_data_version
 
 
 class AnalyticsMonthlyViewSet(viewsets.ViewSet):
@@ -14,6 +17,7 @@ class AnalyticsMonthlyViewSet(viewsets.ViewSet):
 
     permission_classes = [IsAuthenticated]
 
+    @etag_on_data_version
     def list(self, request):
         """Get analytics summary for the current month and year."""
         current_month = timezone.now().month
@@ -30,13 +34,15 @@ class AnalyticsMonthlyViewSet(viewsets.ViewSet):
         current_month = timezone.now().month
         current_year = timezone.now().year
 
-        cache_key = f"monthly_report_{user_id}_{current_year}_{current_month}"
+        cache_key = get_report_cache_key(user_id, "monthly", current_year, current_month)
         cached_report = cache.get(cache_key)
         is_cached = cached_report is not None
 
         ttl = None
         expires_at = None
         generated_at = None
+        soft_expires_at = None
+        is_stale = False
 
         if is_cached:
             try:
@@ -50,6 +56,10 @@ class AnalyticsMonthlyViewSet(viewsets.ViewSet):
             if isinstance(cached_report, dict) and "generated_at" in cached_report:
                 generated_at = cached_report["generated_at"]
 
+            if isinstance(cached_report, dict) and "soft_expires_at" in cached_report:
+                soft_expires_at = cached_report["soft_expires_at"]
+                is_stale = is_report_stale(cached_report)
+
         response_data = {
             "is_cached": is_cached,
             "cache_key": cache_key,
@@ -58,6 +68,9 @@ class AnalyticsMonthlyViewSet(viewsets.ViewSet):
             "ttl_seconds": ttl,
             "expires_at": expires_at,
             "generated_at": generated_at,
+            "soft_expires_at": soft_expires_at,
+            "hard_expires_at": expires_at,
+            "is_stale": is_stale,
         }
 
         return Response(response_data)
@@ -80,13 +93,15 @@ class AnalyticsMonthlyViewSet(viewsets.ViewSet):
         except ValueError:
             return Response({"error": "Invalid year or month format"}, status=400)
 
-        cache_key = f"monthly_report_{user_id}_{year}_{month}"
+        cache_key = get_report_cache_key(user_id, "monthly", year, month)
         cached_report = cache.get(cache_key)
         is_cached = cached_report is not None
 
         ttl = None
         expires_at = None
         generated_at = None
+        soft_expires_at = None
+        is_stale = False
 
         if is_cached:
             try:
@@ -100,6 +115,10 @@ class AnalyticsMonthlyViewSet(viewsets.ViewSet):
             if isinstance(cached_report, dict) and "generated_at" in cached_report:
                 generated_at = cached_report["generated_at"]
 
+            if isinstance(cached_report, dict) and "soft_expires_at" in cached_report:
+                soft_expires_at = cached_report["soft_expires_at"]
+                is_stale = is_report_stale(cached_report)
+
         response_data = {
             "is_cached": is_cached,
             "cache_key": cache_key,
@@ -108,11 +127,15 @@ class AnalyticsMonthlyViewSet(viewsets.ViewSet):
             "ttl_seconds": ttl,
             "expires_at": expires_at,
             "generated_at": generated_at,
+            "soft_expires_at": soft_expires_at,
+            "hard_expires_at": expires_at,
+            "is_stale": is_stale,
         }
 
         return Response(response_data)
 
     @action(detail=False, methods=['get'], url_path=r'(?P<year>\d{4})-(?P<month>\d{1,2})')
+    @etag_on_data_version
     def custom(self, request, year=None, month=None):
         """Get analytics summary for a specific month and year (YYYY-MM)."""
         try:
@@ -7,6 +7,9 @@ from django.utils import timezone
 
 from analytics.serializers.yearly import AnalyticsYearlySerializer
 from analytics.services.cache_utils import get_or_generate_yearly_report
+from analytics.services.cache_utils import get_report_cache_key
+from analytics.services.cache_utils import is_report_stale
+from core.versions import etag_on_data_version
 
 
 class AnalyticsYearlyViewSet(viewsets.ViewSet):
@@ -14,6 +17,7 @@ class AnalyticsYearlyViewSet(viewsets.ViewSet):
 
     permission_classes = [IsAuthenticated]
 
+    @etag_on_data_version
     def list(self, request):
         """Get complete yearly analytics summary."""
         current_year = timezone.now().year
@@ -34,13 +38,15 @@ class AnalyticsYearlyViewSet(viewsets.ViewSet):
         except ValueError:
             return Response({"error": "Invalid year format"}, status=400)
 
-        cache_key = f"yearly_report_{user_id}_{year}"
+        cache_key = get_report_cache_key(user_id, "yearly", year)
         cached_report = cache.get(cache_key)
         is_cached = cached_report is not None
 
         ttl = None
         expires_at = None
         generated_at = None
+        soft_expires_at = None
+        is_stale = False
 
         if is_cached:
             try:
@@ -54,6 +60,10 @@ class AnalyticsYearlyViewSet(viewsets.ViewSet):
             if isinstance(cached_report, dict) and "generated_at" in cached_report:
                 generated_at = cached_report["generated_at"]
 
+            if isinstance(cached_report, dict) and "soft_expires_at" in cached_report:
+                soft_expires_at = cached_report["soft_expires_at"]
+                is_stale = is_report_stale(cached_report)
+
         response_data = {
             "is_cached": is_cached,
             "cache_key": cache_key,
@@ -61,6 +71,9 @@ class AnalyticsYearlyViewSet(viewsets.ViewSet):
             "ttl_seconds": ttl,
             "expires_at": expires_at,
             "generated_at": generated_at,
+            "soft_expires_at": soft_expires_at,
+            "hard_expires_at": expires_at,
+            "is_stale": is_stale,
         }
 
         return Response(response_data)
@@ -82,13 +95,15 @@ class AnalyticsYearlyViewSet(viewsets.ViewSet):
         except ValueError:
             return Response({"error": "Invalid year format"}, status=400)
 
-        cache_key = f"yearly_report_{user_id}_{year}"
+        cache_key = get_report_cache_key(user_id, "yearly", year)
         cached_report = cache.get(cache_key)
         is_cached = cached_report is not None
 
         ttl = None
         expires_at = None
         generated_at = None
+        soft_expires_at = None
+        is_stale = False
 
         if is_cached:
             try:
@@ -104,6 +119,10 @@ class AnalyticsYearlyViewSet(viewsets.ViewSet):
             if isinstance(cached_report, dict) and "generated_at" in cached_report:
                 generated_at = cached_report["generated_at"]
 
+            if isinstance(cached_report, dict) and "soft_expires_at" in cached_report:
+                soft_expires_at = cached_report["soft_expires_at"]
+                is_stale = is_report_stale(cached_report)
+
         response_data = {
             "is_cached": is_cached,
             "cache_key": cache_key,
@@ -111,11 +130,15 @@ class AnalyticsYearlyViewSet(viewsets.ViewSet):
             "ttl_seconds": ttl,
             "expires_at": expires_at,
             "generated_at": generated_at,
+            "soft_expires_at": soft_expires_at,
+            "hard_expires_at": expires_at,
+            "is_stale": is_stale,
         }
 
         return Response(response_data)
 
     @action(detail=False, methods=['get'], url_path=r'(?P<year>\d{4})')
+    @etag_on_data_version
     def custom(self, request, year=None):
         """Get analytics summary for a specific year (YYYY)."""
         try:
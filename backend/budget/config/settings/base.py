@@ -133,7 +133,17 @@ Q_CLUSTER = {
 }
 
 # Cache base configuration
-CACHE_TTL = 60 * 60  # 1 hour
+CACHE_TTL = 60 * 60 * 24  # 1 day, hard expiry of the cached reports
+
+# Analytics
+ANALYTICS_USE_ROLLUP = env.bool("ANALYTICS_USE_ROLLUP", default=True)  # read reports from analytics.MonthlyRollup
+ANALYTICS_BACKEND = env("ANALYTICS_BACKEND", default="orm")  # "orm" (database group-bys) or "numpy" (in memory, needs numpy)
+ANALYTICS_SOFT_TTL = 60 * 60  # 1 hour, cached reports older than this are served stale and refreshed in the background
+ANALYTICS_LOCK_TIMEOUT = 30  # seconds a report computation may hold its lock
+ANALYTICS_LOCK_WAIT = 5  # seconds a request waits for a report computed by another request
+ANALYTICS_LOCK_POLL_INTERVAL = 0.1  # seconds between two cache checks while waiting
+ANALYTICS_WARM_UP_ACTIVE_DAYS = 7  # users who logged in or recorded transactions within these days get warmed up
+ANALYTICS_WARM_UP_BATCH_SIZE = 50  # users per warm-up task
 
 # Templates
 TEMPLATES = [
@@ -189,6 +199,17 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        'core.renderers.MessagePackRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+        'core.parsers.MessagePackParser',
+    ),
     # 'DEFAULT_THROTTLE_CLASSES': [
     #     'rest_framework.throttling.AnonRateThrottle',
     #     'rest_framework.throttling.UserRateThrottle',
@@ -209,4 +230,5 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
     'USER_ID_FIELD': 'id',
     'USER_ID_CLAIM': 'user_id',
+    'UPDATE_LAST_LOGIN': True,  # last_login selects the users whose reports get warmed up
 }
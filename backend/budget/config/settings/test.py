@@ -23,6 +23,9 @@ DATABASES = {
     }
 }
 
+# The covering indexes INCLUDE columns on PostgreSQL only, SQLite creates them as plain composite indexes
+SILENCED_SYSTEM_CHECKS = ["models.W040"]
+
 # Celery
 CELERY_TASK_ALWAYS_EAGER = True  # Execute tasks synchronously
 CELERY_TASK_EAGER_PROPAGATES = True
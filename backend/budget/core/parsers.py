@@ -0,0 +1,27 @@
+from decimal import Decimal
+
+import msgpack
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from core.renderers import AMOUNT_EXT_TYPE
+from core.renderers import unpack_amount
+
+
+def decode_ext(code, data):
+    """Decode the extensions of the MessagePack renderer: amounts become exact decimals again."""
+    if code == AMOUNT_EXT_TYPE:
+        return Decimal(unpack_amount(data)).scaleb(-2)
+    return msgpack.ExtType(code, data)
+
+
+class MessagePackParser(BaseParser):
+    """Parser of MessagePack request bodies, the counterpart of the MessagePack renderer."""
+
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), ext_hook=decode_ext, raw=False)
+        except ValueError as e:
+            raise ParseError(f"MessagePack parse error - {e}")
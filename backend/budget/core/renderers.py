@@ -0,0 +1,56 @@
+from decimal import Decimal
+
+import msgpack
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Extension type of an amount of at most two decimal places, packed as its integer cents
+AMOUNT_EXT_TYPE = 1
+AMOUNT_SIZES = (1, 2, 4, 8)
+
+
+def pack_amount(amount):
+    """Pack an amount of at most two decimal places as the big endian integer cents of the smallest fixed extension."""
+    if not amount.is_finite():
+        return None
+    numerator, denominator = amount.as_integer_ratio()
+    if 100 % denominator:
+        return None
+    cents = numerator * (100 // denominator)
+    # One bit more than the magnitude for the sign
+    length = cents.bit_length() + 1
+    for size in AMOUNT_SIZES:
+        if length <= size * 8:
+            return msgpack.ExtType(AMOUNT_EXT_TYPE, cents.to_bytes(size, "big", signed=True))
+    return None
+
+
+def unpack_amount(data):
+    """Unpack the integer cents of an amount extension."""
+    return int.from_bytes(data, "big", signed=True)
+
+
+class MessagePackEncoder(JSONEncoder):
+    """Encoder of the values MessagePack has no type for: amounts as extensions, the rest like the JSON renderer."""
+
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            packed = pack_amount(obj)
+            if packed is not None:
+                return packed
+            return str(obj)
+        return super().default(obj)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Renderer of responses as MessagePack, with amounts packed as integer cents."""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=MessagePackEncoder().default, use_bin_type=True)
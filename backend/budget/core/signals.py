@@ -0,0 +1,15 @@
+from django.db.models.signals import post_save
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from core.models import Bucket
+from core.models import Location
+from core.versions import bump_data_version_on_commit
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=Bucket)
+@receiver(post_delete, sender=Bucket)
+def bump_data_version_on_change(sender, instance, **kwargs):
+    """Bump the data version of the owner of a saved or deleted location or bucket."""
+    bump_data_version_on_commit(instance.user_id)
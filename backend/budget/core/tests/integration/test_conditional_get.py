@@ -0,0 +1,79 @@
+import pytest
+from model_bakery import baker
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from analytics.views import current as current_views
+from core.versions import get_data_version
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/locations/",
+        "/api/buckets/",
+        "/api/categories/",
+        "/api/transactions/",
+        "/api/transactions/count/",
+        "/api/analytics-current/",
+        "/api/analytics-monthly/",
+        "/api/analytics-monthly/2025-1/",
+        "/api/analytics-yearly/2025/",
+        "/api/analytics-historical/",
+    ],
+)
+def test_unchanged_data_is_not_modified(url: str, authenticated_apiclient: APIClient, django_assert_num_queries):
+    response = authenticated_apiclient.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"].startswith('"')
+    assert "private" in response["Cache-Control"]
+
+    with django_assert_num_queries(0):
+        not_modified = authenticated_apiclient.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified["ETag"] == response["ETag"]
+    assert not_modified.content == b""
+
+
+@pytest.mark.django_db
+def test_not_modified_skips_the_service_layer(authenticated_apiclient: APIClient, monkeypatch):
+    etag = authenticated_apiclient.get("/api/analytics-current/")["ETag"]
+
+    def fail(user):
+        raise AssertionError("The report should not be read.")
+
+    monkeypatch.setattr(current_views, "get_or_generate_current_report", fail)
+    response = authenticated_apiclient.get("/api/analytics-current/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_changes_are_sent_again_once_committed(
+    authenticated_apiclient: APIClient, user: User, location_recipe: str, django_capture_on_commit_callbacks
+):
+    etag = authenticated_apiclient.get("/api/locations/")["ETag"]
+    version = get_data_version(user.pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        baker.make_recipe(location_recipe, user=user)
+        # Until the commit, requests still validate the previous data
+        assert get_data_version(user.pk) == version
+
+    response = authenticated_apiclient.get("/api/locations/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+    assert len(response.json()) == 1
+
+
+@pytest.mark.django_db
+def test_etags_depend_on_user_and_request(authenticated_apiclient: APIClient, user_recipe: str):
+    etag = authenticated_apiclient.get("/api/transactions/")["ETag"]
+    assert authenticated_apiclient.get("/api/transactions/?page_size=10")["ETag"] != etag
+
+    other_client = APIClient()
+    other_client.force_authenticate(user=baker.make_recipe(user_recipe))
+    response = other_client.get("/api/transactions/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,36 @@
+import msgpack
+import pytest
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from core.models import Location
+from core.parsers import decode_ext
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url",
+    ["/api/analytics-current/", "/api/analytics-monthly/", "/api/analytics-yearly/2025/", "/api/analytics-historical/"],
+)
+def test_reports_are_negotiated_as_msgpack(url: str, authenticated_apiclient: APIClient):
+    """Test the analytics reports are sent as MessagePack to clients accepting it, with the same content as JSON."""
+    expected = authenticated_apiclient.get(url).json()
+    response = authenticated_apiclient.get(url, HTTP_ACCEPT="application/msgpack")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/msgpack"
+    data = msgpack.unpackb(response.content, ext_hook=lambda code, data: float(decode_ext(code, data)))
+    assert data == expected
+
+
+@pytest.mark.django_db
+def test_create_from_msgpack(authenticated_apiclient: APIClient, user: User):
+    """Test a MessagePack request body is parsed."""
+    response = authenticated_apiclient.post(
+        "/api/locations/", msgpack.packb({"name": "Wallet"}), content_type="application/msgpack"
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert Location.available_objects.get(user=user).name == "Wallet"
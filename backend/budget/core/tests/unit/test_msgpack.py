@@ -0,0 +1,45 @@
+import io
+from decimal import Decimal
+
+import msgpack
+import pytest
+from rest_framework.exceptions import ParseError
+
+from core.parsers import MessagePackParser
+from core.renderers import AMOUNT_EXT_TYPE
+from core.renderers import MessagePackRenderer
+
+
+@pytest.mark.parametrize(
+    "amount, size",
+    [
+        (Decimal("0.00"), 1),
+        (Decimal("-1.27"), 1),
+        (Decimal("1.28"), 2),
+        (Decimal("-327.67"), 2),
+        (Decimal("12345.67"), 4),
+        (Decimal("99999999999.99"), 8),
+    ],
+)
+def test_amounts_are_packed_as_cents(amount: Decimal, size: int):
+    """Test two decimal place amounts are packed as integer cents in the smallest fixed extension."""
+    content = MessagePackRenderer().render({"amount": amount})
+    packed = msgpack.unpackb(content)["amount"]
+
+    assert packed.code == AMOUNT_EXT_TYPE
+    assert len(packed.data) == size
+    assert MessagePackParser().parse(io.BytesIO(content)) == {"amount": amount}
+
+
+def test_other_values_are_rendered_like_json():
+    """Test decimals without two decimal places and other non MessagePack values are rendered as strings."""
+    content = MessagePackRenderer().render(
+        {"rate": Decimal("0.125"), "nan": Decimal("NaN"), "values": [1, "a", None, True]}
+    )
+    assert msgpack.unpackb(content) == {"rate": "0.125", "nan": "NaN", "values": [1, "a", None, True]}
+
+
+def test_parse_error():
+    """Test an invalid body raises a ParseError."""
+    with pytest.raises(ParseError):
+        MessagePackParser().parse(io.BytesIO(b"\x92\x01"))
@@ -0,0 +1,89 @@
+import hashlib
+import logging
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control
+
+logger = logging.getLogger(__name__)
+
+
+def get_data_version_key(user_id):
+    return f"data_version_{user_id}"
+
+
+def get_data_version(user_id):
+    """
+    Get the version of everything a user owns, bumped whenever any of it changes.
+    Returns None when the cache is unavailable, so no response is ever validated against a lost version.
+    """
+    version_key = get_data_version_key(user_id)
+    try:
+        version = cache.get(version_key)
+        if version is None:
+            # Start from the current timestamp, so a version key lost to eviction never validates old responses
+            cache.add(version_key, int(time.time()), timeout=None)
+            version = cache.get(version_key)
+        return version
+    except Exception as e:
+        logger.warning(f"Cache get failed for key {version_key}: {e}")
+        return None
+
+
+def bump_data_version(user_id):
+    """Change the data version of a user, so every response validated against the previous one is sent again."""
+    version_key = get_data_version_key(user_id)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        # The key does not exist (yet, or anymore)
+        cache.add(version_key, int(time.time()), timeout=None)
+    except Exception as e:
+        logger.warning(f"Cache incr failed for key {version_key}: {e}")
+
+
+def bump_data_version_on_commit(user_id):
+    """
+    Bump the data version of a user once the current database transaction commits (right away outside one).
+    A bump before the commit would let a concurrent request tag the previous data with the new version.
+    """
+    transaction.on_commit(lambda: bump_data_version(user_id))
+
+
+def get_data_etag(request):
+    """Get the strong ETag of a response to a request, from the data version of its user, or None without a version."""
+    version = get_data_version(request.user.pk)
+    if version is None:
+        return None
+    # The day is part of the tag since some responses follow the date (the reports of the current month or year)
+    parts = (request.user.pk, version, timezone.localdate(), request.get_full_path(), request.accepted_media_type)
+    return '"{}"'.format(hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest())
+
+
+def etag_on_data_version(view_method):
+    """
+    Make a GET view method answer If-None-Match with 304 Not Modified while the data version of the user is unchanged,
+    before any service or serializer runs, and tag its other successful responses with their ETag.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        etag = get_data_etag(request)
+        if etag is not None:
+            # 304 Not Modified (or 412 Precondition Failed for an If-Match) when the preconditions say so
+            response = get_conditional_response(request, etag=etag)
+            if response is not None:
+                response["ETag"] = etag
+                patch_cache_control(response, private=True, no_cache=True)
+                return response
+
+        response = view_method(self, request, *args, **kwargs)
+        if etag is not None and response.status_code == 200:
+            response["ETag"] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    return wrapper
@@ -11,6 +11,7 @@ from core.serializers import BucketSerializer
 from core.serializers import BucketWriteSerializer
 from core.serializers import LocationSerializer
 from core.serializers import LocationWriteSerializer
+from core.versions import etag_on_data_version
 
 from .permissions import IsOwner
 
@@ -37,6 +38,10 @@ class LocationViewSet(
         """Retrieve a custom queryset for locations based on the current user."""
         return Location.available_objects.filter_by_user(self.request.user)
 
+    @etag_on_data_version
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def get_serializer_map(self):
         return {
             "list": LocationSerializer,
@@ -78,6 +83,10 @@ class BucketViewSet(
         """Retrieve a custom queryset for buckets based on the current user."""
         return Bucket.available_objects.filter_by_user(user=self.request.user)
 
+    @etag_on_data_version
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def get_serializer_map(self):
         return {
             "list": BucketSerializer,
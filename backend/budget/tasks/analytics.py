@@ -1,13 +1,22 @@
 # from celery import shared_task
-from django.core.cache import cache
+import logging
+import time
+from datetime import timedelta
+
 from django.conf import settings
+from django.db.models import Q
 from django.utils import timezone
+from django_q.tasks import async_task
 
 from accounts.models import User
-from analytics.services.current import AnalyticsCurrentService
-from analytics.services.monthly import AnalyticsMonthlyService
-from analytics.services.yearly import AnalyticsYearlyService
-from analytics.services.historical import AnalyticsHistoricalService
+from analytics.services.cache_utils import generate_and_cache_reports
+from analytics.services.cache_utils import get_report_cache_key
+from analytics.services.cache_utils import get_user_cache_version
+from analytics.services.cache_utils import is_report_stale
+from analytics.services.cache_utils import refresh_report
+from analytics.services.cache_utils import safe_cache_get_many
+
+logger = logging.getLogger(__name__)
 
 
 # @shared_task
@@ -15,15 +24,15 @@ def generate_current_report(user_id):
     """Generate current analytics report asynchronously and store in cache."""
     try:
         user = User.objects.get(id=user_id)
-        service = AnalyticsCurrentService(user)
-        report_data = service.get_summary()
-        report_data["generated_at"] = timezone.now().isoformat()
-
-        cache_key = f"current_report_{user_id}"
+        cache_key = get_report_cache_key(user_id, "current")
 
-        print(f"Saving report to cache with key: {cache_key}")
-        cache.set(cache_key, report_data, timeout=settings.CACHE_TTL)
-        print(f"Report saved successfully for user {user_id}")
+        if refresh_report(user, "current", cache_key=cache_key) is None:
+            return {
+                "status": "skipped",
+                "message": "Current report is already being generated.",
+                "user_id": user_id,
+                "cache_key": cache_key,
+            }
 
         return {
             "status": "success",
@@ -44,12 +53,17 @@ def generate_monthly_report(user_id, year, month):
     """Generate monthly analytics report asynchronously and store in cache."""
     try:
         user = User.objects.get(id=user_id)
-        service = AnalyticsMonthlyService(user, year, month)
-        report_data = service.get_summary()
-        report_data["generated_at"] = timezone.now().isoformat()
-
-        cache_key = f"monthly_report_{user_id}_{year}_{month}"
-        cache.set(cache_key, report_data, timeout=settings.CACHE_TTL)
+        cache_key = get_report_cache_key(user_id, "monthly", year, month)
+
+        if refresh_report(user, "monthly", year, month, cache_key=cache_key) is None:
+            return {
+                "status": "skipped",
+                "message": "Monthly report is already being generated.",
+                "user_id": user_id,
+                "year": year,
+                "month": month,
+                "cache_key": cache_key,
+            }
 
         return {
             "status": "success",
@@ -74,12 +88,16 @@ def generate_yearly_report(user_id, year):
     """Generate yearly analytics report asynchronously and store in cache."""
     try:
         user = User.objects.get(id=user_id)
-        service = AnalyticsYearlyService(user, year)
-        report_data = service.get_summary()
-        report_data["generated_at"] = timezone.now().isoformat()
+        cache_key = get_report_cache_key(user_id, "yearly", year)
 
-        cache_key = f"yearly_report_{user_id}_{year}"
-        cache.set(cache_key, report_data, timeout=settings.CACHE_TTL)
+        if refresh_report(user, "yearly", year, cache_key=cache_key) is None:
+            return {
+                "status": "skipped",
+                "message": "Yearly report is already being generated.",
+                "user_id": user_id,
+                "year": year,
+                "cache_key": cache_key,
+            }
 
         return {
             "status": "success",
@@ -102,12 +120,15 @@ def generate_historical_report(user_id):
     """Generate historical analytics report asynchronously and store in cache."""
     try:
         user = User.objects.get(id=user_id)
-        service = AnalyticsHistoricalService(user)
-        report_data = service.get_summary()
-        report_data["generated_at"] = timezone.now().isoformat()
+        cache_key = get_report_cache_key(user_id, "historical")
 
-        cache_key = f"historical_report_{user_id}"
-        cache.set(cache_key, report_data, timeout=settings.CACHE_TTL)
+        if refresh_report(user, "historical", cache_key=cache_key) is None:
+            return {
+                "status": "skipped",
+                "message": "Historical report is already being generated.",
+                "user_id": user_id,
+                "cache_key": cache_key,
+            }
 
         return {
             "status": "success",
@@ -121,3 +142,101 @@ def generate_historical_report(user_id):
             "message": f"Error generating historical report: {str(e)}",
             "user_id": user_id,
         }
+
+
+# @shared_task
+def generate_all_reports(user_id, periods=None):
+    """
+    Generate the current and historical reports, plus the monthly and yearly reports of the given periods
+    ((year, month) tuples or years, the current month and year by default), from a single scan of the user's data.
+    """
+    try:
+        user = User.objects.get(id=user_id)
+        if periods is None:
+            now = timezone.now()
+            periods = [(now.year, now.month), now.year]
+
+        cache_keys = generate_and_cache_reports(user, periods)
+
+        return {
+            "status": "success",
+            "message": "All reports generated successfully.",
+            "user_id": user_id,
+            "cache_keys": cache_keys,
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error generating all reports: {str(e)}",
+            "user_id": user_id,
+        }
+
+
+def get_active_user_ids():
+    """Get the users who logged in or recorded transactions recently, most recent logins first."""
+    since = timezone.now() - timedelta(days=settings.ANALYTICS_WARM_UP_ACTIVE_DAYS)
+    users = User.objects.filter(
+        Q(last_login__gte=since) | Q(transactions__date__gte=since, transactions__date__lte=timezone.now()),
+        is_active=True,
+    )
+    return list(users.order_by("-last_login").values_list("id", flat=True).distinct())
+
+
+def warm_up_active_users():
+    """Scheduled task: split the recently active users into batches and warm up their reports on the cluster."""
+    start = time.perf_counter()
+    user_ids = get_active_user_ids()
+    batch_size = settings.ANALYTICS_WARM_UP_BATCH_SIZE
+    group = f"analytics_warm_up_{timezone.now():%Y%m%d%H%M}"
+
+    batches = [user_ids[index:index + batch_size] for index in range(0, len(user_ids), batch_size)]
+    for batch in batches:
+        async_task("tasks.analytics.warm_up_users", batch, group=group)
+
+    logger.info(f"Analytics warm-up {group}: {len(user_ids)} active users in {len(batches)} batches")
+    return {
+        "status": "success",
+        "message": "Analytics warm-up scheduled.",
+        "group": group,
+        "users": len(user_ids),
+        "batches": len(batches),
+        "duration_seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def warm_up_users(user_ids):
+    """
+    Generate the current, current month, current year and historical reports of a batch of users,
+    unless they are already cached and fresh. Returns the timing and hit-rate stats of the batch.
+    """
+    start = time.perf_counter()
+    now = timezone.now()
+    periods = [(now.year, now.month), now.year]
+    reports = (("current",), ("monthly", now.year, now.month), ("yearly", now.year), ("historical",))
+    stats = {"users": len(user_ids), "reports": 0, "hits": 0, "generated": 0, "errors": 0}
+
+    for user_id in user_ids:
+        version = get_user_cache_version(user_id)
+        cache_keys = [get_report_cache_key(user_id, *report, version=version) for report in reports]
+        cached_reports = safe_cache_get_many(cache_keys)
+        hits = sum(
+            1 for cache_key in cache_keys
+            if cache_key in cached_reports and not is_report_stale(cached_reports[cache_key])
+        )
+        stats["reports"] += len(reports)
+        stats["hits"] += hits
+        if hits == len(reports):
+            continue
+
+        # All the reports of the user come out of one scan, so the fresh ones are regenerated along
+        result = generate_all_reports(user_id, periods)
+        if result["status"] == "success":
+            stats["generated"] += len(reports) - hits
+        else:
+            stats["errors"] += len(reports) - hits
+            logger.warning(result["message"])
+
+    stats["hit_rate"] = round(stats["hits"] / stats["reports"], 3) if stats["reports"] else None
+    stats["duration_seconds"] = round(time.perf_counter() - start, 3)
+    logger.info(f"Analytics warm-up batch: {stats}")
+    return {"status": "success", "message": "Analytics reports warmed up.", **stats}
@@ -0,0 +1,23 @@
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+
+class TransactionSearchFilter(filters.SearchFilter):
+    """
+    Search filter for transactions, matching like SearchFilter on every database.
+    On PostgreSQL the match is answered from the trigram index on the description,
+    and results are ranked by their similarity to the search unless an ordering is asked for.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        queryset = super().filter_queryset(request, queryset, view)
+        search_terms = self.get_search_terms(request)
+        if not search_terms or connections[queryset.db].vendor != "postgresql":
+            return queryset
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            return queryset
+
+        rank = TrigramWordSimilarity(" ".join(search_terms), "description")
+        return queryset.annotate(search_rank=rank).order_by("-search_rank", "-date", "-id")
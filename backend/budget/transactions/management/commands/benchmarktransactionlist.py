@@ -0,0 +1,60 @@
+import time
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from analytics.management.commands.benchmarkanalytics import Command as BenchmarkAnalyticsCommand
+from transactions.models import Transaction
+from transactions.serializers import TransactionListSerializer
+from transactions.services.rows import LIST_FIELDS
+from transactions.services.rows import TransactionRowSerializer
+
+
+class Command(BenchmarkAnalyticsCommand):
+    help = """Benchmarks serializing a page of the transaction list with model serializers and with value rows."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=100,
+            help="Number of transactions per page (default 100)",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=20,
+            help="Number of timed runs per mode, the best one is shown (default 20)",
+        )
+
+    def handle(self, *args, **options):
+        page_size = options["page_size"]
+        user = self.get_benchmark_user(page_size)
+        request = Request(APIRequestFactory().get("/api/transactions/"))
+        transactions = Transaction.objects.filter_by_user(user).order_by("-date", "-id")
+
+        modes = {
+            "model serializers": lambda: TransactionListSerializer(
+                list(transactions[:page_size]), many=True, context={"request": request}
+            ).data,
+            "value rows": lambda: TransactionRowSerializer(
+                list(transactions.values(*LIST_FIELDS)[:page_size]), request
+            ).data,
+        }
+
+        self.stdout.write(self.style.NOTICE(f"\nOne page of {page_size} transactions, best of {options['runs']} runs:"))
+        pages = {}
+        for mode, serialize in modes.items():
+            timings = []
+            for _ in range(options["runs"]):
+                start = time.perf_counter()
+                pages[mode] = serialize()
+                timings.append(time.perf_counter() - start)
+            self.stdout.write(f"{mode:>20}: {min(timings) * 1000:.2f} ms")
+
+        if [dict(item) for item in pages["model serializers"]] == pages["value rows"]:
+            self.stdout.write(self.style.SUCCESS("Both modes produce the same page."))
+        else:
+            self.stdout.write(self.style.ERROR("The modes produce different pages."))
+
+        self.delete_benchmark_user(user)
@@ -0,0 +1,66 @@
+import time
+
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from analytics.management.commands.benchmarkanalytics import Command as BenchmarkAnalyticsCommand
+from transactions.models import Transaction
+from transactions.views import TransactionViewSet
+
+SEARCHES = ("coffee", "grocery market", "no such description")
+TRIGRAM_INDEX = "transaction_desc_trgm_idx"
+
+
+class Command(BenchmarkAnalyticsCommand):
+    help = """Benchmarks searching the transaction descriptions through the API and shows the query plans."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1_000_000,
+            help="Number of transactions of the benchmark user (default 1,000,000)",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=5,
+            help="Number of timed runs per search, the best one is shown (default 5)",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the benchmark user and its transactions for the next run",
+        )
+
+    def handle(self, *args, **options):
+        user = self.get_benchmark_user(options["rows"])
+        self.analyze()
+        view = TransactionViewSet.as_view({"get": "list"})
+        factory = APIRequestFactory()
+
+        for search in SEARCHES:
+            timings = []
+            for _ in range(options["runs"]):
+                request = factory.get("/api/transactions/", {"search": search})
+                force_authenticate(request, user=user)
+                start = time.perf_counter()
+                response = view(request)
+                response.render()
+                timings.append(time.perf_counter() - start)
+
+            queryset = Transaction.objects.filter_by_user(user).filter(description__icontains=search)
+            plan = self.explain(queryset)
+            self.stdout.write(self.style.NOTICE(
+                f'\n"{search}": {response.data["count"]} matches, first page best of {options["runs"]} runs'
+                f" {min(timings) * 1000:.1f} ms"
+            ))
+            self.stdout.write(plan)
+            if TRIGRAM_INDEX in plan:
+                self.stdout.write(self.style.SUCCESS("Answered from the trigram index."))
+            else:
+                self.stdout.write(self.style.WARNING("Not answered from the trigram index."))
+
+        if not options["keep"]:
+            self.stdout.write(self.style.NOTICE("\nDeleting benchmark data..."))
+            self.delete_benchmark_user(user)
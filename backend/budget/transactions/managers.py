@@ -1,8 +1,15 @@
+import copy
+from collections import defaultdict
+
+from django.db import transaction as db_transaction
 from django.db.models.manager import Manager
 from model_utils.managers import SoftDeletableManager
 
+from core.models import Bucket
+
 from .queryset import CategoryQuerySet
 from .queryset import TransactionQuerySet
+from .signals import incomes_split
 
 
 class CategoryManager(SoftDeletableManager.from_queryset(CategoryQuerySet)):
@@ -12,4 +19,71 @@ class CategoryManager(SoftDeletableManager.from_queryset(CategoryQuerySet)):
 
 class TransactionManager(Manager.from_queryset(TransactionQuerySet)):
     """Transaction manager."""
-    pass
+
+    # Fields a split transaction copies from its split income (attnames, so comparing them needs no query)
+    SPLIT_FIELDS = ("description", "category_id", "date", "amount", "location_id", "user_id")
+
+    def split_incomes(self, transactions, send_signal=True):
+        """
+        Split positive split_income transactions into one transaction per bucket allocation, all at once.
+        Buckets and existing split transactions are read with one query each, unchanged split transactions are kept,
+        and the rest is written with bulk_create, bulk_update and a queryset delete in one atomic block.
+        The split incomes keep their row with a zero amount.
+        Returns the number of created, updated and deleted split transactions.
+        """
+        parents = [
+            transaction for transaction in transactions
+            if transaction.split_income and transaction.category.sign == transaction.category.Sign.POSITIVE
+        ]
+        if not parents:
+            return {"created": 0, "updated": 0, "deleted": 0}
+
+        buckets = defaultdict(list)
+        for bucket in Bucket.available_objects.filter(
+            user__in={parent.user_id for parent in parents}, allocation_percentage__gt=0
+        ).order_by("name"):
+            buckets[bucket.user_id].append(bucket)
+
+        existing = defaultdict(list)
+        for child in self.filter(parent_transaction__in=parents).select_related("category"):
+            existing[(child.parent_transaction_id, child.bucket_id)].append(child)
+
+        to_create, to_update, previous, to_delete = [], [], [], []
+        for parent in parents:
+            for child in parent.build_split_transactions(buckets[parent.user_id]):
+                current = existing.pop((parent.pk, child.bucket_id), [])
+                if not current:
+                    to_create.append(child)
+                    continue
+
+                reused = current[0]
+                to_delete.extend(current[1:])
+                if any(getattr(reused, field) != getattr(child, field) for field in self.SPLIT_FIELDS):
+                    previous.append(copy.copy(reused))
+                    for field in self.SPLIT_FIELDS:
+                        setattr(reused, field, getattr(child, field))
+                    reused.category = child.category
+                    to_update.append(reused)
+        # Split transactions of buckets that lost their allocation
+        for children in existing.values():
+            to_delete.extend(children)
+
+        with db_transaction.atomic():
+            self.bulk_create(to_create)
+            self.bulk_update(to_update, fields=self.SPLIT_FIELDS)
+            if to_delete:
+                # A regular delete, whose model signals keep the analytics of the deleted split transactions
+                self.filter(pk__in=[child.pk for child in to_delete]).delete()
+            # Written from copies, so the given transactions keep the amount they were split with
+            self.bulk_update(
+                [
+                    self.model(pk=parent.pk, amount=0, description=f"{parent.description} ({parent.amount})")
+                    for parent in parents
+                ],
+                fields=("amount", "description"),
+            )
+
+            if send_signal:
+                incomes_split.send(sender=self.model, removed=previous, added=to_create + to_update)
+
+        return {"created": len(to_create), "updated": len(to_update), "deleted": len(to_delete)}
@@ -0,0 +1,34 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.indexes import OpClass
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+from django.db.models.functions import Upper
+
+# Trigram index for the description search, on the UPPER() the icontains lookup compares.
+# PostgreSQL only, so it is not part of the model state: other databases would have to create it
+# whenever they remake the table.
+INDEX = GinIndex(OpClass(Upper("description"), name="gin_trgm_ops"), name="transaction_desc_trgm_idx")
+
+
+def add_index(apps, schema_editor):
+    """Create the trigram index on PostgreSQL, the only database with pg_trgm."""
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.add_index(apps.get_model("transactions", "Transaction"), INDEX)
+
+
+def remove_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.remove_index(apps.get_model("transactions", "Transaction"), INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0003_transaction_covering_indexes'),
+    ]
+
+    operations = [
+        # A no-op on databases other than PostgreSQL
+        TrigramExtension(),
+        migrations.RunPython(add_index, remove_index),
+    ]
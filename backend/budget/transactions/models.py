@@ -168,38 +168,27 @@ class Transaction(UUIDModel):
         """Return all information about the transaction"""
         return f"{self.date}, {self.category.name}, {truncate(str(self.description), 10)}, {self.location}, {self.bucket}"
 
+    def build_split_transactions(self, buckets):
+        """Build (unsaved) the transactions a split income is divided into, one per bucket with an allocation."""
+        return [
+            Transaction(
+                user_id=self.user_id,
+                description=f"{self.description} ({bucket.allocation_percentage}%)",
+                category=self.category,
+                date=self.date,
+                amount=(self.amount * bucket.allocation_percentage / Decimal("100")).quantize(Decimal(".01")),
+                location_id=self.location_id,
+                bucket=bucket,
+                parent_transaction=self,
+                split_income=False,
+            )
+            for bucket in buckets
+            if bucket.allocation_percentage > 0
+        ]
+
     def _split_income(self):
         """Split income into multiple transactions based on bucket allocations."""
-        Transaction.objects.filter(parent_transaction=self).delete()
-
-        buckets = Bucket.available_objects.filter(user=self.user)
-
-        for bucket in buckets:
-            if bucket.allocation_percentage > 0:
-                split_amount = (
-                    self.amount *
-                    bucket.allocation_percentage /
-                    Decimal("100")
-                ).quantize(Decimal(".01"))
-
-                Transaction.objects.create(
-                    user=self.user,
-                    description=f"{self.description} ({bucket.allocation_percentage}%)",
-                    category=self.category,
-                    date=self.date,
-                    amount=split_amount,
-                    location=self.location,
-                    bucket=bucket,
-                    parent_transaction=self,
-                    split_income=False,
-                )
-
-        Transaction.objects.filter(
-            pk=self.pk
-        ).update(
-            amount=0,
-            description=f"{self.description} ({self.amount})",
-        )
+        Transaction.objects.split_incomes([self])
 
     def validate_user(self):
         """Validate that the user is selected."""
@@ -244,8 +233,24 @@ class Transaction(UUIDModel):
         verbose_name_plural = "Transactions"
         ordering = ("-date",)
         indexes = [
-            models.Index(fields=["user", "date"], name="transaction_user_date_idx"),
             models.Index(fields=["category"], name="transaction_category_idx"),
             models.Index(fields=["location"], name="transaction_location_idx"),
             models.Index(fields=["bucket"], name="transaction_bucket_idx"),
+            # Covering indexes for the analytics reports, so their scans can be answered from the index alone.
+            # INCLUDE is PostgreSQL only, other databases create them as plain composite indexes.
+            models.Index(
+                fields=["user", "date"],
+                include=["category", "amount"],
+                name="transaction_user_date_cov_idx",
+            ),
+            models.Index(
+                fields=["user", "location", "bucket"],
+                include=["category", "amount"],
+                name="transaction_user_loc_cov_idx",
+            ),
+            models.Index(
+                fields=["user", "bucket"],
+                include=["category", "amount"],
+                name="transaction_user_bkt_cov_idx",
+            ),
         ]
@@ -0,0 +1,141 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class StandardResultsSetPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class TransactionCursorPagination(BasePagination):
+    """
+    Keyset pagination of transactions, newest first, on their (date, id) position.
+    Pages are read with a range condition on the (user, date) index instead of an OFFSET, and without a COUNT.
+    Rows inserted meanwhile never shift the pages being walked, so no transaction is skipped or repeated.
+    """
+    cursor_query_param = "cursor"
+    page_size = StandardResultsSetPagination.page_size
+    page_size_query_param = StandardResultsSetPagination.page_size_query_param
+    max_page_size = StandardResultsSetPagination.max_page_size
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        if reverse:
+            queryset = queryset.order_by("date", "id")
+            if position is not None:
+                queryset = queryset.filter(Q(date__gt=position[0]) | Q(date=position[0], id__gt=position[1]))
+        else:
+            queryset = queryset.order_by("-date", "-id")
+            if position is not None:
+                queryset = queryset.filter(Q(date__lt=position[0]) | Q(date=position[0], id__lt=position[1]))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        # Walking back from a page always leads to a next page, walking forward always to a previous one
+        first = self.get_position(results[0]) if results else position
+        last = self.get_position(results[-1]) if results else position
+        self.next_position = last if (has_more if not reverse else last is not None) else None
+        self.previous_position = first if (has_more if reverse else position is not None) else None
+        return results
+
+    @staticmethod
+    def get_position(item):
+        """Get the (date, id) position of a transaction, or of a row of its values."""
+        if isinstance(item, dict):
+            return item["date"], item["id"]
+        return item.date, item.id
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def decode_cursor(self, request):
+        """Get the (date, id) position and the direction of the requested cursor, or (None, False) for the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            date = datetime.fromisoformat(data["d"])
+            position = (date if timezone.is_aware(date) else timezone.make_aware(date), uuid.UUID(data["id"]))
+            return position, bool(data.get("r"))
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position, reverse=False):
+        """Get the URL of the page after (or before, when reverse) a (date, id) position."""
+        data = {"d": position[0].isoformat(), "id": str(position[1])}
+        if reverse:
+            data["r"] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
@@ -143,3 +143,87 @@ class TransactionWriteSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(errors)
 
         return data
+
+
+class TransactionImportSerializer(serializers.Serializer):
+    """Serializer used for bulk import operations"""
+    file = serializers.FileField()
+    format = serializers.ChoiceField(
+        choices=("csv", "ofx"),
+        required=False,
+        help_text="File format, guessed from the file extension if omitted.",
+    )
+    location = serializers.SlugRelatedField(
+        slug_field="name",
+        queryset=Location.available_objects.all(),
+        required=False,
+        help_text="Location of the rows without one.",
+    )
+    bucket = serializers.SlugRelatedField(
+        slug_field="name",
+        queryset=Bucket.available_objects.all(),
+        required=False,
+        help_text="Bucket of the rows without one.",
+    )
+    income_category = serializers.SlugRelatedField(
+        slug_field="name",
+        queryset=Category.available_objects.all(),
+        required=False,
+        help_text="Category of the rows without one and with a positive amount.",
+    )
+    expense_category = serializers.SlugRelatedField(
+        slug_field="name",
+        queryset=Category.available_objects.all(),
+        required=False,
+        help_text="Category of the rows without one and with a negative amount.",
+    )
+
+    def __init__(self, *args, **kwargs):
+        """Override get_queryset to filter the default categories, location and bucket by user."""
+        super().__init__(*args, **kwargs)
+
+        if "request" in self.context:
+            user = self.context["request"].user
+            for field in ("location", "bucket", "income_category", "expense_category"):
+                self.fields[field].queryset = self.fields[field].queryset.filter_by_user(user)
+
+    def validate(self, data):
+        """Guess the file format from the file extension when it is not given."""
+        if "format" not in data:
+            extension = data["file"].name.rsplit(".", 1)[-1].lower()
+            if extension == "csv":
+                data["format"] = "csv"
+            elif extension in ("ofx", "qfx"):
+                data["format"] = "ofx"
+            else:
+                raise serializers.ValidationError({"format": "Could not guess the file format, please specify it."})
+        return data
+
+
+class TransactionBulkUpdateSerializer(serializers.ModelSerializer):
+    """Serializer used for one partial update of a bulk operation, related objects being given by id"""
+    id = serializers.UUIDField()
+    category = serializers.UUIDField(required=False)
+    location = serializers.UUIDField(required=False)
+    bucket = serializers.UUIDField(required=False)
+
+    class Meta:
+        model = Transaction
+        fields = ("id", "description", "category", "date", "amount", "location", "bucket")
+        extra_kwargs = {
+            "description": {"required": False},
+            "date": {"required": False},
+            "amount": {"required": False},
+        }
+
+
+class TransactionBulkSerializer(serializers.Serializer):
+    """Serializer used for bulk update and delete operations"""
+    update = TransactionBulkUpdateSerializer(many=True, required=False)
+    delete = serializers.ListField(child=serializers.UUIDField(), required=False)
+
+    def validate(self, data):
+        """Validate at least one transaction is changed."""
+        if not data.get("update") and not data.get("delete"):
+            raise serializers.ValidationError("Nothing to update or delete.")
+        return data
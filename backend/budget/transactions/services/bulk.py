@@ -0,0 +1,153 @@
+import re
+from decimal import Decimal
+
+from django.db import transaction as db_transaction
+from django.db.models import Sum
+
+from analytics.services.invalidation import schedule_invalidation
+from analytics.services.rollup import apply_rollup_changes
+from analytics.services.rollup import get_rollup_entry
+from core.models import Bucket
+from core.models import Location
+from core.versions import bump_data_version_on_commit
+from transactions.models import Category
+from transactions.models import Transaction
+
+RELATED_FIELDS = {
+    "category": Category,
+    "location": Location,
+    "bucket": Bucket,
+}
+# A split income keeps a zero amount and the amount it was split with at the end of its description
+SPLIT_DESCRIPTION = re.compile(r"^(?P<description>.*) \((?P<amount>\d+(?:\.\d+)?)\)$", re.DOTALL)
+
+
+def is_split_income(transaction):
+    """Check if a transaction is a split income, whose amount is held by its split transactions."""
+    return transaction.split_income and transaction.category.sign == Category.Sign.POSITIVE
+
+
+def get_split_source(transaction):
+    """Get the description and the amount a split income was split with."""
+    match = SPLIT_DESCRIPTION.match(transaction.description)
+    if match is not None:
+        return match["description"], Decimal(match["amount"])
+    total = transaction.split_transactions.aggregate(total=Sum("amount"))["total"]
+    return transaction.description, total or Decimal("0")
+
+
+class TransactionBulkError(Exception):
+    """Raised when a bulk request is rejected, holding the errors of every rejected transaction."""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} transactions could not be changed.")
+        self.errors = errors
+
+
+class TransactionBulkEditor:
+    """
+    Apply a list of partial updates and a list of deletions to a user's transactions at once.
+    Everything is validated together against in-memory maps, then applied with one bulk_update and
+    one queryset delete inside a database transaction. Updated split incomes are split again, like a save does,
+    the rollups are moved from the previous to the current version of the updated transactions at once,
+    and the cache is invalidated once. Any invalid entry rejects the whole request.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.related = {
+            field: {obj.pk: obj for obj in model.available_objects.filter(user=user)}
+            for field, model in RELATED_FIELDS.items()
+        }
+
+    def apply(self, updates, delete_ids):
+        """Apply validated updates (dicts holding an id) and deletions, returning the number of changed transactions."""
+        delete_ids = list(dict.fromkeys(delete_ids))
+        transactions = Transaction.objects.filter(
+            user=self.user, pk__in=[update["id"] for update in updates] + list(delete_ids)
+        ).select_related("category", "location", "bucket").in_bulk()
+
+        errors = []
+        changed_fields = set()
+        updated = []
+        previous_entries = []
+        split_incomes = []
+        for update in updates:
+            transaction = transactions.get(update["id"])
+            if transaction is None:
+                errors.append({"id": str(update["id"]), "errors": {"id": "Transaction not found."}})
+                continue
+
+            previous_entry = get_rollup_entry(transaction)
+            split_source = get_split_source(transaction) if is_split_income(transaction) else None
+            row_errors = self.update_transaction(transaction, update)
+            if row_errors:
+                errors.append({"id": str(update["id"]), "errors": row_errors})
+                continue
+            changed_fields.update(field for field in update if field != "id")
+            updated.append(transaction)
+            previous_entries.append(previous_entry)
+
+            if split_source is not None:
+                # Split again from what it was split with, unless the update changes it
+                description, amount = split_source
+                transaction.description = update.get("description", description)
+                transaction.amount = update.get("amount", amount)
+                split_incomes.append(transaction)
+
+        for transaction_id in delete_ids:
+            if transaction_id not in transactions:
+                errors.append({"id": str(transaction_id), "errors": {"id": "Transaction not found."}})
+
+        if errors:
+            raise TransactionBulkError(errors)
+
+        with db_transaction.atomic():
+            # Scheduled first, so the deletes below do not patch the cached reports one transaction at a time
+            if updated or delete_ids:
+                schedule_invalidation(self.user)
+                bump_data_version_on_commit(self.user.pk)
+
+            if updated and changed_fields:
+                Transaction.objects.bulk_update(updated, fields=sorted(changed_fields), batch_size=1000)
+                # Their split transactions follow, their analytics being kept by the incomes_split signal
+                Transaction.objects.split_incomes(split_incomes)
+                # bulk_update sends no signals, so the rollups are moved for all the updated transactions at once
+                apply_rollup_changes(previous_entries, [get_rollup_entry(transaction) for transaction in updated])
+
+            deleted = 0
+            if delete_ids:
+                deleted = len(delete_ids)
+                # Split transactions included through the CASCADE, their model signals keep the rollups
+                Transaction.objects.filter(pk__in=delete_ids, user=self.user).delete()
+        return {"updated": len(updated), "deleted": deleted}
+
+    def update_transaction(self, transaction, update):
+        """Set the fields of an update on a transaction, returning the errors found (if any)."""
+        errors = {}
+        for field, value in update.items():
+            if field == "id":
+                continue
+            if field in RELATED_FIELDS:
+                value = self.related[field].get(value)
+                if value is None:
+                    errors[field] = f"Invalid pk - {field} does not exist."
+                    continue
+            setattr(transaction, field, value)
+
+        if not errors:
+            errors.update(self.validate_rules(transaction))
+        return errors
+
+    @staticmethod
+    def validate_rules(transaction):
+        """Apply the bucket rules of `TransactionWriteSerializer.validate` to an updated transaction."""
+        errors = {}
+        sign = transaction.category.sign if transaction.category else None
+        if sign == Category.Sign.POSITIVE and not transaction.split_income and not transaction.bucket:
+            errors["bucket"] = "Bucket is required on positive non-split transactions."
+        if sign == Category.Sign.NEGATIVE and not transaction.bucket:
+            errors["bucket"] = "Bucket is required on negative transactions."
+        if sign != Category.Sign.POSITIVE and transaction.split_income:
+            errors["split_income"] = "Cannot split negative or neutral transactions."
+        return errors
@@ -0,0 +1,51 @@
+import csv
+import json
+
+from .rows import LIST_FIELDS
+from .rows import build_list_item
+from .rows import format_date
+
+CSV_COLUMNS = ("id", "date", "description", "amount", "category", "sign", "location", "bucket", "split_income")
+CHUNK_SIZE = 2000
+
+
+def iter_export_rows(queryset, chunk_size=CHUNK_SIZE):
+    """Yield the transactions of a queryset as plain dicts, newest first, read from the database chunk by chunk."""
+    return queryset.order_by("-date", "-id").values(*LIST_FIELDS).iterator(chunk_size=chunk_size)
+
+
+class Echo:
+    """File-like object whose write returns the value written, so the csv writer can feed a generator."""
+
+    def write(self, value):
+        return value
+
+
+def render_ndjson(rows):
+    """Yield one JSON line per transaction, shaped like the transaction list items."""
+    for row in rows:
+        yield json.dumps(build_list_item(row)) + "\n"
+
+
+def render_csv(rows):
+    """Yield a CSV header then one line per transaction, with the columns the CSV import reads."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for row in rows:
+        yield writer.writerow((
+            row["id"],
+            format_date(row["date"]),
+            row["description"],
+            row["amount"],
+            row["category__name"] or "",
+            row["category__sign"] or "",
+            row["location__name"] or "",
+            row["bucket__name"] or "",
+            "true" if row["split_income"] else "false",
+        ))
+
+
+RENDERERS = {
+    "ndjson": ("application/x-ndjson", render_ndjson),
+    "csv": ("text/csv", render_csv),
+}
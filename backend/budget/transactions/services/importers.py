@@ -0,0 +1,299 @@
+import codecs
+import csv
+import html
+import re
+from contextlib import contextmanager
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from decimal import InvalidOperation
+from itertools import islice
+
+from django.db import transaction as db_transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.dateparse import parse_datetime
+
+from analytics.services.invalidation import schedule_invalidation
+from analytics.services.rollup import apply_rollup_changes
+from analytics.services.rollup import get_rollup_entry
+from core.models import Bucket
+from core.models import Location
+from core.versions import bump_data_version_on_commit
+from transactions.models import Category
+from transactions.models import Transaction
+
+CSV_REQUIRED_COLUMNS = ("date", "description", "amount")
+OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+OFX_DATE = re.compile(r"^(\d{8})(\d{6})?(?:\.\d+)?(?:\[([+-]?\d+(?:\.\d+)?)(?::\w+)?\])?$")
+TRUE_VALUES = {"1", "true", "yes", "y"}
+MAX_AMOUNT = Decimal("100000000")
+
+
+class TransactionImportError(Exception):
+    """Raised when an import is rejected, holding the errors of every rejected row."""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} rows could not be imported.")
+        self.errors = errors
+
+
+class RowErrors(Exception):
+    """Raised when a row cannot be imported, holding its errors by field."""
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def read_csv_rows(upload):
+    """
+    Yield (line number, row) pairs from a CSV upload, read line by line.
+    Expects date, description and amount columns, plus optional category, location, bucket and split_income ones.
+    """
+    reader = csv.DictReader(codecs.iterdecode(upload, "utf-8-sig"))
+    with reject_unreadable_csv(reader):
+        fieldnames = reader.fieldnames
+    columns = {(name or "").strip().lower() for name in fieldnames or ()}
+    missing = [column for column in CSV_REQUIRED_COLUMNS if column not in columns]
+    if missing:
+        raise TransactionImportError([{"row": 1, "errors": {"file": f"Missing columns: {', '.join(missing)}."}}])
+
+    with reject_unreadable_csv(reader):
+        for row in reader:
+            yield reader.line_num, {(name or "").strip().lower(): (value or "").strip() for name, value in row.items()}
+
+
+@contextmanager
+def reject_unreadable_csv(reader):
+    """Reject a CSV upload which is not UTF-8 text or not valid CSV, at the line it could not be read from."""
+    try:
+        yield
+    except UnicodeDecodeError:
+        raise TransactionImportError(
+            [{"row": reader.line_num + 1, "errors": {"file": "The file must be encoded in UTF-8."}}]
+        )
+    except csv.Error as e:
+        raise TransactionImportError([{"row": reader.line_num, "errors": {"file": f"Invalid CSV: {e}."}}])
+
+
+def read_ofx_rows(upload):
+    """Yield (line number, row) pairs from the STMTTRN entries of an OFX statement (SGML or XML), read line by line."""
+    entry = None
+    start_line = None
+    for line_number, line in enumerate(codecs.iterdecode(upload, "utf-8", errors="replace"), start=1):
+        for closing, tag, value in OFX_TAG.findall(line):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if not closing:
+                    entry, start_line = {}, line_number
+                elif entry is not None:
+                    yield start_line, {
+                        "date": entry.get("DTPOSTED", ""),
+                        "description": entry.get("NAME") or entry.get("MEMO", ""),
+                        "amount": entry.get("TRNAMT", ""),
+                    }
+                    entry = None
+            elif entry is not None and not closing:
+                entry[tag] = html.unescape(value.strip())
+
+
+READERS = {
+    "csv": read_csv_rows,
+    "ofx": read_ofx_rows,
+}
+
+
+def parse_amount(value):
+    """Parse an amount with at most two decimal places, as the transactions store it."""
+    try:
+        amount = Decimal(value) if value else None
+    except InvalidOperation:
+        amount = None
+    if amount is None or not amount.is_finite():
+        raise ValueError("Enter a valid amount.")
+    if amount != amount.quantize(Decimal(".01")):
+        raise ValueError("Ensure that there are no more than 2 decimal places.")
+    if abs(amount) >= MAX_AMOUNT:
+        raise ValueError("Ensure that there are no more than 10 digits in total.")
+    return amount.quantize(Decimal(".01"))
+
+
+def parse_date_value(value):
+    """Parse an ISO 8601 date or datetime, or an OFX one, into an aware datetime."""
+    match = OFX_DATE.match(value)
+    if match:
+        day, clock, offset = match.groups()
+        parsed = datetime.strptime(day + (clock or "000000"), "%Y%m%d%H%M%S")
+        if offset is not None:
+            return parsed.replace(tzinfo=dt_timezone(timedelta(hours=float(offset))))
+    else:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                raise ValueError("Enter a valid date (YYYY-MM-DD or an ISO 8601 date and time).")
+            parsed = datetime.combine(day, time())
+
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class TransactionImporter:
+    """
+    Import the transactions of a CSV or OFX upload for a user.
+    Category, location and bucket names are resolved from in-memory maps, rows are validated and inserted
+    in batches with bulk_create inside one database transaction, and the analytics rollups and cache are
+    updated once at the end, from the imported transactions. Any invalid row rejects the whole import.
+    """
+    BATCH_SIZE = 1000
+    MAX_ERRORS = 100
+
+    def __init__(self, user, location=None, bucket=None, income_category=None, expense_category=None):
+        self.user = user
+        self.categories = {category.name: category for category in Category.available_objects.filter(user=user)}
+        self.locations = {location.name: location for location in Location.available_objects.filter(user=user)}
+        self.buckets = {bucket.name: bucket for bucket in Bucket.available_objects.filter(user=user)}
+        self.is_allocation_complete = sum(bucket.allocation_percentage for bucket in self.buckets.values()) == 100
+        self.default_location = location
+        self.default_bucket = bucket
+        self.income_category = income_category
+        self.expense_category = expense_category
+        self.errors = []
+
+    def import_file(self, upload, file_format):
+        """Import an uploaded file, returning the number of imported and split transactions."""
+        return self.import_rows(READERS[file_format](upload))
+
+    def import_rows(self, rows):
+        """Import (line number, row) pairs, returning the number of imported and split transactions."""
+        rows = iter(rows)
+        stats = {"created": 0, "split": 0}
+        entries = []
+
+        with db_transaction.atomic():
+            while len(self.errors) < self.MAX_ERRORS:
+                batch = list(islice(rows, self.BATCH_SIZE))
+                if not batch:
+                    break
+
+                transactions = self.build_batch(batch)
+                if self.errors:
+                    # Keep validating to report as many errors as possible, nothing will be saved anyway
+                    continue
+
+                Transaction.objects.bulk_create(transactions)
+                split_stats = Transaction.objects.split_incomes(transactions, send_signal=False)
+                stats["created"] += len(transactions)
+                stats["split"] += split_stats["created"]
+
+                entries.extend(get_rollup_entry(transaction) for transaction in transactions)
+                if split_stats["created"]:
+                    split_transactions = Transaction.objects.filter(
+                        parent_transaction__in=[transaction for transaction in transactions if transaction.split_income]
+                    ).select_related("category")
+                    entries.extend(get_rollup_entry(transaction) for transaction in split_transactions)
+
+            if self.errors:
+                raise TransactionImportError(self.errors[:self.MAX_ERRORS])
+
+            # Bulk writes send no signals, so the rollups are updated at once, the cache invalidated and the data version bumped once on commit
+            if stats["created"]:
+                apply_rollup_changes([], entries)
+                schedule_invalidation(self.user)
+                bump_data_version_on_commit(self.user.pk)
+        return stats
+
+    def build_batch(self, batch):
+        """Validate a batch of rows, returning their transactions."""
+        transactions = []
+        for line_number, row in batch:
+            try:
+                transactions.append(self.build_transaction(row))
+            except RowErrors as e:
+                self.errors.append({"row": line_number, "errors": e.errors})
+
+        return transactions
+
+    def build_transaction(self, row):
+        """Build an unsaved transaction from a row, raising RowErrors with every problem found."""
+        errors = {}
+
+        description = row.get("description", "")
+        if not description:
+            errors["description"] = "This field may not be blank."
+        elif len(description) > 255:
+            errors["description"] = "Ensure this field has no more than 255 characters."
+
+        amount = None
+        try:
+            amount = parse_amount(row.get("amount", ""))
+        except ValueError as e:
+            errors["amount"] = str(e)
+
+        date = None
+        try:
+            date = parse_date_value(row.get("date", ""))
+        except ValueError as e:
+            errors["date"] = str(e)
+
+        category = self.resolve(row, "category", self.categories, self.get_default_category(amount), errors)
+        location = self.resolve(row, "location", self.locations, self.default_location, errors)
+        bucket = self.resolve(row, "bucket", self.buckets, self.default_bucket, errors, required=False)
+        split_income = row.get("split_income", "").lower() in TRUE_VALUES
+
+        if category is not None:
+            errors.update(self.validate_rules(category, bucket, split_income))
+
+        if errors:
+            raise RowErrors(errors)
+
+        return Transaction(
+            user=self.user,
+            description=description,
+            category=category,
+            date=date,
+            # The sign of a transaction comes from its category, bank statements sign their debits instead
+            amount=abs(amount),
+            location=location,
+            bucket=bucket,
+            split_income=split_income,
+        )
+
+    def get_default_category(self, amount):
+        """Get the category of rows without one, picked by the sign of their amount."""
+        if amount is None:
+            return None
+        return self.expense_category if amount < 0 else self.income_category
+
+    @staticmethod
+    def resolve(row, field, objects, default, errors, required=True):
+        """Resolve the name of a row field through its map, falling back to the default."""
+        name = row.get(field, "")
+        if name:
+            if name not in objects:
+                errors[field] = f"Unknown {field} '{name}'."
+                return None
+            return objects[name]
+
+        if default is None and required:
+            errors[field] = "This field is required."
+        return default
+
+    def validate_rules(self, category, bucket, split_income):
+        """Apply the rules of `TransactionWriteSerializer.validate`, without a query per row."""
+        errors = {}
+        if category.sign == Category.Sign.POSITIVE and not split_income and not bucket:
+            errors["bucket"] = "Bucket is required on positive non-split transactions."
+        if category.sign == Category.Sign.NEGATIVE and not bucket:
+            errors["bucket"] = "Bucket is required on negative transactions."
+
+        if category.sign == Category.Sign.POSITIVE:
+            if split_income and not self.is_allocation_complete:
+                errors["split_income"] = "Cannot split income until bucket allocations sum to 100%."
+        elif split_income:
+            errors["split_income"] = "Cannot split negative or neutral transactions."
+        return errors
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_save
+from django.db.models.signals import post_delete
+from django.dispatch import Signal
+from django.dispatch import receiver
+
+from core.versions import bump_data_version_on_commit
+
+# Sent by `TransactionManager.split_incomes` once split transactions were written in bulk (no model signals fire),
+# with the split transactions it changed (as they were) and the ones it added or changed (as they are).
+# The split transactions it deletes go through a regular delete, so their own model signals are sent.
+incomes_split = Signal()
+
+# Senders are given by label, since the models import this module through their managers
+@receiver(post_save, sender="transactions.Category")
+@receiver(post_delete, sender="transactions.Category")
+@receiver(post_save, sender="transactions.Transaction")
+@receiver(post_delete, sender="transactions.Transaction")
+def bump_data_version_on_change(sender, instance, **kwargs):
+    """Bump the data version of the owner of a saved or deleted category or transaction."""
+    bump_data_version_on_commit(instance.user_id)
+
+@receiver(incomes_split)
+def bump_data_version_on_incomes_split(sender, removed, added, **kwargs):
+    """Bump the data version of the owners of split transactions written in bulk."""
+    for user_id in {transaction.user_id for transaction in [*removed, *added]}:
+        bump_data_version_on_commit(user_id)
@@ -0,0 +1,227 @@
+import pytest
+from datetime import datetime
+from datetime import timezone
+from decimal import Decimal
+
+from model_bakery import baker
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from analytics.models import MonthlyRollup
+from analytics.services.cache_utils import get_user_cache_version
+from analytics.services.rollup import rebuild_rollups
+from transactions.models import Transaction
+
+
+@pytest.fixture
+def bulk_transactions(
+    user: User,
+    negative_transaction_recipe,
+    location_recipe,
+    bucket_recipe,
+    django_capture_on_commit_callbacks,
+):
+    """Fixture for creating the transactions of a bulk request, with their invalidations committed."""
+    with django_capture_on_commit_callbacks(execute=True):
+        location = baker.make_recipe(location_recipe, user=user, name="Location")
+        bucket = baker.make_recipe(bucket_recipe, user=user, name="Bucket", allocation_percentage=0)
+        transactions = baker.make_recipe(
+            negative_transaction_recipe, user=user, location=location, bucket=bucket, amount=10, _quantity=4
+        )
+    rebuild_rollups(users=[user])
+    return transactions
+
+
+@pytest.mark.django_db
+def test_bulk_requires_authentication(apiclient: APIClient):
+    response = apiclient.post("/api/transactions/bulk/", {"delete": []}, format="json")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_bulk_update_and_delete(
+    authenticated_apiclient: APIClient,
+    user: User,
+    bulk_transactions,
+    location_recipe,
+    django_assert_max_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        new_location = baker.make_recipe(location_recipe, user=user, name="New location")
+    version = get_user_cache_version(user.id)
+    first, second, third, fourth = bulk_transactions
+
+    # Updates are written at once, deleted transactions go through their model signals
+    with django_assert_max_num_queries(45), django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_apiclient.post(
+            "/api/transactions/bulk/",
+            {
+                "update": [
+                    {"id": str(first.id), "amount": "25.50", "description": "Updated"},
+                    {"id": str(second.id), "location": str(new_location.id)},
+                ],
+                "delete": [str(third.id), str(fourth.id)],
+            },
+            format="json",
+        )
+
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    assert response.json() == {"updated": 2, "deleted": 2}
+
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert (first.amount, first.description) == (Decimal("25.50"), "Updated")
+    assert second.location == new_location
+    assert not Transaction.objects.filter(pk__in=[third.id, fourth.id]).exists()
+
+    # Rollups are moved and the analytics cache invalidated once on commit, since bulk operations send no signals
+    assert sum(rollup.amount for rollup in MonthlyRollup.objects.filter(user=user)) == Decimal("35.50")
+    assert get_user_cache_version(user.id) == version + 1
+
+
+@pytest.mark.django_db
+def test_bulk_delete_removes_split_children(
+    authenticated_apiclient: APIClient,
+    user: User,
+    transaction_recipe,
+    positive_transaction_recipe,
+):
+    parent = baker.make_recipe(positive_transaction_recipe, user=user)
+    baker.make_recipe(transaction_recipe, user=user, parent_transaction=parent, _quantity=2)
+
+    response = authenticated_apiclient.post("/api/transactions/bulk/", {"delete": [str(parent.id)]}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not Transaction.objects.filter(user=user).exists()
+
+
+def get_rollup_rows(user):
+    """Get the rollup rows of a user as comparable tuples."""
+    return sorted(
+        MonthlyRollup.objects.filter(user=user).values_list(
+            "year", "month", "category_id", "location_id", "bucket_id", "sign", "amount", "count"
+        ),
+        key=str,
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_update_moves_split_children(
+    authenticated_apiclient: APIClient,
+    user: User,
+    location_recipe,
+    bucket_recipe,
+    positive_category_recipe,
+    django_capture_on_commit_callbacks,
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        location, new_location = baker.make_recipe(location_recipe, user=user, _quantity=2)
+        category, new_category = baker.make_recipe(positive_category_recipe, user=user, _quantity=2)
+        baker.make_recipe(bucket_recipe, user=user, name="Bucket1", allocation_percentage=60)
+        baker.make_recipe(bucket_recipe, user=user, name="Bucket2", allocation_percentage=40)
+        parent = Transaction.objects.create(
+            user=user,
+            description="Income",
+            category=category,
+            amount=Decimal("100.00"),
+            date=datetime(2024, 1, 15, tzinfo=timezone.utc),
+            location=location,
+            split_income=True,
+        )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_apiclient.post(
+            "/api/transactions/bulk/",
+            {
+                "update": [
+                    {
+                        "id": str(parent.id),
+                        "date": "2024-02-10",
+                        "location": str(new_location.id),
+                        "category": str(new_category.id),
+                    }
+                ],
+            },
+            format="json",
+        )
+    assert response.status_code == status.HTTP_200_OK, response.json()
+
+    # The split transactions follow their income, which keeps what it was split with
+    parent.refresh_from_db()
+    assert (parent.amount, parent.description) == (Decimal("0"), "Income (100.00)")
+    children = parent.split_transactions.all()
+    assert sorted(child.amount for child in children) == [Decimal("40.00"), Decimal("60.00")]
+    assert {(child.date, child.location_id, child.category_id) for child in children} == {
+        (datetime(2024, 2, 10, tzinfo=timezone.utc), new_location.id, new_category.id)
+    }
+
+    rollups = get_rollup_rows(user)
+    rebuild_rollups(users=[user])
+    assert rollups == get_rollup_rows(user)
+
+    # A new amount is split again
+    with django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_apiclient.post(
+            "/api/transactions/bulk/",
+            {"update": [{"id": str(parent.id), "amount": "200.00"}]},
+            format="json",
+        )
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    parent.refresh_from_db()
+    assert parent.description == "Income (200.00)"
+    assert sorted(child.amount for child in parent.split_transactions.all()) == [Decimal("80.00"), Decimal("120.00")]
+
+    rollups = get_rollup_rows(user)
+    rebuild_rollups(users=[user])
+    assert rollups == get_rollup_rows(user)
+
+
+@pytest.mark.django_db
+def test_bulk_reports_errors_per_transaction(
+    authenticated_apiclient: APIClient,
+    user: User,
+    bulk_transactions,
+    transaction_recipe,
+    location_recipe,
+):
+    other_transaction = baker.make_recipe(transaction_recipe)
+    other_location = baker.make_recipe(location_recipe)
+    first, second = bulk_transactions[:2]
+
+    response = authenticated_apiclient.post(
+        "/api/transactions/bulk/",
+        {
+            "update": [
+                {"id": str(first.id), "amount": "1.00"},
+                {"id": str(second.id), "location": str(other_location.id)},
+            ],
+            "delete": [str(other_transaction.id)],
+        },
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["errors"] == [
+        {"id": str(second.id), "errors": {"location": "Invalid pk - location does not exist."}},
+        {"id": str(other_transaction.id), "errors": {"id": "Transaction not found."}},
+    ]
+    first.refresh_from_db()
+    assert first.amount == Decimal("10.00")
+    assert Transaction.objects.filter(pk=other_transaction.id).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_validates_fields(authenticated_apiclient: APIClient, bulk_transactions):
+    response = authenticated_apiclient.post(
+        "/api/transactions/bulk/",
+        {"update": [{"id": str(bulk_transactions[0].id), "amount": "abc"}]},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "amount" in response.json()["update"][0]
+
+    response = authenticated_apiclient.post("/api/transactions/bulk/", {}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+
+import pytest
+from model_bakery import baker
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from transactions.models import Transaction
+
+
+@pytest.fixture
+def export_transactions(
+    user: User,
+    negative_transaction_recipe,
+    positive_transaction_recipe,
+    negative_category_recipe,
+    positive_category_recipe,
+    location_recipe,
+    bucket_recipe,
+):
+    """Fixture for creating the transactions of an export, with objects of the user."""
+    objects = {
+        "location": baker.make_recipe(location_recipe, user=user, name="Bank"),
+        "bucket": baker.make_recipe(bucket_recipe, user=user, name="Needs", allocation_percentage=0),
+    }
+    negative = baker.make_recipe(negative_category_recipe, user=user, name="Groceries")
+    positive = baker.make_recipe(positive_category_recipe, user=user, name="Salary")
+    return [
+        *baker.make_recipe(negative_transaction_recipe, user=user, category=negative, _quantity=3, **objects),
+        baker.make_recipe(positive_transaction_recipe, user=user, category=positive, **objects),
+    ]
+
+
+def read_stream(response):
+    """Read the whole content of a streaming response."""
+    assert response.streaming
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_export_requires_authentication(apiclient: APIClient):
+    response = apiclient.get("/api/transactions/export/")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_export_ndjson(
+    authenticated_apiclient: APIClient, export_transactions: list, transaction_recipe, django_assert_num_queries
+):
+    baker.make_recipe(transaction_recipe)
+    response = authenticated_apiclient.get("/api/transactions/export/")
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/x-ndjson"
+
+    # The rows are read in a single query while the response is streamed
+    with django_assert_num_queries(1):
+        lines = [json.loads(line) for line in read_stream(response).splitlines()]
+
+    listed = authenticated_apiclient.get("/api/transactions/?page_size=100").json()["results"]
+    for item in listed:
+        item.pop("user")
+    assert sorted(lines, key=lambda item: item["id"]) == sorted(listed, key=lambda item: item["id"])
+    assert [line["date"] for line in lines] == sorted((line["date"] for line in lines), reverse=True)
+
+
+@pytest.mark.django_db
+def test_export_csv_can_be_imported(
+    authenticated_apiclient: APIClient, user: User, export_transactions: list, django_capture_on_commit_callbacks
+):
+    response = authenticated_apiclient.get("/api/transactions/export/?file_format=csv")
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Disposition"] == 'attachment; filename="transactions.csv"'
+
+    content = read_stream(response)
+    rows = list(csv.DictReader(io.StringIO(content)))
+    assert {row["id"] for row in rows} == {str(transaction.id) for transaction in export_transactions}
+
+    upload = io.BytesIO(content.encode())
+    upload.name = "transactions.csv"
+    with django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_apiclient.post("/api/transactions/import/", {"file": upload})
+    assert response.status_code == status.HTTP_201_CREATED, response.json()
+    assert response.json()["created"] == len(export_transactions)
+    assert Transaction.objects.filter(user=user).count() == 2 * len(export_transactions)
+
+
+@pytest.mark.django_db
+def test_export_rejects_unknown_formats(authenticated_apiclient: APIClient):
+    response = authenticated_apiclient.get("/api/transactions/export/?file_format=xml")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
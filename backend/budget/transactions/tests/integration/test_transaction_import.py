@@ -0,0 +1,205 @@
+import pytest
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from model_bakery import baker
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from analytics.models import MonthlyRollup
+from analytics.services.cache_utils import get_user_cache_version
+from analytics.services.rollup import rebuild_rollups
+from transactions.models import Category
+from transactions.models import Transaction
+
+OFX_STATEMENT = b"""OFXHEADER:100
+DATA:OFXSGML
+<OFX>
+<BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20250115120000.000[-5:EST]
+<TRNAMT>-42.50
+<FITID>1
+<NAME>Grocery &amp; Co
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20250131
+<TRNAMT>1000.00
+<FITID>2
+<MEMO>Salary
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1>
+</OFX>
+"""
+
+
+@pytest.fixture
+def import_objects(
+    user: User,
+    location_recipe,
+    bucket_recipe,
+    positive_category_recipe,
+    negative_category_recipe,
+    django_capture_on_commit_callbacks,
+):
+    """Fixture for creating the objects the imported rows refer to by name, with their invalidations committed."""
+    with django_capture_on_commit_callbacks(execute=True):
+        return {
+            "location": baker.make_recipe(location_recipe, user=user, name="Bank"),
+            "bucket": baker.make_recipe(bucket_recipe, user=user, name="Needs", allocation_percentage=60),
+            "other_bucket": baker.make_recipe(bucket_recipe, user=user, name="Savings", allocation_percentage=40),
+            "income": baker.make_recipe(positive_category_recipe, user=user, name="Salary"),
+            "expense": baker.make_recipe(negative_category_recipe, user=user, name="Groceries"),
+        }
+
+
+def upload(content, name="statement.csv"):
+    return SimpleUploadedFile(name, content, content_type="application/octet-stream")
+
+
+@pytest.mark.django_db
+def test_import_requires_authentication(apiclient: APIClient):
+    response = apiclient.post("/api/transactions/import/", {"file": upload(b"date,description,amount\n")})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_import_csv(
+    authenticated_apiclient: APIClient,
+    user: User,
+    import_objects,
+    django_assert_max_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    cache.clear()
+    version = get_user_cache_version(user.id)
+    content = (
+        "date,description,amount,category,location,bucket,split_income\n"
+        "2025-01-02,Market,-12.30,Groceries,Bank,Needs,\n"
+        "2025-01-03T10:00:00,Paycheck,1000.00,Salary,Bank,,true\n"
+        '2025-02-01,"Corner shop, weekly",7.70,Groceries,Bank,Savings,no\n'
+    ).encode()
+
+    # Rollups are written once per rollup key, not per imported row
+    with django_assert_max_num_queries(50), django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_apiclient.post("/api/transactions/import/", {"file": upload(content)})
+
+    assert response.status_code == status.HTTP_201_CREATED, response.json()
+    assert response.json() == {"created": 3, "split": 2}
+
+    transactions = Transaction.objects.filter(user=user)
+    assert transactions.count() == 5
+    market = transactions.get(description="Market")
+    assert market.amount == Decimal("12.30")
+    assert market.category == import_objects["expense"]
+    assert market.bucket == import_objects["bucket"]
+
+    parent = transactions.get(description="Paycheck (1000.00)")
+    assert parent.amount == 0
+    assert sorted(child.amount for child in parent.split_transactions.all()) == [Decimal("400.00"), Decimal("600.00")]
+
+    # Rollups are updated and the analytics cache invalidated once on commit, since bulk_create sends no signals
+    income_rollups = MonthlyRollup.objects.filter(user=user, month=1, sign=Category.Sign.POSITIVE)
+    assert sum(rollup.amount for rollup in income_rollups) == Decimal("1000.00")
+    assert get_user_cache_version(user.id) == version + 1
+
+    def get_rollups():
+        return sorted(MonthlyRollup.objects.filter(user=user).values_list("month", "bucket", "amount", "count"), key=str)
+
+    rollups = get_rollups()
+    rebuild_rollups(users=[user])
+    assert rollups == get_rollups()
+
+
+@pytest.mark.django_db
+def test_import_ofx_with_defaults(authenticated_apiclient: APIClient, user: User, import_objects):
+    response = authenticated_apiclient.post(
+        "/api/transactions/import/",
+        {
+            "file": upload(OFX_STATEMENT, name="statement.ofx"),
+            "location": "Bank",
+            "bucket": "Needs",
+            "income_category": "Salary",
+            "expense_category": "Groceries",
+        },
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED, response.json()
+    assert response.json() == {"created": 2, "split": 0}
+
+    grocery = Transaction.objects.get(user=user, description="Grocery & Co")
+    assert grocery.amount == Decimal("42.50")
+    assert grocery.category == import_objects["expense"]
+    assert grocery.date.isoformat() == "2025-01-15T17:00:00+00:00"
+    salary = Transaction.objects.get(user=user, description="Salary")
+    assert salary.category == import_objects["income"]
+    assert salary.location == import_objects["location"]
+
+
+@pytest.mark.django_db
+def test_import_rejects_invalid_rows(authenticated_apiclient: APIClient, user: User, import_objects):
+    content = (
+        "date,description,amount,category,location,bucket\n"
+        "2025-01-02,Market,-12.30,Groceries,Bank,Needs\n"
+        "not a date,Market,1.234,Unknown,Bank,Needs\n"
+        "2025-01-04,,5,Groceries,Bank,\n"
+    ).encode()
+
+    response = authenticated_apiclient.post("/api/transactions/import/", {"file": upload(content)})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    errors = response.json()["errors"]
+    assert [error["row"] for error in errors] == [3, 4]
+    assert set(errors[0]["errors"]) == {"date", "amount", "category"}
+    assert set(errors[1]["errors"]) == {"description", "bucket"}
+    assert not Transaction.objects.filter(user=user).exists()
+
+
+@pytest.mark.django_db
+def test_import_rejects_missing_columns_and_unknown_formats(authenticated_apiclient: APIClient, user: User):
+    response = authenticated_apiclient.post("/api/transactions/import/", {"file": upload(b"date,amount\n")})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["errors"][0]["errors"] == {"file": "Missing columns: description."}
+
+    response = authenticated_apiclient.post("/api/transactions/import/", {"file": upload(b"date,description,amount\n", name="statement.txt")})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "format" in response.json()
+
+
+@pytest.mark.django_db
+def test_import_rejects_non_utf8_files(authenticated_apiclient: APIClient, user: User, import_objects):
+    content = (
+        "date,description,amount,category,location,bucket\n"
+        "2025-01-02,Market,-12.30,Groceries,Bank,Needs\n"
+        "2025-01-03,Caf\u00e9,-3.20,Groceries,Bank,Needs\n"
+    ).encode("latin-1")
+
+    response = authenticated_apiclient.post("/api/transactions/import/", {"file": upload(content)})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["errors"] == [{"row": 3, "errors": {"file": "The file must be encoded in UTF-8."}}]
+    assert not Transaction.objects.filter(user=user).exists()
+
+    response = authenticated_apiclient.post(
+        "/api/transactions/import/", {"file": upload("date,description,amount,d\u00e9bit\n".encode("latin-1"))}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["errors"] == [{"row": 1, "errors": {"file": "The file must be encoded in UTF-8."}}]
+
+
+@pytest.mark.django_db
+def test_import_cannot_use_other_users_objects(authenticated_apiclient: APIClient, location_recipe):
+    baker.make_recipe(location_recipe, name="Elsewhere")
+
+    response = authenticated_apiclient.post(
+        "/api/transactions/import/",
+        {"file": upload(b"date,description,amount\n"), "location": "Elsewhere"},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "location" in response.json()
@@ -0,0 +1,108 @@
+import pytest
+from datetime import datetime
+
+from django.utils.timezone import make_aware
+from model_bakery import baker
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from analytics.models import MonthlyRollup
+from transactions.models import Transaction
+
+
+@pytest.fixture
+def dated_transactions(user: User, negative_transaction_recipe):
+    """Fixture for creating transactions, several of them sharing a date."""
+    dates = [datetime(2025, 1, 1), datetime(2025, 1, 2), datetime(2025, 1, 2), datetime(2025, 1, 2), datetime(2025, 1, 3)]
+    return [baker.make_recipe(negative_transaction_recipe, user=user, date=make_aware(date)) for date in dates]
+
+
+def walk(client: APIClient, url: str, link: str = "next"):
+    """Follow the links of a cursor paginated list, returning the ids of every page."""
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK, response.json()
+        assert "count" not in response.json()
+        pages.append([transaction["id"] for transaction in response.json()["results"]])
+        url = response.json()[link]
+    return pages
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_walks_every_transaction(authenticated_apiclient: APIClient, dated_transactions: list):
+    expected = [
+        str(transaction.id)
+        for transaction in sorted(dated_transactions, key=lambda transaction: (transaction.date, transaction.id), reverse=True)
+    ]
+
+    pages = walk(authenticated_apiclient, "/api/transactions/?pagination=cursor&page_size=2")
+    assert pages == [expected[0:2], expected[2:4], expected[4:5]]
+
+    # The previous links lead back through the same pages
+    response = authenticated_apiclient.get("/api/transactions/?pagination=cursor&page_size=2")
+    last_page = authenticated_apiclient.get(authenticated_apiclient.get(response.json()["next"]).json()["next"])
+    assert walk(authenticated_apiclient, last_page.json()["previous"], link="previous") == pages[1::-1]
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_is_stable_under_inserts(
+    authenticated_apiclient: APIClient, user: User, dated_transactions: list, negative_transaction_recipe
+):
+    response = authenticated_apiclient.get("/api/transactions/?pagination=cursor&page_size=2")
+    seen = [transaction["id"] for transaction in response.json()["results"]]
+
+    # New transactions, newer and older than the page read, neither shift nor repeat the next pages
+    baker.make_recipe(negative_transaction_recipe, user=user, date=make_aware(datetime(2025, 2, 1)))
+    older = baker.make_recipe(negative_transaction_recipe, user=user, date=make_aware(datetime(2024, 12, 1)))
+
+    for page in walk(authenticated_apiclient, response.json()["next"]):
+        seen.extend(page)
+
+    assert len(seen) == len(set(seen)) == len(dated_transactions) + 1
+    assert seen[-1] == str(older.id)
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_rejects_invalid_cursors(authenticated_apiclient: APIClient):
+    response = authenticated_apiclient.get("/api/transactions/?cursor=not-a-cursor")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_page_number_pagination_stays_the_default(authenticated_apiclient: APIClient, dated_transactions: list):
+    response = authenticated_apiclient.get("/api/transactions/?page=2&page_size=2")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["count"] == len(dated_transactions)
+    assert len(response.json()["results"]) == 2
+
+
+@pytest.mark.django_db
+def test_count_transactions(
+    authenticated_apiclient: APIClient, user: User, dated_transactions: list, django_assert_num_queries
+):
+    with django_assert_num_queries(1):
+        response = authenticated_apiclient.get("/api/transactions/count/")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"count": Transaction.objects.filter(user=user).count()}
+
+    category = dated_transactions[0].category
+    response = authenticated_apiclient.get(f"/api/transactions/count/?category={category.id}")
+    assert response.json() == {"count": Transaction.objects.filter(user=user, category=category).count()}
+
+
+@pytest.mark.django_db
+def test_count_transactions_without_rollups(authenticated_apiclient: APIClient, user: User, dated_transactions: list):
+    """Test the count comes from the transactions themselves, whatever the state of the analytics rollups."""
+    MonthlyRollup.objects.filter(user=user).delete()
+
+    response = authenticated_apiclient.get("/api/transactions/count/")
+    assert response.json() == {"count": len(dated_transactions)}
+
+
+@pytest.mark.django_db
+def test_count_requires_authentication(apiclient: APIClient):
+    response = apiclient.get("/api/transactions/count/")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,51 @@
+import pytest
+from model_bakery import baker
+
+from django.db import connection
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+from rest_framework.test import APIRequestFactory
+
+from accounts.models import User
+from transactions.filters import TransactionSearchFilter
+from transactions.models import Transaction
+
+
+@pytest.fixture
+def described_transactions(user: User, negative_transaction_recipe: str):
+    """Fixture for creating transactions with known descriptions."""
+    descriptions = ["Coffee at the station", "Weekly grocery", "COFFEE beans", "Rent"]
+    return [
+        baker.make_recipe(negative_transaction_recipe, user=user, description=description)
+        for description in descriptions
+    ]
+
+
+@pytest.mark.django_db
+def test_search_matches_descriptions_case_insensitively(
+    authenticated_apiclient: APIClient, described_transactions: list
+):
+    response = authenticated_apiclient.get("/api/transactions/", {"search": "coffee"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(item["description"] for item in response.json()["results"]) == ["COFFEE beans", "Coffee at the station"]
+    assert authenticated_apiclient.get("/api/transactions/count/", {"search": "coffee"}).json()["count"] == 2
+
+
+@pytest.mark.django_db
+def test_search_ranks_on_postgresql_only(user: User, monkeypatch):
+    """Test results are ranked by similarity on PostgreSQL unless an ordering is asked for, and left as is elsewhere."""
+    queryset = Transaction.objects.filter_by_user(user).order_by("-date")
+    view = type("View", (), {"search_fields": ("description",)})()
+
+    def search(params):
+        request = Request(APIRequestFactory().get("/api/transactions/", params))
+        return TransactionSearchFilter().filter_queryset(request, queryset, view)
+
+    assert search({"search": "coffee"}).query.order_by == ("-date",)
+
+    monkeypatch.setattr(connection, "vendor", "postgresql")
+    assert search({"search": "coffee"}).query.order_by == ("-search_rank", "-date", "-id")
+    assert search({"search": "coffee", "ordering": "amount"}).query.order_by == ("-date",)
+    assert search({}).query.order_by == ("-date",)
@@ -0,0 +1,35 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from accounts.models import User
+from analytics.management.commands.benchmarkanalytics import BENCHMARK_EMAIL
+from transactions.models import Transaction
+
+
+@pytest.mark.django_db
+def test_benchmarktransactionlist_command():
+    """Test the list benchmark times both modes, checks they agree and cleans up its data."""
+    out = StringIO()
+    call_command("benchmarktransactionlist", page_size=20, runs=1, stdout=out)
+
+    output = out.getvalue()
+    assert "model serializers" in output
+    assert "value rows" in output
+    assert "Both modes produce the same page." in output
+    assert not User.all_objects.filter(email=BENCHMARK_EMAIL).exists()
+    assert not Transaction.objects.exists()
+
+
+@pytest.mark.django_db
+def test_benchmarktransactionsearch_command():
+    """Test the search benchmark times every search through the API, shows its plan and cleans up its data."""
+    out = StringIO()
+    call_command("benchmarktransactionsearch", rows=200, runs=1, stdout=out)
+
+    output = out.getvalue()
+    assert output.count("first page best of 1 runs") == 3
+    assert '"no such description": 0 matches' in output
+    assert not User.all_objects.filter(email=BENCHMARK_EMAIL).exists()
+    assert not Transaction.objects.exists()
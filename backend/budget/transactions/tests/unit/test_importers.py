@@ -0,0 +1,54 @@
+import pytest
+from decimal import Decimal
+from io import BytesIO
+
+from transactions.services.importers import parse_amount
+from transactions.services.importers import parse_date_value
+from transactions.services.importers import read_csv_rows
+from transactions.services.importers import read_ofx_rows
+
+
+def test_parse_amount():
+    """Test parse_amount keeps exact two decimal place amounts and rejects the rest."""
+    assert parse_amount("-12.3") == Decimal("-12.30")
+    assert str(parse_amount("7")) == "7.00"
+    for value in ("", "abc", "NaN", "1.234", "100000000"):
+        with pytest.raises(ValueError):
+            parse_amount(value)
+
+
+def test_parse_date_value():
+    """Test parse_date_value reads ISO and OFX dates, keeping their offsets."""
+    assert parse_date_value("2025-01-02").isoformat() == "2025-01-02T00:00:00+00:00"
+    assert parse_date_value("2025-01-02T10:30:00+02:00").isoformat() == "2025-01-02T10:30:00+02:00"
+    assert parse_date_value("20250115120000.000[-5:EST]").isoformat() == "2025-01-15T12:00:00-05:00"
+    assert parse_date_value("20250131").isoformat() == "2025-01-31T00:00:00+00:00"
+    with pytest.raises(ValueError):
+        parse_date_value("31/01/2025")
+
+
+def test_read_csv_rows():
+    """Test read_csv_rows normalizes column names and reports the line of every row."""
+    upload = BytesIO("﻿Date, Description ,Amount\n2025-01-02,\"Multi\nline\",1\n2025-01-03,Other,2\n".encode())
+
+    rows = list(read_csv_rows(upload))
+
+    assert rows == [
+        (3, {"date": "2025-01-02", "description": "Multi\nline", "amount": "1"}),
+        (4, {"date": "2025-01-03", "description": "Other", "amount": "2"}),
+    ]
+
+
+def test_read_ofx_rows():
+    """Test read_ofx_rows reads XML statements with every tag on one line."""
+    upload = BytesIO(
+        b"<OFX><STMTTRN><DTPOSTED>20250101</DTPOSTED><TRNAMT>-1.50</TRNAMT><NAME>Coffee</NAME></STMTTRN>"
+        b"<STMTTRN><DTPOSTED>20250102</DTPOSTED><TRNAMT>2</TRNAMT><MEMO>Refund</MEMO></STMTTRN></OFX>"
+    )
+
+    rows = [row for _, row in read_ofx_rows(upload)]
+
+    assert rows == [
+        {"date": "20250101", "description": "Coffee", "amount": "-1.50"},
+        {"date": "20250102", "description": "Refund", "amount": "2"},
+    ]
@@ -0,0 +1,39 @@
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from accounts.models import User
+from transactions.models import Transaction
+from transactions.serializers import TransactionListSerializer
+from transactions.services.rows import LIST_FIELDS
+from transactions.services.rows import TransactionRowSerializer
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("tz", ["UTC", "Europe/Rome"])
+def test_row_serializer_matches_list_serializer(
+    tz: str, user: User, negative_transaction_recipe: str, neutral_transaction_recipe: str
+):
+    """Test TransactionRowSerializer builds exactly the items of TransactionListSerializer."""
+    baker.make_recipe(negative_transaction_recipe, user=user, amount=Decimal("12.30"), _quantity=2)
+    baker.make_recipe(
+        neutral_transaction_recipe,
+        user=user,
+        bucket=None,
+        date=datetime(2025, 6, 1, 10, 30, 15, 123456, tzinfo=ZoneInfo("UTC")),
+    )
+    request = Request(APIRequestFactory().get("/api/transactions/"))
+    transactions = Transaction.objects.filter(user=user).order_by("-date", "-id")
+
+    with timezone.override(tz):
+        expected = TransactionListSerializer(transactions, many=True, context={"request": request}).data
+        rows = TransactionRowSerializer(transactions.values(*LIST_FIELDS), request).data
+
+    assert rows == [dict(item) for item in expected]
+    assert len({row["user"] for row in rows}) == 1
@@ -4,6 +4,8 @@ import pytest
 from django.core.exceptions import ValidationError
 from django.utils.timezone import now
 from model_bakery import baker
+from analytics.models import MonthlyRollup
+from analytics.services.rollup import rebuild_rollups
 from core.models import Bucket
 from transactions.models import Transaction
 from transactions.models import Category
@@ -139,6 +141,96 @@ def test_split_income(
         assert transaction.amount == expected_amount
 
 
+@pytest.fixture
+def split_setup(user_recipe, location_recipe, bucket_recipe, positive_category_recipe):
+    """Fixture for creating a user with complete bucket allocations, to split incomes with."""
+    user = baker.make_recipe(user_recipe)
+    return {
+        "user": user,
+        "location": baker.make_recipe(location_recipe, user=user),
+        "category": baker.make_recipe(positive_category_recipe, user=user),
+        "buckets": [
+            baker.make_recipe(bucket_recipe, user=user, name="Bucket1", allocation_percentage=60),
+            baker.make_recipe(bucket_recipe, user=user, name="Bucket2", allocation_percentage=40),
+        ],
+    }
+
+
+def make_split_income(split_setup, amount="100.00"):
+    """Create (and so split) a split income."""
+    return Transaction.objects.create(
+        user=split_setup["user"],
+        description="Income",
+        category=split_setup["category"],
+        amount=Decimal(amount),
+        location=split_setup["location"],
+        split_income=True,
+    )
+
+
+@pytest.mark.django_db
+def test_split_incomes_reuses_split_transactions(split_setup):
+    """Test splitting an income again keeps unchanged split transactions and updates or deletes the rest."""
+    parent = make_split_income(split_setup)
+    children = {child.bucket_id: child.pk for child in parent.split_transactions.all()}
+
+    assert Transaction.objects.split_incomes([parent]) == {"created": 0, "updated": 0, "deleted": 0}
+    assert {child.bucket_id: child.pk for child in parent.split_transactions.all()} == children
+
+    bucket1, bucket2 = split_setup["buckets"]
+    Bucket.all_objects.filter(pk=bucket1.pk).update(allocation_percentage=100)
+    Bucket.all_objects.filter(pk=bucket2.pk).update(allocation_percentage=0)
+    assert Transaction.objects.split_incomes([parent]) == {"created": 0, "updated": 1, "deleted": 1}
+
+    child = parent.split_transactions.get()
+    assert child.pk == children[bucket1.pk]
+    assert child.amount == Decimal("100.00")
+    parent.refresh_from_db()
+    assert parent.amount == 0
+
+
+@pytest.mark.django_db
+def test_split_incomes_in_batch(split_setup, django_assert_max_num_queries):
+    """Test many incomes are split with a number of queries independent of their count."""
+    parents = [make_split_income(split_setup, amount) for amount in ("10.00", "20.00", "30.00")]
+    Transaction.objects.filter(parent_transaction__in=parents).delete()
+
+    with django_assert_max_num_queries(8):
+        stats = Transaction.objects.split_incomes(parents, send_signal=False)
+
+    assert stats == {"created": 6, "updated": 0, "deleted": 0}
+    assert sorted(Transaction.objects.filter(parent_transaction__in=parents).values_list("amount", flat=True)) == [
+        Decimal(amount) for amount in ("4.00", "6.00", "8.00", "12.00", "12.00", "18.00")
+    ]
+
+
+@pytest.mark.django_db
+def test_split_incomes_keep_rollups_in_sync(split_setup):
+    """Test the rollups patched after a split match the ones rebuilt from the transactions."""
+    parent = make_split_income(split_setup)
+    parent.amount = Decimal("250.00")
+    parent.save()
+
+    def get_rollups():
+        return sorted(MonthlyRollup.objects.values_list("bucket", "amount", "count"), key=str)
+
+    rollups = get_rollups()
+    rebuild_rollups()
+    assert rollups == get_rollups()
+
+    # A bucket losing its allocation has its split transaction deleted
+    bucket1, bucket2 = split_setup["buckets"]
+    Bucket.all_objects.filter(pk=bucket1.pk).update(allocation_percentage=100)
+    Bucket.all_objects.filter(pk=bucket2.pk).update(allocation_percentage=0)
+    parent.refresh_from_db()
+    parent.amount = Decimal("250.00")
+    assert Transaction.objects.split_incomes([parent])["deleted"] == 1
+
+    rollups = get_rollups()
+    rebuild_rollups()
+    assert rollups == get_rollups()
+
+
 @pytest.mark.django_db
 def test_validate_user(transaction_recipe: str, user_recipe: str):
     """Test validating the user field"""
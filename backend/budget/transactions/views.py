@@ -1,28 +1,41 @@
 from rest_framework import filters
 from rest_framework import mixins
+from rest_framework import status
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import FormParser
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
 
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 
+from core.versions import etag_on_data_version
+from transactions.filters import TransactionSearchFilter
 from transactions.models import Category
 from transactions.models import Transaction
+from transactions.pagination import StandardResultsSetPagination
+from transactions.pagination import TransactionCursorPagination
 from transactions.serializers import CategorySerializer
 from transactions.serializers import CategoryWriteSerializer
 from transactions.serializers import TransactionListSerializer
+from transactions.serializers import TransactionBulkSerializer
 from transactions.serializers import TransactionDetailSerializer
+from transactions.serializers import TransactionImportSerializer
 from transactions.serializers import TransactionWriteSerializer
+from transactions.services.bulk import TransactionBulkEditor
+from transactions.services.bulk import TransactionBulkError
+from transactions.services.exporters import RENDERERS
+from transactions.services.exporters import iter_export_rows
+from transactions.services.importers import TransactionImporter
+from transactions.services.importers import TransactionImportError
+from transactions.services.rows import LIST_FIELDS
+from transactions.services.rows import TransactionRowSerializer
 
 from .permissions import IsOwner
 
 
-class StandardResultsSetPagination(PageNumberPagination):
-    page_size = 50
-    page_size_query_param = "page_size"
-    max_page_size = 100
-
-
 class CategoryViewSet(
     viewsets.GenericViewSet,
     mixins.ListModelMixin,
@@ -47,6 +60,10 @@ class CategoryViewSet(
         """Retrieve a custom queryset for categories based on the current user."""
         return Category.available_objects.filter_by_user(self.request.user)
 
+    @etag_on_data_version
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def get_serializer_map(self):
         return {
             "list": CategorySerializer,
@@ -77,16 +94,26 @@ class TransactionViewSet(
     """Transaction model view."""
     serializer_class = TransactionListSerializer
     permission_classes = (IsAuthenticated, IsOwner)
-    filter_backends = (DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter)
+    filter_backends = (DjangoFilterBackend, filters.OrderingFilter, TransactionSearchFilter)
     filterset_fields = ("category", "date", "amount", "location", "bucket",)
     ordering_fields = ("date", "amount",)
     search_fields = ("description",)
     pagination_class = StandardResultsSetPagination
+    cursor_pagination_class = TransactionCursorPagination
 
     def get_queryset(self):
         """Retrieve a custom queryset for transactions based on the current user."""
         return Transaction.objects.filter_by_user(self.request.user)
 
+    @property
+    def paginator(self):
+        """Use the cursor pagination when asked for (?pagination=cursor, or a cursor), the page number one otherwise."""
+        if not hasattr(self, "_paginator"):
+            params = self.request.query_params
+            use_cursor = params.get("pagination") == "cursor" or "cursor" in params
+            self._paginator = (self.cursor_pagination_class if use_cursor else self.pagination_class)()
+        return self._paginator
+
     def get_serializer_map(self):
         return {
             "list": TransactionListSerializer,
@@ -94,6 +121,8 @@ class TransactionViewSet(
             "create": TransactionWriteSerializer,
             "update": TransactionWriteSerializer,
             "partial_update": TransactionWriteSerializer,
+            "import_transactions": TransactionImportSerializer,
+            "bulk": TransactionBulkSerializer,
         }
 
     def get_serializer_class(self):
@@ -105,8 +134,77 @@ class TransactionViewSet(
     def perform_update(self, serializer):
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=["post"], url_path="import", parser_classes=(MultiPartParser, FormParser))
+    def import_transactions(self, request):
+        """Import the transactions of a CSV or OFX statement in bulk. Any invalid row rejects the whole file."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        importer = TransactionImporter(
+            request.user,
+            location=data.get("location"),
+            bucket=data.get("bucket"),
+            income_category=data.get("income_category"),
+            expense_category=data.get("expense_category"),
+        )
+        try:
+            stats = importer.import_file(data["file"], data["format"])
+        except TransactionImportError as e:
+            return Response({"errors": e.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(stats, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """Apply a list of partial updates and a list of deletions at once. Any invalid entry rejects the whole request."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            stats = TransactionBulkEditor(request.user).apply(data.get("update", []), data.get("delete", []))
+        except TransactionBulkError as e:
+            return Response({"errors": e.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(stats)
+
+    @action(detail=False, methods=["get"])
+    @etag_on_data_version
+    def count(self, request):
+        """Count the transactions, with the same filters as the list, with a single COUNT query."""
+        count = self.filter_queryset(self.get_queryset()).count()
+        return Response({"count": count})
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """
+        Stream the whole history of transactions (with the list filters) as NDJSON, or as CSV with ?file_format=csv.
+        Rows are read in chunks as plain values and written as they come, so memory stays flat whatever the history size.
+        """
+        file_format = request.query_params.get("file_format", "ndjson")
+        if file_format not in RENDERERS:
+            return Response(
+                {"file_format": [f"Choose one of: {', '.join(RENDERERS)}."]}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        content_type, render = RENDERERS[file_format]
+        response = StreamingHttpResponse(
+            render(iter_export_rows(self.filter_queryset(self.get_queryset()))), content_type=content_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="transactions.{file_format}"'
+        return response
+
+    @etag_on_data_version
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        """List the transactions from rows of their values, serialized without model instances or nested serializers."""
+        queryset = self.filter_queryset(self.get_queryset()).values(*LIST_FIELDS)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(TransactionRowSerializer(page, request).data)
+
+        return Response(TransactionRowSerializer(queryset, request).data)
 
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
@@ -91,6 +91,7 @@ if "api_transactions" not in st.session_state:
         "cache": {
             "info": {},
             "by_page": {},
+            "cursors": {1: None},
             "all_transactions": [],
         },
     }
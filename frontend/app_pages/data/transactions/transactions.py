@@ -25,6 +25,19 @@ def update_current_page(page: int):
     st.session_state["api_transactions"]["cache"]["info"]["current_page"] = page
 
 
+def get_transaction_update(row: dict):
+    """Turn an edited table row into a partial update of the bulk API."""
+    return {
+        "id": row["🆔"],
+        "description": row["✍️ Description"],
+        "category": get_category_id(name=row["🔖 Category"]),
+        "date": str(row["📆 Date"]),
+        "amount": float(row["🔢 Amount"]),
+        "location": get_location_id(name=row["🏦 Location"]),
+        "bucket": get_bucket_id(name=row["🪙 Bucket"]),
+    }
+
+
 def transactions_page():
     """Transactions page."""
     
@@ -206,31 +219,21 @@ def transactions_page():
                     
                     # Case 2: Something to modify only - apply them directly
                     elif len(modified_indices) > 0:
-                        for index in modified_indices:
-                            new_row = new_data.loc[index].to_dict()
-                            new_category_id = get_category_id(name=new_row["🔖 Category"])
-                            new_location_id = get_location_id(name=new_row["🏦 Location"])
-                            new_bucket_id = get_bucket_id(name=new_row["🪙 Bucket"])
-                            response = transactions_api.update_transaction(
-                                transaction_id=new_row["🆔"],
-                                description=new_row["✍️ Description"],
-                                category_id=new_category_id,
-                                date=str(new_row["📆 Date"]),
-                                amount=float(new_row["🔢 Amount"]),
-                                location_id=new_location_id,
-                                bucket_id=new_bucket_id,
-                            )
-                            if not isinstance(response, dict):
-                                st.error(response)
-                                break
-                        st.session_state["api_transactions"]["edit_mode"] = False
-                        st.success("Transaction(s) updated!")
-                        
-                        update_cache(["transactions"])
-                        clear_cache(["analytics"])
-                        
-                        time.sleep(1)
-                        st.rerun()
+                        # All modifications are sent (and applied or rejected) together
+                        response = transactions_api.bulk_update_transactions(
+                            updates=[get_transaction_update(new_data.loc[index].to_dict()) for index in modified_indices],
+                        )
+                        if not isinstance(response, dict):
+                            st.error(response)
+                        else:
+                            st.session_state["api_transactions"]["edit_mode"] = False
+                            st.success("Transaction(s) updated!")
+                            
+                            clear_cache(["transactions", "analytics"])
+                            update_cache(["transactions"])
+                            
+                            time.sleep(1)
+                            st.rerun()
 
                     # Case 4: Nothing changed - do nothing
                     else:
@@ -242,45 +245,34 @@ def transactions_page():
                 
                 if st.button("✔️ Confirm deletion and save all changes"):
                     
-                    # Case 1 & 3: Apply deletions
-                    for index in st.session_state["api_transactions"]["to_delete"]:
-                        transaction_id = data.loc[index].to_dict()["🆔"]
-                        transactions_api.delete_transaction(transaction_id=transaction_id)
-                    
-                    # Case 1 & 3: Apply modifications, if any
-                    if len(st.session_state["api_transactions"]["to_update"]) > 0:
-                        for index in st.session_state["api_transactions"]["to_update"]:
-                            new_row = st.session_state["api_transactions"]["new_data"].loc[index].to_dict()
-                            new_category_id = get_category_id(name=new_row["🔖 Category"])
-                            new_location_id = get_location_id(name=new_row["🏦 Location"])
-                            new_bucket_id = get_bucket_id(name=new_row["🪙 Bucket"])
-                            response = transactions_api.update_transaction(
-                                transaction_id=new_row["🆔"],
-                                description=new_row["✍️ Description"],
-                                category_id=new_category_id,
-                                date=str(new_row["📆 Date"]),
-                                amount=float(new_row["🔢 Amount"]),
-                                location_id=new_location_id,
-                                bucket_id=new_bucket_id,
-                            )
-                            if not isinstance(response, dict):
-                                st.error(response)
-                                break
-                    
-                    st.success("All changes applied successfully!")
-                    
-                    # Reset state
-                    st.session_state["api_transactions"]["confirm_delete"] = False
-                    st.session_state["api_transactions"]["to_delete"] = None
-                    st.session_state["api_transactions"]["to_update"] = None
-                    st.session_state["api_transactions"]["new_data"] = None
-                    st.session_state["api_transactions"]["edit_mode"] = False
-                    
-                    update_cache(["transactions"])
-                    clear_cache(["analytics"])
-                    
-                    time.sleep(1)
-                    st.rerun()
+                    # Case 1 & 3: Apply deletions and modifications, if any, in one request
+                    response = transactions_api.bulk_update_transactions(
+                        updates=[
+                            get_transaction_update(st.session_state["api_transactions"]["new_data"].loc[index].to_dict())
+                            for index in st.session_state["api_transactions"]["to_update"]
+                        ],
+                        delete_ids=[
+                            data.loc[index].to_dict()["🆔"]
+                            for index in st.session_state["api_transactions"]["to_delete"]
+                        ],
+                    )
+                    if not isinstance(response, dict):
+                        st.error(response)
+                    else:
+                        st.success("All changes applied successfully!")
+                        
+                        # Reset state
+                        st.session_state["api_transactions"]["confirm_delete"] = False
+                        st.session_state["api_transactions"]["to_delete"] = None
+                        st.session_state["api_transactions"]["to_update"] = None
+                        st.session_state["api_transactions"]["new_data"] = None
+                        st.session_state["api_transactions"]["edit_mode"] = False
+                        
+                        clear_cache(["transactions", "analytics"])
+                        update_cache(["transactions"])
+                        
+                        time.sleep(1)
+                        st.rerun()
                 
                 if st.button("✖️ Cancel"):
                     # Reset confirmation state
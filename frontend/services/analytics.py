@@ -1,4 +1,3 @@
-import requests
 from .auth import AuthAPIService
 
 
@@ -7,55 +6,19 @@ class AnalyticsAPIService(AuthAPIService):
 
     def get_current_analytics(self):
         """Get current analytics."""
-        self._update()
-        try:
-            response = requests.get(
-                f"{self.base_url}/analytics-current/",
-                headers=self.headers,
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return f"Error: {str(e)}. Response: {response.text}"
+        return self._get_data(f"{self.base_url}/analytics-current/")
 
     def get_monthly_analytics(self, year: int, month: int):
         """Get monthly analytics."""
-        self._update()
-        try:
-            response = requests.get(
-                f"{self.base_url}/analytics-monthly/{year}-{month}/",
-                headers=self.headers,
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return f"Error: {str(e)}. Response: {response.text}"
+        return self._get_data(f"{self.base_url}/analytics-monthly/{year}-{month}/")
     
     def get_yearly_analytics(self, year: int):
         """Get yearly analytics."""
-        self._update()
-        try:
-            response = requests.get(
-                f"{self.base_url}/analytics-yearly/{year}/",
-                headers=self.headers,
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return f"Error: {str(e)}. Response: {response.text}"
+        return self._get_data(f"{self.base_url}/analytics-yearly/{year}/")
     
     def get_historical_analytics(self):
         """Get historical analytics."""
-        self._update()
-        try:
-            response = requests.get(
-                f"{self.base_url}/analytics-historical/",
-                headers=self.headers,
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return f"Error: {str(e)}. Response: {response.text}"
+        return self._get_data(f"{self.base_url}/analytics-historical/")
 
     def get_years(self):
         """Get years."""
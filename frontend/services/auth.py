@@ -1,6 +1,24 @@
+import msgpack
 import requests
 import streamlit as st
 
+# MessagePack extension type of the API for amounts, packed as big endian integer cents
+AMOUNT_EXT_TYPE = 1
+
+
+def decode_ext(code, data):
+    """Decode the MessagePack extensions of the API: amounts become floats, as in its JSON responses."""
+    if code == AMOUNT_EXT_TYPE:
+        return int.from_bytes(data, "big", signed=True) / 100
+    return msgpack.ExtType(code, data)
+
+
+def decode_response(response):
+    """Decode the body of a response, sent as MessagePack or JSON."""
+    if response.headers.get("Content-Type", "").startswith("application/msgpack"):
+        return msgpack.unpackb(response.content, ext_hook=decode_ext, raw=False)
+    return response.json()
+
 
 class AuthAPIService:
     """Service class for handling authentication-related API calls."""
@@ -129,3 +147,26 @@ class AuthAPIService:
         self.headers = st.session_state["api_auth"]["headers"]
         self.token = st.session_state["api_auth"]["token"]
         self.user_id = st.session_state["api_auth"]["user_id"]
+
+    def _get_data(self, url: str, params: dict = None):
+        """
+        GET a resource as MessagePack, sending the ETag of the copy received last as If-None-Match,
+        and reuse that copy when the API answers 304 Not Modified.
+        """
+        self._update()
+        etags = st.session_state.setdefault("api_etags", {})
+        key = (url, tuple(sorted((params or {}).items())), self.user_id)
+        headers = {**self.headers, "Accept": "application/msgpack"}
+        if key in etags:
+            headers["If-None-Match"] = etags[key][0]
+        try:
+            response = requests.get(url, headers=headers, params=params)
+            if response.status_code == 304 and key in etags:
+                return etags[key][1]
+            response.raise_for_status()
+            data = decode_response(response)
+            if response.headers.get("ETag"):
+                etags[key] = (response.headers["ETag"], data)
+            return data
+        except requests.exceptions.RequestException as e:
+            return f"Error: {str(e)}. Response: {response.text}"
@@ -7,16 +7,7 @@ class BucketsAPIService(AuthAPIService):
 
     def get_buckets_data(self):
         """Get buckets data."""
-        self._update()
-        try:
-            response = requests.get(
-                f"{self.base_url}/buckets/",
-                headers=self.headers,
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return f"Error: {str(e)}. Response: {response.text}"
+        return self._get_data(f"{self.base_url}/buckets/")
     
     def add_bucket(self, bucket_name: str, allocation_percentage: int):
         """Add a new bucket for the current user."""
@@ -7,16 +7,7 @@ class CategoriesAPIService(AuthAPIService):
 
     def get_categories_data(self):
         """Get categories data."""
-        self._update()
-        try:
-            response = requests.get(
-                f"{self.base_url}/categories/",
-                headers=self.headers,
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return f"Error: {str(e)}. Response: {response.text}"
+        return self._get_data(f"{self.base_url}/categories/")
 
     def add_category(self, name: str, sign: str):
         """Add a new category for the current user."""
@@ -7,16 +7,7 @@ class LocationsAPIService(AuthAPIService):
 
     def get_locations_data(self):
         """Get all locations data for the current user."""
-        self._update()
-        try:
-            response = requests.get(
-                f"{self.base_url}/locations/",
-                headers=self.headers,
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return f"Error: {str(e)}. Response: {response.text}"
+        return self._get_data(f"{self.base_url}/locations/")
 
     def add_location(self, location_name: str):
         """Add a new location for the current user."""
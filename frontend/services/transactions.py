@@ -1,3 +1,5 @@
+import json
+
 import requests
 from .auth import AuthAPIService
 
@@ -7,30 +9,40 @@ class TransactionAPIService(AuthAPIService):
 
     def get_transactions_by_page(self, page=1, page_size=50):
         """Get a page of transactions data."""
+        return self._get_data(f"{self.base_url}/transactions/", params={"page": page, "page_size": page_size})
+        
+    def get_transactions_by_cursor(self, next_url: str = None, page_size=50):
+        """Get a page of transactions data with cursor pagination, from the first page or a `next` URL."""
+        if next_url:
+            return self._get_data(next_url)
+        return self._get_data(
+            f"{self.base_url}/transactions/", params={"pagination": "cursor", "page_size": page_size}
+        )
+
+    def get_transactions_count(self):
+        """Get the number of transactions."""
+        data = self._get_data(f"{self.base_url}/transactions/count/")
+        if isinstance(data, str):
+            return data
+        return data["count"]
+
+    def export_transactions(self):
+        """Get every transaction, streamed as NDJSON and read line by line."""
         self._update()
         try:
-            response = requests.get(
-                f"{self.base_url}/transactions/",
+            with requests.get(
+                f"{self.base_url}/transactions/export/",
                 headers=self.headers,
-                params={"page": page, "page_size": page_size},
-            )
-            response.raise_for_status()
-            return response.json()
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                return [json.loads(line) for line in response.iter_lines() if line]
         except requests.exceptions.RequestException as e:
             return f"Error: {str(e)}. Response: {response.text}"
-        
+
     def get_one_transaction(self, transaction_id: str):
         """Get one transaction data."""
-        self._update()
-        try:
-            response = requests.get(
-                f"{self.base_url}/transactions/{transaction_id}/",
-                headers=self.headers,
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return f"Error: {str(e)}. Response: {response.text}"
+        return self._get_data(f"{self.base_url}/transactions/{transaction_id}/")
 
     def add_transaction(
         self,
@@ -112,6 +124,23 @@ class TransactionAPIService(AuthAPIService):
         except requests.exceptions.RequestException as e:
             return f"Error: {str(e)}. Response: {response.text}"
 
+    def bulk_update_transactions(self, updates: list = None, delete_ids: list = None):
+        """Update and delete several transactions in one request (all or nothing)."""
+        self._update()
+        try:
+            response = requests.post(
+                f"{self.base_url}/transactions/bulk/",
+                headers=self.headers,
+                json={
+                    "update": updates or [],
+                    "delete": delete_ids or [],
+                }
+            )
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            return f"Error: {str(e)}. Response: {response.text}"
+
     def update_transaction_location(self, transaction_id: str, new_location_id: str):
         """Update a transaction's location."""
         self._update()
@@ -145,19 +145,34 @@ def get_or_fetch_transactions_page(page: int = 1, page_size: int = 50):
     """Get or fetch transactions page."""
     if page not in st.session_state["api_transactions"]["cache"]["by_page"]:
         update_cache(["transactions"], page=page, page_size=page_size)
-        return st.session_state["api_transactions"]["cache"]["by_page"][page]
+        return st.session_state["api_transactions"]["cache"]["by_page"].get(page, [])
     else:
         return st.session_state["api_transactions"]["cache"]["by_page"][page]
 
+def fetch_transactions_pages(page: int = 1, page_size: int = 50):
+    """Walk the transactions cursors up to a page, from the closest page whose cursor is known."""
+    transactions_cache = st.session_state["api_transactions"]["cache"]
+    current_page = max(known_page for known_page in transactions_cache["cursors"] if known_page <= page)
+
+    while current_page <= page:
+        page_data = st.session_state["api_transactions"]["service"].get_transactions_by_cursor(
+            next_url=transactions_cache["cursors"][current_page], page_size=page_size
+        )
+        if isinstance(page_data, str):
+            # The API services return an error message when a request fails
+            st.error(page_data)
+            st.stop()
+        transactions_cache["by_page"][current_page] = page_data["results"]
+        if not page_data["next"]:
+            break
+        transactions_cache["cursors"][current_page + 1] = page_data["next"]
+        current_page += 1
+
 def get_or_fetch_all_transactions():
-    """Get or fetch all transactions."""    
-    st.session_state["api_transactions"]["cache"]["all_transactions"] = []
-    
-    for page in range(1, st.session_state["api_transactions"]["cache"]["info"]["pages_count"] + 1):
-        
-        transactions = get_or_fetch_transactions_page(page=page, page_size=st.session_state["api_transactions"]["cache"]["info"]["page_size"])
-        st.session_state["api_transactions"]["cache"]["all_transactions"].extend(transactions)
-    
+    """Get or fetch all transactions, from the streamed export in a single request."""
+    if not st.session_state["api_transactions"]["cache"]["all_transactions"]:
+        st.session_state["api_transactions"]["cache"]["all_transactions"] = st.session_state["api_transactions"]["service"].export_transactions()
+
     return st.session_state["api_transactions"]["cache"]["all_transactions"]
 
 
@@ -233,10 +248,14 @@ def update_cache(cache_types: list[str], page: int = 1, page_size: int = 50, yea
 
         elif cache_type == "transactions":
             st.session_state["api_transactions"]["cache"]["info"]["page_size"] = page_size
-            page_data = st.session_state["api_transactions"]["service"].get_transactions_by_page(page=page, page_size=page_size)
-            st.session_state["api_transactions"]["cache"]["by_page"][page] = page_data["results"]
-            st.session_state["api_transactions"]["cache"]["info"]["pages_count"] = (page_data["count"] + (page_size - 1)) // page_size
-            st.session_state["api_transactions"]["cache"]["info"]["transactions_count"] = page_data["count"]
+            if "transactions_count" not in st.session_state["api_transactions"]["cache"]["info"]:
+                transactions_count = st.session_state["api_transactions"]["service"].get_transactions_count()
+                if isinstance(transactions_count, str):
+                    st.error(transactions_count)
+                    st.stop()
+                st.session_state["api_transactions"]["cache"]["info"]["transactions_count"] = transactions_count
+            fetch_transactions_pages(page=page, page_size=page_size)
+            st.session_state["api_transactions"]["cache"]["info"]["pages_count"] = (st.session_state["api_transactions"]["cache"]["info"]["transactions_count"] + (page_size - 1)) // page_size
             st.session_state["api_transactions"]["cache"]["info"]["has_transactions"] = st.session_state["api_transactions"]["cache"]["info"]["transactions_count"] > 0
 
         elif cache_type == "current_analytics":
@@ -277,6 +296,7 @@ def clear_cache(cache_types: list[str]) -> None:
             st.session_state["api_transactions"]["cache"] = {
                 "info": {},
                 "by_page": {},
+                "cursors": {1: None},
                 "all_transactions": [],
             }
 
@@ -333,6 +353,7 @@ def cache_fetched(cache_types: list[str]) -> bool:
             is_fetched = is_fetched and st.session_state["api_transactions"]["cache"] != {
                 "info": {},
                 "by_page": {},
+                "cursors": {1: None},
                 "all_transactions": {},
             }
 